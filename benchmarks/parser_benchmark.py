@@ -0,0 +1,74 @@
+"""
+Parse + select micro-benchmark for the HTML parser backends.
+
+Usage:
+    python -m benchmarks.parser_benchmark [--repeat N] [files ...]
+
+Defaults to every page under saved_html/. For each backend it reports the mean
+time to parse a page and run the selectors the scrapers typically use.
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.html_parser import PARSER_BACKENDS, parse_html  # noqa: E402
+
+SELECTORS = [
+    'h1',
+    'p.price span',
+    'a[href*="/producto/"]',
+    'div.product-element-bottom',
+    'picture img',
+    'meta[property="og:image"]',
+]
+
+
+def run_once(content: bytes, parser: str):
+    start = time.perf_counter()
+    document = parse_html(content, parser)
+    parsed = time.perf_counter()
+    for selector in SELECTORS:
+        for element in document.select(selector):
+            element.get_text(strip=True)
+    return parsed - start, time.perf_counter() - parsed
+
+
+def benchmark(files, repeat: int):
+    pages = [(path, open(path, 'rb').read()) for path in files]
+    print(f"{len(pages)} page(s), {repeat} run(s) each\n")
+    print(f"{'backend':<12} {'parse ms':>10} {'select ms':>10} {'total ms':>10}")
+    for parser in PARSER_BACKENDS:
+        parse_times, select_times = [], []
+        try:
+            for _ in range(repeat):
+                for _, content in pages:
+                    parse_time, select_time = run_once(content, parser)
+                    parse_times.append(parse_time * 1000)
+                    select_times.append(select_time * 1000)
+        except ImportError as e:
+            print(f"{parser:<12} skipped ({e})")
+            continue
+        parse_ms = statistics.mean(parse_times)
+        select_ms = statistics.mean(select_times)
+        print(f"{parser:<12} {parse_ms:>10.2f} {select_ms:>10.2f} {parse_ms + select_ms:>10.2f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('files', nargs='*', help='HTML files (default: saved_html/*.html)')
+    arg_parser.add_argument('--repeat', type=int, default=10)
+    args = arg_parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join('saved_html', '*.html')))
+    if not files:
+        arg_parser.error('no HTML files found')
+    benchmark(files, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ config = {
             'type': 'guild_dreams',
             'headless': True,
             'page_load_delay': 3,
+            'pagination': {'page_param': 'page', 'max_pages': 10},
             'categories': {
                 'magic': {
                     'url': (
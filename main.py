@@ -1,11 +1,26 @@
 
+import argparse
 import os
 from dotenv import load_dotenv
 from src.pipeline import ScraperPipeline, PipelineConfig
 load_dotenv()
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scraping pipeline")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip work recorded in the last run's checkpoint and merge its results")
+    parser.add_argument("--stream", action="store_true",
+                        help="export and POST products while scraping instead of after it")
+    parser.add_argument("--delta", action="store_true",
+                        help="only POST products that changed since the last acknowledged upload")
+    parser.add_argument("--processes", action="store_true",
+                        help="run each store in its own worker process to use every CPU core")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     base_url = os.getenv("API_URL", "https://te-odio-docker-back-git-main-teodiodockers-projects.vercel.app/")
 
     config = PipelineConfig(
@@ -18,7 +33,18 @@ def main():
         output_dir="data",
         json_filename="prod_result.json",
         excel_filename="consolidated_results.xlsx",
-        request_timeout=30
+        export_formats=("json", "excel_stream", "parquet"),
+        history_db="price_history.sqlite",
+        request_timeout=30,
+        upload_chunk_size=500,
+        upload_gzip=True,
+        upload_concurrency=4,
+        upload_spool_dir="upload_spool",
+        max_workers=int(os.getenv("MAX_WORKERS")) if os.getenv("MAX_WORKERS") else None,
+        executor="process" if args.processes else None,
+        resume=args.resume,
+        streaming=args.stream,
+        delta_upload=args.delta
     )
 
     pipeline = ScraperPipeline(config)
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Optional, Union
+
+from src.api_sources.base import ApiSource, ApiSourceUnavailable, CategoryRecords
+from src.api_sources.shopify import ShopifySource
+from src.api_sources.woocommerce import WooCommerceSource
+
+API_SOURCES = {
+    'shopify': ShopifySource,
+    'woocommerce': WooCommerceSource,
+}
+
+
+def create_api_source(config: Union[str, Dict[str, Any], None], http_client,
+                      rate_limiter=None) -> Optional[ApiSource]:
+    """
+    Builds the source named by a scraper's ``api_source`` config: either the
+    type (``"shopify"``) or a dict with ``type`` plus ``per_page``/``max_pages``.
+    """
+    if not config:
+        return None
+    if isinstance(config, str):
+        config = {'type': config}
+    source_type = str(config.get('type', '')).lower()
+    if source_type not in API_SOURCES:
+        raise ValueError(f"Unknown api_source type: {source_type}")
+    return API_SOURCES[source_type](
+        http_client,
+        rate_limiter=rate_limiter,
+        per_page=config.get('per_page'),
+        max_pages=config.get('max_pages', 50),
+    )
+
+
+__all__ = ['ApiSource', 'ApiSourceUnavailable', 'CategoryRecords', 'ShopifySource', 'WooCommerceSource',
+           'API_SOURCES', 'create_api_source']
@@ -0,0 +1,65 @@
+from typing import Any, Dict, Optional
+
+from src.api_sources.base import ApiSource, ApiSourceUnavailable, CategoryRecords
+
+LANGUAGE_OPTIONS = ('idioma', 'language', 'lenguaje')
+
+
+class ShopifySource(ApiSource):
+    """
+    Shopify storefront catalog: ``/collections/<handle>/products.json`` returns
+    up to 250 products per page with variants, images and the description.
+    """
+
+    PER_PAGE = 250
+
+    def fetch_category(self, category_url: str, limit: Optional[int] = None) -> CategoryRecords:
+        endpoint = category_url.split('?')[0].rstrip('/') + '/products.json'
+        origin = self.origin(category_url)
+        records = []
+
+        for page in range(1, self.max_pages + 1):
+            try:
+                _, payload = self._get_json(endpoint, {'limit': self.per_page, 'page': page})
+            except ApiSourceUnavailable:
+                if page == 1:
+                    raise
+                self.logger.warning(f"Stopping at page {page} of {endpoint}")
+                return CategoryRecords(records)
+            if not isinstance(payload, dict) or not isinstance(payload.get('products'), list):
+                raise ApiSourceUnavailable(f"{endpoint}: unexpected payload")
+
+            products = payload['products']
+            records.extend(self.to_record(product, origin) for product in products)
+            if limit and len(records) >= limit:
+                # Complete only when the limit happens to fall on the catalog's end.
+                return CategoryRecords(records[:limit],
+                                       complete=len(records) == limit and len(products) < self.per_page)
+            if len(products) < self.per_page:
+                break
+        else:
+            self.logger.warning(f"Stopping after max_pages={self.max_pages} of {endpoint}")
+            return CategoryRecords(records)
+        return CategoryRecords(records, complete=True)
+
+    def to_record(self, product: Dict[str, Any], origin: str) -> Dict[str, Any]:
+        variants = product.get('variants') or []
+        prices = [variant.get('price') for variant in variants if variant.get('price') not in (None, '')]
+        images = product.get('images') or []
+
+        languages = []
+        for option in product.get('options') or []:
+            if str(option.get('name', '')).strip().lower() in LANGUAGE_OPTIONS:
+                languages = [str(value) for value in option.get('values') or []]
+
+        record = {
+            'name': product.get('title', ''),
+            'url': f"{origin}/products/{product.get('handle', '')}",
+            'price': self.format_price(min(prices, key=float)) if prices else "",
+            'stock': 'in_stock' if any(variant.get('available') for variant in variants) else 'out_of_stock',
+            'description': self.html_text(product.get('body_html')),
+            'img_url': images[0].get('src', '') if images else "",
+        }
+        if languages:
+            record['language'] = ', '.join(languages)
+        return record
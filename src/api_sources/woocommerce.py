@@ -0,0 +1,69 @@
+import urllib.parse
+from typing import Any, Dict, Optional
+
+from src.api_sources.base import ApiSource, ApiSourceUnavailable, CategoryRecords
+
+STORE_API_PATH = '/wp-json/wc/store/v1/products'
+
+
+class WooCommerceSource(ApiSource):
+    """
+    WooCommerce Store API (no key needed): ``/wp-json/wc/store/v1/products``
+    filtered by the category slug of a ``/categoria-producto/.../<slug>/`` URL,
+    up to 100 products per page.
+    """
+
+    PER_PAGE = 100
+
+    def fetch_category(self, category_url: str, limit: Optional[int] = None) -> CategoryRecords:
+        endpoint = self.origin(category_url) + STORE_API_PATH
+        slug = self.category_slug(category_url)
+        if not slug:
+            raise ApiSourceUnavailable(f"No category slug in {category_url}")
+        records = []
+
+        for page in range(1, self.max_pages + 1):
+            try:
+                response, payload = self._get_json(endpoint, {'category': slug, 'per_page': self.per_page, 'page': page})
+            except ApiSourceUnavailable:
+                if page == 1:
+                    raise
+                self.logger.warning(f"Stopping at page {page} of {endpoint}")
+                return CategoryRecords(records)
+            if not isinstance(payload, list):
+                raise ApiSourceUnavailable(f"{endpoint}: unexpected payload")
+
+            records.extend(self.to_record(product) for product in payload)
+            if limit and len(records) >= limit:
+                # Complete only when the limit happens to fall on the catalog's end.
+                return CategoryRecords(records[:limit],
+                                       complete=len(records) == limit and len(payload) < self.per_page)
+            total_pages = response.headers.get('X-WP-TotalPages')
+            if len(payload) < self.per_page or (total_pages and page >= int(total_pages)):
+                break
+        else:
+            self.logger.warning(f"Stopping after max_pages={self.max_pages} of {endpoint}")
+            return CategoryRecords(records)
+        return CategoryRecords(records, complete=True)
+
+    @staticmethod
+    def category_slug(category_url: str) -> str:
+        segments = [segment for segment in urllib.parse.urlsplit(category_url).path.split('/') if segment]
+        return segments[-1] if len(segments) > 1 else ""
+
+    def to_record(self, product: Dict[str, Any]) -> Dict[str, Any]:
+        prices = product.get('prices') or {}
+        price = ""
+        if prices.get('price') not in (None, ''):
+            minor_unit = int(prices.get('currency_minor_unit') or 0)
+            price = self.format_price(int(prices['price']) / (10 ** minor_unit) if minor_unit else prices['price'])
+        images = product.get('images') or []
+
+        return {
+            'name': self.html_text(product.get('name', '')),
+            'url': product.get('permalink', ''),
+            'price': price,
+            'stock': 'in_stock' if product.get('is_in_stock') else 'out_of_stock',
+            'description': self.html_text(product.get('description') or product.get('short_description')),
+            'img_url': images[0].get('src', '') if images else "",
+        }
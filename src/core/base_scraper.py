@@ -1,20 +1,49 @@
 import os
 import json
 import datetime
+import math
 import re
+import threading
 import pandas as pd
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Tuple, Optional
+from src.api_sources import ApiSourceUnavailable, create_api_source
 from src.core.category import Category
+from src.core.extraction_plan import ExtractionPlan
+from src.core.fetch_strategy import StaticFirstStrategy
+from src.core.pagination import PaginationRule
+from src.core.product_index import ProductIndex
 from src.core.logger_factory import LoggerFactory
-from src.utils.css_contain_adapter import EnhancedSelector, StockChecker
+from src.utils.css_contain_adapter import StockChecker
 from src.utils.session_html import RequestsHTMLSession
+from src.utils.async_session import AsyncPlaywrightSession
+from src.utils.rate_limiter import HostRateLimiter
+from src.utils.http_client import PooledHTTPClient
+from src.utils.http_cache import HTTPCache
+from src.utils.debug_capture import DebugCapture
+from src.utils.readiness import ReadinessWaiter
+from src.utils.resource_policy import ResourcePolicy, ResourceStats, site_of
+from src.utils.html_parser import DEFAULT_PARSER
+from src.utils.compiled_selectors import compile_selector, is_xpath, CSS, XPATH
+from src.utils.listing_stream import ListingItem, StreamingListingExtractor, supports_streaming
 from bs4 import BeautifulSoup
 import urllib.parse
 
+# Ancestors of a listing link searched for its price.
+LISTING_PRICE_DEPTH = 6
+
 
 class BaseScraper(ABC):
 
+    # Regex applied to the price text by the extraction plan; None keeps the text.
+    PRICE_PATTERN: Optional[str] = None
+    # Built-in selectors per product field, tried in order; they replace the
+    # category's selector for that field.
+    FIELD_RULES: Dict[str, Tuple[str, ...]] = {}
+    # Fields whose every match is kept (e.g. all language options).
+    MULTI_VALUE_FIELDS: Tuple[str, ...] = ()
+
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
@@ -23,7 +52,36 @@ class BaseScraper(ABC):
         self.results = {}
         self.categories = self._initialize_categories(config.get('categories', {}))
         self.batch_size = None
+        self.max_concurrency = 1
+        self.rate_limiter = None
+        self.http_client = None
+        self.http_cache = None
+        self.debug_capture = None
+        self.readiness = None
+        self.resource_policy = None
+        self.fetch_strategy = None
+        self.product_index = None
+        self.api_source = None
+        # CheckpointStore shared by the run, set by ScraperManager.
+        self.checkpoint = None
+        # BrowserPool shared by every scraper of the process, set by ScraperManager.
+        self.browser_pool = None
+        # Called as sink(store, category, product) for every finished product, in
+        # listing order; with retain_results False products are not kept in results.
+        self.sink: Optional[Callable[[str, str, Dict[str, Any]], None]] = None
+        self.retain_results = True
+        self.listing_metadata: Dict[str, Dict[str, str]] = {}
+        self._listing_urls = set()
+        # Categories whose listing was cut short (batch_size, page limits, failed
+        # pages) in this run; their report says listing_complete False.
+        self._incomplete_listings = set()
         self.report = {}
+        self._local = threading.local()
+        self._worker_sessions = []
+        self._worker_sessions_lock = threading.Lock()
+        self._carried_count = 0
+        self._resumed_count = 0
+        self._counter_lock = threading.Lock()
 
     def _initialize_categories(self, categories_config: Dict[str, Any]) -> List[Category]:
         categories = []
@@ -32,7 +90,18 @@ class BaseScraper(ABC):
             selectors = category_config.get('selectors', {})
 
             if url:
-                categories.append(Category(category_name, url, selectors))
+                try:
+                    pagination = PaginationRule.from_config(
+                        category_config.get('pagination', self.config.get('pagination')))
+                except (TypeError, ValueError) as e:
+                    self.logger.warning(f"Ignoring pagination of category {category_name}: {e}")
+                    pagination = None
+                category = Category(category_name, url, selectors, pagination)
+                category.plan = self._build_plan(category)
+                for key, compiled in category.compiled_selectors.items():
+                    if not compiled.valid:
+                        self.logger.warning(f"Invalid {key} in category {category_name}: {compiled.error}")
+                categories.append(category)
                 self.logger.info(f"Initialized category: {category_name}")
             else:
                 self.logger.warning(f"Skipping category {category_name}: No URL provided")
@@ -43,39 +112,288 @@ class BaseScraper(ABC):
         try:
             self.logger.info(f"Setting up {self.name} scraper")
             self.batch_size = self.config.get('batch_size', 4)
-
-            self.session = RequestsHTMLSession()
-
-            self.logger.info("SimpleReliableSession configured")
+            self.max_concurrency = max(1, self.config.get('max_concurrency', 1))
+            self.rate_limiter = HostRateLimiter(
+                rate=self.config.get('requests_per_second', 0.5),
+                burst=self.config.get('burst', 1),
+                host_rates=self.config.get('host_requests_per_second'),
+            )
+            self.http_client = PooledHTTPClient(
+                pool_connections=self.config.get('http_pool_connections', 20),
+                pool_maxsize=self.config.get('http_pool_maxsize', max(10, self.max_concurrency)),
+                timeout=self.config.get('http_timeout', 30),
+            )
+            self.http_cache = self._create_http_cache()
+            self.debug_capture = self._create_debug_capture()
+            readiness_config = self.config.get('readiness', {})
+            self.readiness = ReadinessWaiter(
+                quiet_ms=readiness_config.get('quiet_ms', 300),
+                min_timeout=readiness_config.get('min_timeout', 0.5),
+                selector_timeout=readiness_config.get('selector_timeout', 10.0),
+            )
+            self.resource_policy = ResourcePolicy.from_config(
+                self.config.get('resource_policy'),
+                first_party={site_of(category.url) for category in self.categories},
+            )
+
+            self.session = self._create_session()
+
+            if self.config.get('fetch_mode', 'render') == 'static_first':
+                self.fetch_strategy = StaticFirstStrategy(
+                    self.name,
+                    profile_path=self.config.get('fetch_profile_path'),
+                    probe_limit=self.config.get('fetch_probe_limit', 3),
+                )
+                self.logger.info("Static-first fetch strategy enabled")
+
+            if self.config.get('api_source'):
+                try:
+                    self.api_source = create_api_source(self.config['api_source'], self.http_client, self.rate_limiter)
+                    self.logger.info(f"Catalog API source: {type(self.api_source).__name__}")
+                except ValueError as e:
+                    self.logger.warning(f"{e}; scraping HTML only")
+
+            if self.config.get('incremental', False):
+                index_path = self.config.get('index_path', os.path.join('data', 'index', f"{self.name}.json"))
+                self.product_index = ProductIndex(index_path, max_age=self.config.get('index_max_age', 24 * 3600))
+                self.logger.info(f"Incremental mode: {len(self.product_index)} known products in {index_path}")
+
+            self.logger.info(f"{type(self.session).__name__} configured")
 
         except Exception as e:
             self.logger.error(f"Failed to set up session: {e}", exc_info=True)
             raise
 
     def teardown(self) -> None:
+        with self._worker_sessions_lock:
+            worker_sessions, self._worker_sessions = self._worker_sessions, []
+        self._log_resource_totals(worker_sessions + [self.session])
+        for session in worker_sessions:
+            try:
+                session.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing worker session: {e}")
+
+        if self.fetch_strategy:
+            try:
+                self.fetch_strategy.save()
+            except Exception as e:
+                self.logger.warning(f"Failed to save fetch profile: {e}")
+
         if self.session:
             self.logger.info("Closing session")
             self.session.close()
 
+        if self.http_client:
+            metrics = self.http_client.metrics()
+            self.logger.info(
+                f"HTTP pool: {metrics['requests']} requests over "
+                f"{metrics['connections_opened']} connections "
+                f"({metrics['reuse_ratio']:.0%} reused)"
+            )
+            self.http_client.close()
+            self.http_client = None
+
+        if self.http_cache:
+            self.logger.info(f"HTTP cache: {self.http_cache.stats}")
+            self.http_cache.close()
+            self.http_cache = None
+
+        if self.readiness and self.readiness.stats['pages']:
+            metrics = self.readiness.metrics()
+            self.logger.info(
+                f"Page readiness: {metrics['waited_seconds']:.1f}s waited over {metrics['pages']} pages "
+                f"(avg {metrics['avg_wait']:.2f}s, {metrics['timeouts']} timeouts)"
+            )
+
+        if self.debug_capture:
+            self.debug_capture.close()
+            if self.debug_capture.stats['captured']:
+                self.logger.info(f"Debug captures: {self.debug_capture.stats} in {self.debug_capture.directory}")
+            self.debug_capture = None
+
+    def _create_http_cache(self) -> Optional[HTTPCache]:
+        """
+        Builds the page cache from the optional ``http_cache`` config block, e.g.
+        {"path": "data/http_cache.sqlite", "render_fresh_for": 3600, "max_mb": 512}.
+        """
+        cache_config = self.config.get('http_cache')
+        if not cache_config:
+            return None
+        return HTTPCache(
+            cache_config.get('path', 'data/http_cache.sqlite'),
+            max_age=cache_config.get('max_age', 7 * 24 * 3600),
+            fresh_for={
+                'static': cache_config.get('static_fresh_for', 0),
+                'render': cache_config.get('render_fresh_for', 3600),
+            },
+            max_bytes=cache_config.get('max_mb', 512) * 1024 * 1024,
+        )
+
+    def _log_resource_totals(self, sessions) -> None:
+        totals = ResourceStats()
+        pages = 0
+        for session in sessions:
+            stats = getattr(session, 'resource_stats', None)
+            if isinstance(stats, ResourceStats):
+                totals.merge(stats)
+                pages += session.resource_pages
+        if pages:
+            self.logger.info(
+                f"Rendered resources over {pages} pages: {totals.allowed} allowed "
+                f"({totals.allowed_bytes / pages / 1024:.0f} KB/page), {totals.blocked} blocked "
+                f"{totals.blocked_by_type}"
+            )
+
+    def _create_debug_capture(self) -> Optional[DebugCapture]:
+        """
+        Pages kept for debugging, from the optional ``debug_capture`` config block,
+        e.g. {"dir": "saved_html/debug", "keep": 20, "sample_rate": 0.01}. Failed
+        pages are kept by default; ``false`` turns capturing off.
+        """
+        capture_config = self.config.get('debug_capture', {})
+        if capture_config is False:
+            return None
+        return DebugCapture(
+            os.path.join(capture_config.get('dir', os.path.join('saved_html', 'debug')), self.name),
+            keep=capture_config.get('keep', 20),
+            sample_rate=capture_config.get('sample_rate', 0.0),
+        )
+
+    def _create_session(self):
+        """
+        Builds the session selected by the ``engine`` config key: ``sync`` (default)
+        uses RequestsHTMLSession, ``async`` uses AsyncPlaywrightSession with a pool
+        of ``page_pool_size`` pages. With a shared ``browser_pool`` every engine
+        renders on a context of the pool instead of launching its own browser.
+        Pages are parsed with the ``parser`` backend.
+        """
+        engine = self.config.get('engine', 'sync')
+        parser = self.config.get('parser', DEFAULT_PARSER)
+        if engine == 'async' or self.browser_pool is not None:
+            return AsyncPlaywrightSession(
+                rate_limiter=self.rate_limiter,
+                http_client=self.http_client,
+                cache=self.http_cache,
+                parser=parser,
+                pool_size=self.config.get('page_pool_size', self.max_concurrency),
+                headless=self.config.get('headless', True),
+                debug_capture=self.debug_capture,
+                readiness=self.readiness,
+                resource_policy=self.resource_policy,
+                browser_pool=self.browser_pool,
+            )
+        if engine != 'sync':
+            self.logger.warning(f"Unknown engine '{engine}', falling back to sync")
+        return RequestsHTMLSession(rate_limiter=self.rate_limiter, http_client=self.http_client,
+                                   cache=self.http_cache, parser=parser, debug_capture=self.debug_capture,
+                                   readiness=self.readiness, resource_policy=self.resource_policy)
+
+    def _init_worker_session(self) -> None:
+        """
+        Gives each product worker thread its own session. Playwright's sync API is
+        bound to the thread that started it, so sessions cannot be shared between
+        workers; the rate limiter is shared instead, keeping the per-host budget.
+        Thread-safe sessions (the async engine) are shared as they are.
+        """
+        if getattr(self.session, 'thread_safe', False) is True:
+            return
+        session = self._create_session()
+        self._local.session = session
+        with self._worker_sessions_lock:
+            self._worker_sessions.append(session)
+
+    def _current_session(self):
+        return getattr(self._local, 'session', None) or self.session
+
     def get_page(self, url: str, wait_for=None) -> BeautifulSoup:
         try:
             self.logger.info(f"Fetching URL: {url}")
-            soup = self.session.get(url, wait_for=wait_for)
+            if wait_for is None:
+                wait_for = self._readiness_selector(self._page_type(url))
+            if self.fetch_strategy:
+                return self._get_page_static_first(url, wait_for)
+            soup = self._current_session().get(url, wait_for=wait_for)
             return soup
 
         except Exception as e:
             self.logger.error(f"Error fetching {url}: {e}")
             raise
 
+    def _page_type(self, url: str) -> str:
+        if url in self._listing_urls or any(category.url == url for category in self.categories):
+            return 'category'
+        return 'product'
+
+    def _expected_selectors(self, page_type: str) -> List[str]:
+        category = getattr(self._local, 'category', None)
+        if category is None:
+            return []
+        if page_type == 'category':
+            keys = ['urls_selector']
+        else:
+            keys = ['price_selector', 'title_selector']
+        return [category.selectors[key] for key in keys if category.selectors.get(key)]
+
+    def _readiness_selector(self, page_type: str) -> Optional[str]:
+        """
+        The category's key CSS selectors as one Playwright selector, so a rendered
+        page is ready once any of them is attached. XPath and ``:contains`` rules
+        are left out; without any the session waits for the DOM to settle.
+        """
+        selectors = [selector for selector in self._expected_selectors(page_type)
+                     if not is_xpath(selector) and ':contains(' not in selector]
+        return ', '.join(selectors) or None
+
+    def _get_page_static_first(self, url: str, wait_for=None) -> BeautifulSoup:
+        """
+        Fetches ``url`` over plain HTTP and only renders it with Playwright when the
+        category's key selectors don't match the static HTML. The outcome is fed
+        back to the fetch strategy, which learns to skip the static attempt for
+        page types that always need rendering.
+        """
+        session = self._current_session()
+        page_type = self._page_type(url)
+
+        if self.fetch_strategy.should_try_static(page_type):
+            try:
+                soup = session.get(url, wait_for=None, render_js=False)
+                selectors = self._expected_selectors(page_type)
+                static_ok = all(
+                    self.find_elements(soup, selector, XPATH if is_xpath(selector) else CSS)
+                    for selector in selectors
+                ) if selectors else bool(soup.find('body'))
+            except Exception as e:
+                self.logger.info(f"Static fetch failed for {url}: {e}")
+                static_ok = False
+
+            self.fetch_strategy.record(page_type, static_ok)
+            if static_ok:
+                return soup
+            self.logger.info(f"Static HTML incomplete for {page_type} page, rendering {url}")
+
+        return session.get(url, wait_for=wait_for)
+
+    def _build_plan(self, category: Category) -> ExtractionPlan:
+        return ExtractionPlan.for_category(category, self.PRICE_PATTERN,
+                                           field_rules=self.FIELD_RULES,
+                                           multi_value_fields=self.MULTI_VALUE_FIELDS)
+
+    def extraction_plan(self, category: Category) -> ExtractionPlan:
+        if category.plan is None:
+            category.plan = self._build_plan(category)
+        return category.plan
+
     def find_elements(self, soup: BeautifulSoup, selector: str, selector_type: str = 'css') -> List:
+        """
+        Selects with the shared compiled form of ``selector``. XPath runs natively on
+        an lxml tree; the matches come back as LxmlNode elements.
+        """
+        if selector_type not in (CSS, XPATH):
+            self.logger.warning(f"Unknown selector type '{selector_type}' for selector {selector}")
+            return []
         try:
-            if selector_type == 'xpath':
-                css_selector = self._xpath_to_css(selector)
-                elements = EnhancedSelector.select(soup, css_selector)
-            else:
-                elements = EnhancedSelector.select(soup, selector)
-
-            return elements
+            return compile_selector(selector, selector_type).select(soup)
         except Exception as e:
             self.logger.warning(f"Error finding elements with selector {selector}: {e}")
             return []
@@ -106,27 +424,6 @@ class BaseScraper(ABC):
             return element.get(attribute, '')
         return ""
 
-    def _xpath_to_css(self, xpath: str) -> str:
-        if not xpath.startswith('//'):
-            return xpath
-
-        conversions = [
-            (r'^//', ''),
-            (r'/(\w+)', r' > \1'),
-            (r"contains\(@class,\s*['\"]([^'\"]+)['\"]\)", r'[class*="\1"]'),
-            (r"contains\(@href,\s*['\"]([^'\"]+)['\"]\)", r'[href*="\1"]'),
-            (r"@class\s*=\s*['\"]([^'\"]+)['\"]", r'.\1'),
-            (r"@id\s*=\s*['\"]([^'\"]+)['\"]", r'#\1'),
-            (r'\[(\d+)\]', r':nth-child(\1)'),
-            (r'\s+', ' '),
-        ]
-
-        css = xpath
-        for pattern, replacement in conversions:
-            css = re.sub(pattern, replacement, css)
-
-        return css.strip() if css.strip() else '*'
-
     def save_screenshot(self, soup: BeautifulSoup, filename: Optional[str] = None) -> str:
         if not os.path.exists('screenshots'):
             os.makedirs('screenshots')
@@ -199,52 +496,110 @@ class BaseScraper(ABC):
             return ""
 
     def run(self) -> Dict[str, List[Dict[str, Any]]]:
+        executor = None
         try:
             self.setup()
             self.logger.info(f"Starting {self.name} scraper")
+            self._incomplete_listings = set()
+
+            if self.max_concurrency > 1:
+                self.logger.info(f"Fetching product pages with {self.max_concurrency} workers")
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix=f"{self.name}-product",
+                    initializer=self._init_worker_session,
+                )
 
             process_report = {}
             for category in self.categories:
                 self.logger.info(f"Processing category: {category.name}")
+                self._local.category = category
 
                 self.results[category.name] = []
-                soup = self.navigate_to_category(category)
+                if self.checkpoint is not None and self.checkpoint.is_complete(self.name, category.name):
+                    products = list(self.checkpoint.products(self.name, category.name).values())
+                    self.logger.info(f"Category {category.name} restored from checkpoint ({len(products)} products)")
+                    for product_data in products:
+                        self._emit(category, product_data)
+                    process_report[category.name] = {
+                        'total_products': len(products),
+                        'processed_products': len(products),
+                        'success_rate': 100.0 if products else 0,
+                        'resumed': len(products),
+                        # The listing was not read in this run.
+                        'listing_complete': False,
+                        'failed_urls': [],
+                    }
+                    continue
+
+                api_products = self._scrape_from_api(category) if self.api_source else None
+                if api_products is not None:
+                    for product_data in api_products:
+                        self._emit(category, product_data)
+                    process_report[category.name] = {
+                        'total_products': len(api_products),
+                        'processed_products': len(api_products),
+                        'success_rate': 100.0,
+                        'source': 'api',
+                        'listing_complete': category.name not in self._incomplete_listings,
+                        'failed_urls': [],
+                    }
+                    if self.checkpoint is not None:
+                        for product_data in api_products:
+                            self.checkpoint.record(self.name, category.name, product_data['url'], product_data)
+                        self.checkpoint.complete(self.name, category.name)
+                    continue
+
+                extractor = self._listing_extractor(category)
+                if extractor is not None:
+                    # Product jobs start while the listing page is still downloading.
+                    product_urls = self._stream_product_urls(category, extractor)
+                    total = None
+                else:
+                    product_urls = self._collect_product_urls(category)
+
+                    self.logger.info(f"Found {len(product_urls)} product URLs in category {category.name}")
+                    if len(product_urls) > self.batch_size:
+                        self.logger.info(f"Limiting to the first {self.batch_size} products")
+                        self._mark_listing_incomplete(category)
+                        product_urls = product_urls[:self.batch_size]
+                    total = len(product_urls)
 
-                product_urls = self.extract_product_urls(soup, category)
-
-                self.logger.info(f"Found {len(product_urls)} product URLs in category {category.name}")
-                if len(product_urls) > self.batch_size:
-                    self.logger.info(f"Limiting to the first {self.batch_size} products")
-                    product_urls = product_urls[:self.batch_size]
-
-                product_count = len(product_urls)
                 processed_count = 0
-
-                for idx, (product_name, product_url) in enumerate(product_urls):
-                    self.logger.info(f"Processing product {idx+1}/{len(product_urls)}: {product_name}")
-                    product_data = self.process_product(product_url, category)
-
+                carried_before = self._carried_count
+                resumed_before = self._resumed_count
+
+                submitted = []
+                jobs = self._iter_jobs(product_urls, category, submitted)
+                if executor:
+                    products = executor.map(lambda job: self._scrape_product(*job, total), jobs)
+                else:
+                    products = (self._scrape_product(*job, total) for job in jobs)
+
+                failed_urls = []
+                for position, product_data in enumerate(products):
                     if product_data:
-                        product_data['name'] = product_name
-                        product_data['url'] = product_url
-                        product_data['game'] = category.name
-                        product_data['timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        product_data['store'] = self.name
-                        product_data['product_type'] = self.detect_type(product_name)
-                        price = self.clean_price(product_data.get('price', 0))
-                        product_data['price'] = price
-                        product_data['min_price'] = price
-                        if len(product_data.get('description', "")) > 500:
-                            self.logger.info(f"Truncating description for {product_name}")
-                            product_data['description'] = product_data['description'][:450] + "..."
                         processed_count += 1
-                        self.results[category.name].append(product_data)
+                        self._emit(category, product_data)
+                    else:
+                        failed_urls.append(submitted[position])
 
+                product_count = len(submitted)
                 process_report[category.name] = {
                     'total_products': product_count,
                     'processed_products': processed_count,
-                    'success_rate': (processed_count / product_count) * 100 if product_count > 0 else 0
+                    'success_rate': (processed_count / product_count) * 100 if product_count > 0 else 0,
+                    'listing_complete': category.name not in self._incomplete_listings,
+                    'failed_urls': failed_urls,
                 }
+                if self.product_index is not None:
+                    process_report[category.name]['carried_forward'] = self._carried_count - carried_before
+                if self.checkpoint is not None:
+                    process_report[category.name]['resumed'] = self._resumed_count - resumed_before
+                    self.checkpoint.complete(self.name, category.name)
+
+            if self.product_index is not None:
+                self.product_index.save()
 
             self.report = process_report
             self.logger.info(f"Scraping completed. Found items in {len(self.results)} categories.")
@@ -253,8 +608,324 @@ class BaseScraper(ABC):
             self.logger.error(f"Error during scraping: {e}", exc_info=True)
             return {}
         finally:
+            if executor:
+                executor.shutdown(wait=True)
             self.teardown()
 
+    def _emit(self, category: Category, product_data: Dict[str, Any]) -> None:
+        if self.retain_results:
+            self.results[category.name].append(product_data)
+        if self.sink is not None:
+            self.sink(self.name, category.name, product_data)
+
+    def _mark_listing_incomplete(self, category: Category) -> None:
+        self._incomplete_listings.add(category.name)
+
+    @staticmethod
+    def _iter_jobs(product_urls, category: Category, submitted: List[str]):
+        for idx, (product_name, product_url) in enumerate(product_urls):
+            submitted.append(product_url)
+            yield idx, product_name, product_url, category
+
+    def _scrape_product(self, idx: int, product_name: str, product_url: str,
+                        category: Category, total: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Scrapes one product, reusing and recording it in the checkpoint when there is one."""
+        if self.checkpoint is None:
+            return self._fetch_product(idx, product_name, product_url, category, total)
+
+        previous = self.checkpoint.get(self.name, category.name, product_url)
+        if previous is not None:
+            self.logger.info(f"Checkpointed product {idx+1}/{total or '?'}: {product_name}")
+            with self._counter_lock:
+                self._resumed_count += 1
+            return previous
+
+        product_data = self._fetch_product(idx, product_name, product_url, category, total)
+        if product_data:
+            self.checkpoint.record(self.name, category.name, product_url, product_data)
+        return product_data
+
+    def _fetch_product(self, idx: int, product_name: str, product_url: str,
+                       category: Category, total: Optional[int]) -> Optional[Dict[str, Any]]:
+        self._local.category = category
+
+        fingerprint = None
+        if self.product_index is not None:
+            details = self.listing_metadata.get(product_url, {})
+            fingerprint = ProductIndex.fingerprint(product_name, details.get('price'), details.get('image'))
+            # Without a listing price the fingerprint cannot tell a price change apart.
+            previous = self.product_index.unchanged(product_url, fingerprint) if details.get('price') else None
+            if previous:
+                self.logger.info(f"Unchanged product {idx+1}/{total or '?'}: {product_name}")
+                with self._counter_lock:
+                    self._carried_count += 1
+                previous['timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                return previous
+
+        self.logger.info(f"Processing product {idx+1}/{total or '?'}: {product_name}")
+        product_data = self.process_product(product_url, category)
+        if not product_data:
+            return None
+        product_data = self._finalize_product(product_data, product_name, product_url, category)
+        if self.product_index is not None:
+            self.product_index.update(product_url, fingerprint, dict(product_data))
+        return product_data
+
+    def _scrape_from_api(self, category: Category) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reads the category from the store's catalog API. Returns None, so the HTML
+        path runs instead, when the endpoint is unavailable or has no products.
+        """
+        try:
+            records = self.api_source.fetch_category(category.url, limit=self.batch_size)
+        except ApiSourceUnavailable as e:
+            self.logger.warning(f"Catalog API unavailable for {category.name}, scraping HTML: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Catalog API failed for {category.name}, scraping HTML: {e}")
+            return None
+        if not records:
+            self.logger.info(f"Catalog API returned no products for {category.name}, scraping HTML")
+            return None
+
+        self.logger.info(f"Read {len(records)} products of {category.name} from the catalog API")
+        if not getattr(records, 'complete', False):
+            # limit, max_pages or a failed page: products past it are unknown, not gone.
+            self._mark_listing_incomplete(category)
+        products = []
+        for record in records:
+            product_name, product_url = record.pop('name'), record.pop('url')
+            product_data = self._finalize_product(record, product_name, product_url, category)
+            if self.product_index is not None:
+                fingerprint = ProductIndex.fingerprint(product_name, product_data.get('price'), record.get('img_url'))
+                self.product_index.update(product_url, fingerprint, dict(product_data))
+            products.append(product_data)
+        return products
+
+    def _collect_product_urls(self, category: Category) -> List[Tuple[str, str]]:
+        """
+        Product (title, url) pairs of the category, following its pagination rule
+        when it has one. Pages whose count is announced on the first page are
+        fetched concurrently; otherwise pages are walked one by one until the stop
+        condition. URLs are deduplicated across pages, keeping first-seen order.
+        """
+        soup = self.navigate_to_category(category)
+        first_page = self.extract_product_urls(soup, category)
+        rule = category.pagination
+        if rule is None:
+            return first_page
+
+        product_urls: List[Tuple[str, str]] = []
+        seen = set()
+
+        def add(page_urls) -> int:
+            added = 0
+            for product_name, product_url in page_urls:
+                if product_url not in seen:
+                    seen.add(product_url)
+                    product_urls.append((product_name, product_url))
+                    added += 1
+            return added
+
+        if not add(first_page):
+            return product_urls
+
+        announced = rule.total_pages(soup) if rule.addressable else None
+        if announced:
+            # Only as many pages as max_pages and the batch allow, judging by the first page's size.
+            needed = math.ceil(self.batch_size / len(first_page))
+            last_page = min(announced, rule.last_allowed_page, rule.start + needed - 1)
+            pages = range(rule.start + 1, last_page + 1)
+            page_urls = [rule.page_url(category.url, page) for page in pages]
+            self.logger.info(f"Fetching {len(page_urls)} more listing pages of {category.name} "
+                             f"({announced - rule.start + 1} announced)")
+            if last_page < announced:
+                self._mark_listing_incomplete(category)
+            for listing in self._fetch_listing_pages(page_urls, category, rule.concurrency):
+                add(listing)
+            return product_urls
+
+        page, current_url, visited = rule.start, category.url, {category.url}
+        while True:
+            if page - rule.start + 1 >= rule.max_pages or len(product_urls) >= self.batch_size:
+                self._mark_listing_incomplete(category)
+                break
+            if rule.next_selector:
+                next_url = rule.next_url(soup, current_url)
+            else:
+                next_url = rule.page_url(category.url, page + 1)
+            if not next_url or next_url in visited:
+                break
+            visited.add(next_url)
+            try:
+                soup = self._get_listing_page(next_url, category)
+            except Exception as e:
+                self.logger.warning(f"Stopping pagination of {category.name} at {next_url}: {e}")
+                self._mark_listing_incomplete(category)
+                break
+            page, current_url = page + 1, next_url
+            if not add(self.extract_product_urls(soup, category)):
+                self.logger.info(f"Page {page} of {category.name} has no new products, stopping")
+                break
+        return product_urls
+
+    def _get_listing_page(self, url: str, category: Category):
+        self._local.category = category
+        self._listing_urls.add(url)
+        return self.get_page(url, wait_for=category.selectors.get('urls_selector'))
+
+    def _fetch_listing_pages(self, urls: List[str], category: Category,
+                             concurrency: int) -> List[List[Tuple[str, str]]]:
+        """Fetches and extracts listing pages concurrently; results keep page order."""
+        def fetch(url):
+            try:
+                return self.extract_product_urls(self._get_listing_page(url, category), category)
+            except Exception as e:
+                self.logger.warning(f"Failed to fetch listing page {url}: {e}")
+                self._mark_listing_incomplete(category)
+                return []
+
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls))),
+                                thread_name_prefix=f"{self.name}-listing",
+                                initializer=self._init_worker_session) as pool:
+            return list(pool.map(fetch, urls))
+
+    def _listing_extractor(self, category: Category) -> Optional[StreamingListingExtractor]:
+        """
+        Returns a streaming extractor for the category page when ``stream_listings``
+        is enabled and its selectors can be matched without a full tree; None keeps
+        the navigate_to_category / extract_product_urls path.
+        """
+        if not self.config.get('stream_listings', False):
+            return None
+        selectors = category.selectors
+        keys = ('urls_selector', 'product_selector', 'listing_price_selector')
+        unsupported = [key for key in keys if selectors.get(key) and not supports_streaming(selectors[key])]
+        if not selectors.get('urls_selector') or unsupported:
+            self.logger.info(f"Category {category.name} cannot be streamed ({', '.join(unsupported) or 'no urls_selector'})")
+            return None
+        return StreamingListingExtractor(
+            selectors['urls_selector'],
+            product_selector=selectors.get('product_selector'),
+            price_selector=selectors.get('listing_price_selector'),
+            base_url=category.url,
+        )
+
+    def _stream_product_urls(self, category: Category,
+                             extractor: StreamingListingExtractor) -> Iterator[Tuple[str, str]]:
+        """
+        Yields (title, url) pairs while the category page downloads, up to
+        ``batch_size``. Falls back to the parsed-page path when the raw HTML holds
+        no listings (e.g. pages rendered by JavaScript) or the download fails first.
+        """
+        count = 0
+        response = None
+        try:
+            self.logger.info(f"Streaming URL: {category.url}")
+            self.rate_limiter.acquire(category.url)
+            response = self.http_client.get(category.url, stream=True)
+            response.raise_for_status()
+            for item in extractor.iter_listings(response.iter_content(chunk_size=64 * 1024)):
+                self.on_listing(item, category)
+                yield item.title, item.url
+                count += 1
+                if count >= self.batch_size:
+                    self.logger.info(f"Limiting to the first {self.batch_size} products")
+                    self._mark_listing_incomplete(category)
+                    return
+        except Exception as e:
+            if count:
+                self.logger.warning(f"Listing stream for {category.name} stopped after {count} products: {e}")
+                self._mark_listing_incomplete(category)
+                return
+            self.logger.warning(f"Listing stream for {category.name} failed: {e}")
+        finally:
+            if response is not None:
+                response.close()
+
+        if count:
+            self.logger.info(f"Streamed {count} product URLs in category {category.name}")
+            return
+
+        self.logger.info(f"No listings streamed for {category.name}, parsing the full page")
+        soup = self.navigate_to_category(category)
+        product_urls = self.extract_product_urls(soup, category)
+        self.logger.info(f"Found {len(product_urls)} product URLs in category {category.name}")
+        if len(product_urls) > self.batch_size:
+            self._mark_listing_incomplete(category)
+        yield from product_urls[:self.batch_size]
+
+    def on_listing(self, item: ListingItem, category: Category) -> None:
+        """Called for every streamed listing before its product job is queued."""
+        self.remember_listing(item.url, price=item.price, image=item.image)
+
+    def remember_listing(self, product_url: str, price: Optional[str] = None, image: Optional[str] = None) -> None:
+        """
+        Records listing-level details seen on a category page. Incremental mode uses
+        them to fingerprint products without opening their detail page.
+        """
+        details = self.listing_metadata.setdefault(product_url, {})
+        if price:
+            details['price'] = price
+        if image:
+            details['image'] = image
+
+    def remember_listing_element(self, element, product_url: str, category: Category,
+                                 image: Optional[str] = None) -> None:
+        """
+        ``remember_listing`` for a link or product card of a parsed category page.
+        The price is the only match of ``listing_price_selector`` (``price_selector``
+        when unset) in the closest ancestor holding one, as long as that ancestor
+        links to no other product.
+        """
+        try:
+            price = self._listing_price(element, category)
+        except Exception as e:
+            self.logger.debug(f"No listing price for {product_url}: {e}")
+            price = None
+        self.remember_listing(product_url, price=price, image=image)
+
+    @staticmethod
+    def _listing_price(element, category: Category) -> Optional[str]:
+        selector = category.selectors.get('listing_price_selector') or category.selectors.get('price_selector')
+        if not selector:
+            return None
+        prices = compile_selector(selector)
+        urls_selector = category.selectors.get('urls_selector')
+        links = compile_selector(urls_selector) if urls_selector else None
+        node = element
+        for _ in range(LISTING_PRICE_DEPTH):
+            if node is None:
+                return None
+            if links is not None and len({link.get('href') for link in links.select(node)}) > 1:
+                # The walk has left the product card.
+                return None
+            found = prices.select(node)
+            if len(found) == 1:
+                return ' '.join(found[0].get_text().split()) or None
+            if found:
+                return None
+            node = node.parent
+        return None
+
+    def _finalize_product(self, product_data: Dict[str, Any], product_name: str,
+                          product_url: str, category: Category) -> Dict[str, Any]:
+        product_data['name'] = product_name
+        product_data['url'] = product_url
+        product_data['game'] = category.name
+        product_data['timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        product_data['store'] = self.name
+        product_data['product_type'] = self.detect_type(product_name)
+        price = self.clean_price(product_data.get('price', 0))
+        product_data['price'] = price
+        product_data['min_price'] = price
+        if len(product_data.get('description', "")) > 500:
+            self.logger.info(f"Truncating description for {product_name}")
+            product_data['description'] = product_data['description'][:450] + "..."
+        return product_data
+
     def get_report(self) -> Dict[str, Any]:
         return self.report
 
@@ -1,10 +1,23 @@
-from typing import Dict
+from typing import Dict, Optional
+from src.core.pagination import PaginationRule
+from src.utils.compiled_selectors import CompiledSelector, compile_selector
 
 
 class Category:
 
-    def __init__(self, name: str, url: str, selectors: Dict[str, str]):
+    def __init__(self, name: str, url: str, selectors: Dict[str, str],
+                 pagination: Optional[PaginationRule] = None):
 
         self.name = name
         self.url = url
         self.selectors = selectors
+        # Compiled once here so every page of the category reuses them.
+        self.compiled_selectors: Dict[str, CompiledSelector] = {
+            key: compile_selector(selector)
+            for key, selector in selectors.items()
+            if isinstance(selector, str) and selector
+        }
+        # ExtractionPlan, set by the scraper that owns the category.
+        self.plan = None
+        # None: only the category URL is read.
+        self.pagination = pagination
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from src.core.logger_factory import LoggerFactory
+
+
+class CheckpointStore:
+    """
+    Append-only JSONL log of finished work, shared by every scraper of a run.
+
+    Each product is written as ``{"store", "category", "url", "product"}`` the
+    moment it is scraped, and a ``{"store", "category", "complete": true}`` line
+    closes a category. ``load`` replays the file so a resumed run can skip both;
+    a line cut short by a crash is ignored. Nothing touches the disk until the
+    first record.
+
+    Only product bodies read by ``load`` are kept in memory (``get`` and
+    ``products`` serve them); products recorded during the run go to the file
+    and leave just their URL behind, so memory does not grow with the catalog.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = LoggerFactory.create_logger("checkpoint")
+        self._products: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._urls: Dict[Tuple[str, str], Set[str]] = {}
+        self._complete = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> 'CheckpointStore':
+        if not os.path.exists(self.path):
+            return self
+        skipped = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = (entry['store'], entry['category'])
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+                    continue
+                if entry.get('complete'):
+                    self._complete.add(key)
+                elif 'url' in entry:
+                    self._products.setdefault(key, {})[entry['url']] = entry.get('product') or {}
+                    self._urls.setdefault(key, set()).add(entry['url'])
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} unreadable checkpoint lines in {self.path}")
+        self.logger.info(f"Loaded {len(self)} checkpointed products from {self.path}")
+        return self
+
+    def clear(self) -> None:
+        with self._lock:
+            self._close_file()
+            self._products.clear()
+            self._urls.clear()
+            self._complete.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def record(self, store: str, category: str, url: str, product: Dict[str, Any]) -> None:
+        with self._lock:
+            self._urls.setdefault((store, category), set()).add(url)
+            self._append({'store': store, 'category': category, 'url': url, 'product': product})
+
+    def complete(self, store: str, category: str) -> None:
+        with self._lock:
+            self._complete.add((store, category))
+            self._append({'store': store, 'category': category, 'complete': True})
+
+    def is_complete(self, store: str, category: str) -> bool:
+        return (store, category) in self._complete
+
+    def products(self, store: str, category: str) -> Dict[str, Dict[str, Any]]:
+        """url -> product loaded for the category, in the order they finished."""
+        with self._lock:
+            return dict(self._products.get((store, category), {}))
+
+    def get(self, store: str, category: str, url: str) -> Optional[Dict[str, Any]]:
+        """The product ``load`` read for ``url``, or None."""
+        with self._lock:
+            product = self._products.get((store, category), {}).get(url)
+        return dict(product) if product is not None else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_file()
+
+    def __contains__(self, key: Tuple[str, str, str]) -> bool:
+        """``(store, category, url) in store``: checkpointed by this or a loaded run."""
+        store, category, url = key
+        with self._lock:
+            return url in self._urls.get((store, category), ())
+
+    def __len__(self) -> int:
+        return sum(len(urls) for urls in self._urls.values())
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
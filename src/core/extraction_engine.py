@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from bs4 import Tag
+
+from src.utils.compiled_selectors import CompiledSelector, DocumentIndex
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    Selectors for one product field, in priority order. The first selector that
+    matches wins; ``many`` keeps all of its matches instead of the first one.
+    """
+
+    field: str
+    selectors: Tuple[CompiledSelector, ...]
+    many: bool = False
+
+
+class ExtractionResult(dict):
+    """
+    Field -> matched elements, plus ``provenance``: field -> the selector that
+    produced the match. Fields without a match map to an empty list.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.provenance: Dict[str, str] = {}
+
+    def first(self, field: str) -> Optional[Any]:
+        elements = self.get(field)
+        return elements[0] if elements else None
+
+
+class ExtractionEngine:
+    """
+    Matches every field rule of a category against one indexed pass over the
+    document.
+
+    The document is walked once into a DocumentIndex (elements by tag name and
+    class); each CSS part is then only tested against the elements that can
+    match it, so a page costs one traversal instead of one per selector. Matches
+    come in the same order as running the selectors one after another, and a
+    field stops at its first matching selector (at its first element unless the
+    rule is ``many``). XPath selectors, and documents that are not BeautifulSoup
+    trees, fall back to one select per selector.
+    """
+
+    def __init__(self, rules: Sequence[FieldRule]):
+        self.rules = tuple(rules)
+
+    def extract(self, document) -> ExtractionResult:
+        result = ExtractionResult()
+        index = None
+
+        for rule in self.rules:
+            result[rule.field] = []
+            for selector in rule.selectors:
+                try:
+                    if selector.indexable and isinstance(document, Tag):
+                        if index is None:
+                            index = DocumentIndex(document)
+                        elements = selector.select_indexed(index, first_only=not rule.many)
+                    else:
+                        elements = selector.select(document)
+                except Exception:
+                    elements = []
+                if elements:
+                    result[rule.field] = elements if rule.many else elements[:1]
+                    result.provenance[rule.field] = selector.selector
+                    break
+        return result
@@ -0,0 +1,84 @@
+import re
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Pattern, Sequence
+
+from src.core.extraction_engine import ExtractionEngine, ExtractionResult, FieldRule
+from src.utils.compiled_selectors import compile_selector
+
+# Product field -> category selector key.
+FIELD_SELECTORS = {
+    'name': 'title_selector',
+    'price': 'price_selector',
+    'stock': 'stock_selector',
+    'description': 'description_selector',
+    'language': 'language_selector',
+    'image': 'image_selector',
+}
+
+
+@dataclass(frozen=True)
+class ExtractionPlan:
+    """
+    Immutable per-category recipe for reading a product page: a FieldRule per
+    configured field, the engine that matches them in one walk, and the
+    scraper's price regex. Built once when the scraper initializes its
+    categories and shared by all workers.
+    """
+
+    fields: Mapping[str, FieldRule] = field(default_factory=lambda: MappingProxyType({}))
+    price_pattern: Optional[Pattern] = None
+    engine: ExtractionEngine = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def for_category(cls, category, price_pattern: Optional[str] = None,
+                     field_rules: Optional[Mapping[str, Sequence[str]]] = None,
+                     multi_value_fields: Iterable[str] = ()) -> 'ExtractionPlan':
+        """
+        Builds the plan from the category's selectors. ``field_rules`` replaces the
+        configured selector of a field (or adds a field) with selectors tried in
+        order; fields in ``multi_value_fields`` keep every match.
+        """
+        field_rules = field_rules or {}
+        multi_value_fields = set(multi_value_fields)
+
+        selectors: Dict[str, list] = {}
+        for name, key in FIELD_SELECTORS.items():
+            compiled = category.compiled_selectors.get(key)
+            if compiled is None and category.selectors.get(key):
+                compiled = compile_selector(category.selectors[key])
+            if compiled is not None:
+                selectors[name] = [compiled]
+        for name, rule_selectors in field_rules.items():
+            selectors[name] = [compile_selector(selector) for selector in rule_selectors]
+
+        rules = {
+            name: FieldRule(name, tuple(compiled), many=name in multi_value_fields)
+            for name, compiled in selectors.items() if compiled
+        }
+        return cls(
+            fields=MappingProxyType(rules),
+            price_pattern=re.compile(price_pattern) if price_pattern else None,
+            engine=ExtractionEngine(rules.values()),
+        )
+
+    def has(self, name: str) -> bool:
+        return name in self.fields
+
+    def extract(self, document) -> ExtractionResult:
+        """Matches every field in one pass over ``document``; unmatched fields map to []."""
+        if self.engine is None:
+            return ExtractionResult()
+        return self.engine.extract(document)
+
+    def first(self, document, name: str) -> Optional[Any]:
+        rule = self.fields.get(name)
+        if rule is None:
+            return None
+        return ExtractionEngine([rule]).extract(document).first(name)
+
+    def match_price(self, text: str) -> Optional[str]:
+        if self.price_pattern is None:
+            return text
+        match = self.price_pattern.search(text)
+        return match.group() if match else None
@@ -0,0 +1,128 @@
+import os
+import json
+import threading
+from typing import Dict, Any, Optional
+
+# Scrapers running in parallel may share one profile file.
+_PROFILE_FILE_LOCK = threading.Lock()
+
+
+class RenderProfile:
+    """Observations for one (store, page type) pair."""
+
+    def __init__(self, static_hits: int = 0, static_misses: int = 0,
+                 decision: Optional[str] = None, since_probe: int = 0):
+        self.static_hits = static_hits
+        self.static_misses = static_misses
+        self.decision = decision
+        self.since_probe = since_probe
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'static_hits': self.static_hits,
+            'static_misses': self.static_misses,
+            'decision': self.decision,
+        }
+
+
+class StaticFirstStrategy:
+    """
+    Learns per store and page type whether a page needs JavaScript rendering.
+
+    Pages are fetched over plain HTTP first and the caller reports whether the
+    configured selectors matched. After ``probe_limit`` consistent observations
+    the page type is pinned to ``static`` or ``render``. Pinned ``render`` page
+    types are re-probed every ``reprobe_every`` pages in case the site changes.
+    Profiles are persisted to ``profile_path`` when one is given.
+    """
+
+    STATIC = 'static'
+    RENDER = 'render'
+
+    def __init__(self, store: str, profile_path: Optional[str] = None,
+                 probe_limit: int = 3, reprobe_every: int = 50):
+        self.store = store
+        self.profile_path = profile_path
+        self.probe_limit = probe_limit
+        self.reprobe_every = reprobe_every
+        self.profiles: Dict[str, RenderProfile] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def _key(self, page_type: str) -> str:
+        return f"{self.store}:{page_type}"
+
+    def _profile(self, page_type: str) -> RenderProfile:
+        key = self._key(page_type)
+        if key not in self.profiles:
+            self.profiles[key] = RenderProfile()
+        return self.profiles[key]
+
+    def decision(self, page_type: str) -> Optional[str]:
+        with self._lock:
+            return self._profile(page_type).decision
+
+    def should_try_static(self, page_type: str) -> bool:
+        with self._lock:
+            profile = self._profile(page_type)
+            if profile.decision != self.RENDER:
+                return True
+            profile.since_probe += 1
+            if profile.since_probe >= self.reprobe_every:
+                profile.since_probe = 0
+                return True
+            return False
+
+    def record(self, page_type: str, static_ok: bool) -> None:
+        with self._lock:
+            profile = self._profile(page_type)
+            if static_ok:
+                profile.static_hits += 1
+                if profile.decision == self.RENDER:
+                    # A re-probe succeeded: start learning again from scratch.
+                    profile.decision = None
+                    profile.static_misses = 0
+                    profile.static_hits = 1
+            else:
+                profile.static_misses += 1
+                if profile.decision == self.STATIC:
+                    profile.decision = None
+                    profile.static_hits = 0
+                    profile.static_misses = 1
+
+            if profile.decision is None:
+                if profile.static_hits >= self.probe_limit and profile.static_misses == 0:
+                    profile.decision = self.STATIC
+                elif profile.static_misses >= self.probe_limit and profile.static_hits == 0:
+                    profile.decision = self.RENDER
+
+    def load(self) -> None:
+        if not self.profile_path or not os.path.exists(self.profile_path):
+            return
+        try:
+            with open(self.profile_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, values in stored.items():
+            if key.startswith(f"{self.store}:"):
+                self.profiles[key] = RenderProfile(**values)
+
+    def save(self) -> None:
+        if not self.profile_path:
+            return
+        with _PROFILE_FILE_LOCK, self._lock:
+            stored = {}
+            if os.path.exists(self.profile_path):
+                try:
+                    with open(self.profile_path, 'r', encoding='utf-8') as f:
+                        stored = json.load(f)
+                except (OSError, ValueError):
+                    stored = {}
+            stored.update({key: profile.to_dict() for key, profile in self.profiles.items()})
+
+            directory = os.path.dirname(self.profile_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.profile_path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f, indent=2)
@@ -0,0 +1,102 @@
+import math
+import re
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.utils.compiled_selectors import compile_selector
+
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d{3})*')
+
+
+def _first_number(text: str) -> Optional[int]:
+    match = NUMBER_PATTERN.search(text or '')
+    return int(re.sub(r'[.,]', '', match.group())) if match else None
+
+
+@dataclass(frozen=True)
+class PaginationRule:
+    """
+    How to walk the listing pages of a category, from its ``pagination`` config:
+
+    - ``page_param`` (query parameter set on the category URL) or ``url_template``
+      (``{page}`` placeholder) builds the URL of page N;
+    - ``next_selector`` follows the page's "next" link instead;
+    - ``last_page_selector`` (page links, the highest number wins) or
+      ``total_selector`` plus ``per_page`` (product count) give the page count,
+      which lets pages 2..N be fetched concurrently.
+
+    Walking stops after ``max_pages``, when there is no next page, or when a page
+    adds no new products.
+    """
+
+    page_param: Optional[str] = None
+    url_template: Optional[str] = None
+    next_selector: Optional[str] = None
+    last_page_selector: Optional[str] = None
+    total_selector: Optional[str] = None
+    per_page: Optional[int] = None
+    start: int = 1
+    max_pages: int = 20
+    concurrency: int = 4
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['PaginationRule']:
+        if not config:
+            return None
+        known = {key: config[key] for key in cls.__dataclass_fields__ if key in config}
+        rule = cls(**known)
+        if not (rule.page_param or rule.url_template or rule.next_selector):
+            raise ValueError("pagination needs page_param, url_template or next_selector")
+        return rule
+
+    @property
+    def addressable(self) -> bool:
+        """True when page N has a URL without visiting page N-1."""
+        return bool(self.page_param or self.url_template)
+
+    def page_url(self, first_url: str, page: int) -> Optional[str]:
+        if self.url_template:
+            return self.url_template.format(page=page)
+        if not self.page_param:
+            return None
+        parts = urllib.parse.urlsplit(first_url)
+        query = [(key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                 if key != self.page_param]
+        query.append((self.page_param, str(page)))
+        return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+    @property
+    def last_allowed_page(self) -> int:
+        """Number of the last page ``max_pages`` lets the scraper fetch."""
+        return self.start + self.max_pages - 1
+
+    def total_pages(self, document) -> Optional[int]:
+        """
+        Page count announced by the first listing page. It is not capped, so the
+        caller can tell a listing cut short by ``max_pages`` (see
+        ``last_allowed_page``).
+        """
+        pages = None
+        if self.last_page_selector:
+            numbers = []
+            for element in compile_selector(self.last_page_selector).select(document):
+                numbers.append(_first_number(element.get_text()))
+                href = element.get('href') or ''
+                if self.page_param and href:
+                    query = urllib.parse.parse_qs(urllib.parse.urlsplit(href).query)
+                    numbers.append(_first_number((query.get(self.page_param) or [''])[0]))
+            numbers = [number for number in numbers if number]
+            pages = max(numbers) if numbers else None
+        elif self.total_selector and self.per_page:
+            element = compile_selector(self.total_selector).select_one(document)
+            total = _first_number(element.get_text()) if element is not None else None
+            pages = math.ceil(total / self.per_page) if total else None
+        return pages
+
+    def next_url(self, document, current_url: str) -> Optional[str]:
+        if not self.next_selector:
+            return None
+        element = compile_selector(self.next_selector).select_one(document)
+        href = element.get('href') if element is not None else None
+        return urllib.parse.urljoin(current_url, href) if href else None
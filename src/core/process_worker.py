@@ -0,0 +1,126 @@
+"""
+Worker side of ScraperManager's process executor.
+
+Each worker process builds the scraper of one store from its config and runs
+it with its own sessions (and its own BrowserPool when the run configures
+one). Products and completed categories go back to the parent over a single
+multiprocessing queue, batched into lists of small tuples:
+
+- ``('product', category, product)``
+- ``('complete', category)``
+
+sent as ``('batch', store, [...])``, and a final ``('done', store, report,
+categories, error)`` once the store has finished. Each product crosses the
+queue once: the parent hands it to the sink and checkpoints it unless its
+checkpoint already has it (a product resumed from an earlier run). Products
+are batched; ``complete`` flushes the batch at once, so the category's
+products always reach the parent first. Everything a store sends travels on
+the same queue, so ``done`` always arrives after its last batch.
+"""
+from typing import Any, Dict, List, Optional
+
+from src.core.logger_factory import LoggerFactory
+from src.core.scraper_factory import ScraperFactory
+from src.utils.browser_pool import BrowserPool
+
+_channel = None
+_browser_pool: Optional[BrowserPool] = None
+
+
+def init_worker(channel, browser_pool_config=None) -> None:
+    """ProcessPoolExecutor initializer: keeps the queue and builds this process's browser pool."""
+    global _channel, _browser_pool
+    _channel = channel
+    _browser_pool = BrowserPool.from_config(browser_pool_config)
+
+
+class _Batcher:
+    """
+    Buffers a store's messages and puts them on the queue ``batch_size`` at a
+    time, or at once (with whatever is pending) for ``urgent`` ones.
+    """
+
+    def __init__(self, channel, store: str, batch_size: int):
+        self.channel = channel
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.pending: List[tuple] = []
+
+    def send(self, message: tuple, urgent: bool = False) -> None:
+        self.pending.append(message)
+        if urgent or len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def product(self, store: str, category: str, product: Dict[str, Any]) -> None:
+        """Scraper sink."""
+        self.send(('product', category, product))
+
+    def flush(self) -> None:
+        if self.pending:
+            batch, self.pending = self.pending, []
+            self.channel.put(('batch', self.store, batch))
+
+
+class ForwardingCheckpoint:
+    """
+    The parent's CheckpointStore as seen from a worker: reads come from the
+    snapshot taken when the store was submitted. The parent stays the only
+    writer of the checkpoint file: it records the products it receives, and
+    completed categories are forwarded.
+    """
+
+    def __init__(self, snapshot: Dict[str, Any], batcher: _Batcher):
+        self._complete = set(snapshot.get('complete', ()))
+        self._products: Dict[str, Dict[str, Dict[str, Any]]] = {
+            category: dict(products) for category, products in snapshot.get('products', {}).items()}
+        self._batcher = batcher
+
+    def is_complete(self, store: str, category: str) -> bool:
+        return category in self._complete
+
+    def products(self, store: str, category: str) -> Dict[str, Dict[str, Any]]:
+        return dict(self._products.get(category, {}))
+
+    def get(self, store: str, category: str, url: str) -> Optional[Dict[str, Any]]:
+        product = self._products.get(category, {}).get(url)
+        return dict(product) if product is not None else None
+
+    def record(self, store: str, category: str, url: str, product: Dict[str, Any]) -> None:
+        # The parent checkpoints the product when it arrives through the sink;
+        # like CheckpointStore, the worker keeps no body of its own.
+        pass
+
+    def complete(self, store: str, category: str) -> None:
+        self._complete.add(category)
+        self._batcher.send(('complete', category), urgent=True)
+
+
+def scrape_store(name: str, scraper_config: Dict[str, Any], checkpoint_snapshot: Optional[Dict[str, Any]] = None,
+                 batch_size: int = 100) -> None:
+    """Runs one store in this worker process; everything it produces goes to the queue."""
+    logger = LoggerFactory.create_logger("process_worker")
+    batcher = _Batcher(_channel, name, batch_size)
+    report, categories, error = {}, [], None
+    try:
+        scraper = ScraperFactory.create_scraper(name, scraper_config)
+        scraper.browser_pool = _browser_pool
+        scraper.sink = batcher.product
+        # The parent keeps the products it receives; the worker holds none.
+        scraper.retain_results = False
+        if checkpoint_snapshot is not None:
+            scraper.checkpoint = ForwardingCheckpoint(checkpoint_snapshot, batcher)
+        categories = list(scraper.run())
+        report = scraper.get_report()
+    except Exception as e:
+        logger.error(f"Scraper {name} failed: {e}", exc_info=True)
+        error = str(e)
+    finally:
+        try:
+            if _browser_pool is not None:
+                _browser_pool.close()
+        except Exception as e:
+            logger.warning(f"Error closing the browser pool after {name}: {e}")
+        finally:
+            # The parent waits for 'done'; it must be sent whatever happens above.
+            batcher.flush()
+            _channel.put(('done', name, report, categories, error))
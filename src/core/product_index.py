@@ -0,0 +1,80 @@
+import os
+import json
+import hashlib
+import datetime
+import threading
+from typing import Dict, Any, Optional
+
+
+class ProductIndex:
+    """
+    Persistent per-store index of previously scraped products, keyed by URL.
+
+    Each entry keeps the listing-level fingerprint (title, listing price, image)
+    seen on the category page and the full record produced from the detail page,
+    so unchanged products can be carried forward without fetching them again.
+    Records older than ``max_age`` seconds are fetched again whatever the
+    fingerprint says, so stock changes the listing does not show still land.
+    """
+
+    def __init__(self, path: str, max_age: Optional[float] = None):
+        self.path = path
+        self.max_age = max_age
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def fingerprint(title: str, listing_price: Optional[str] = None, image: Optional[str] = None) -> str:
+        payload = json.dumps([title or "", listing_price or "", image or ""], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def unchanged(self, url: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Returns a copy of the stored record when the listing fingerprint still matches."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or entry.get('fingerprint') != fingerprint or self._expired(entry):
+                return None
+            entry['last_seen'] = datetime.datetime.now().isoformat()
+            return dict(entry['record'])
+
+    def update(self, url: str, fingerprint: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries[url] = {
+                'fingerprint': fingerprint,
+                'record': record,
+                'fetched_at': datetime.datetime.now().isoformat(),
+                'last_seen': datetime.datetime.now().isoformat(),
+            }
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        if self.max_age is None:
+            return False
+        try:
+            fetched_at = datetime.datetime.fromisoformat(entry['fetched_at'])
+        except (KeyError, TypeError, ValueError):
+            # Entries written before fetched_at existed are refreshed once.
+            return True
+        return (datetime.datetime.now() - fetched_at).total_seconds() > self.max_age
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
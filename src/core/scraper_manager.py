@@ -1,18 +1,36 @@
 import json
+import multiprocessing
+import queue
 import yaml
-from typing import Dict, Any, List
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+from src.core import process_worker
+from src.core.checkpoint import CheckpointStore
 from src.core.scraper_factory import ScraperFactory
 from src.core.logger_factory import LoggerFactory
+from src.utils.browser_pool import BrowserPool
 import os
 import datetime
 
 
 class ScraperManager:
-    def __init__(self, config_file: str):
+    def __init__(self, config_file: str, max_workers: Optional[int] = None,
+                 checkpoint: Optional[CheckpointStore] = None,
+                 sink: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+                 retain_results: bool = True, executor: Optional[str] = None):
         self.logger = LoggerFactory.create_logger("scraper_manager")
         self.config_file = config_file
         self.scrapers = {}
         self.report = {}
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self.sink = sink
+        self.retain_results = retain_results
+        # "thread" (default) or "process"; None takes the config file's "executor".
+        self.executor = executor
+        self.browser_pool: Optional[BrowserPool] = None
+        self._report_lock = threading.Lock()
         self.load_config()
 
     def load_config(self) -> None:
@@ -28,16 +46,29 @@ class ScraperManager:
                     raise ValueError("Unsupported configuration file format")
 
             self.config = config
+            if self.max_workers is None:
+                self.max_workers = config.get('max_workers', 1)
+            if self.executor is None:
+                self.executor = config.get('executor', 'thread')
 
             for name, scraper_config in config.get('scrapers', {}).items():
                 try:
                     self.logger.info(f"Creating scraper for {name}")
                     self.scrapers[name] = ScraperFactory.create_scraper(
                         name, scraper_config)
+                    self.scrapers[name].checkpoint = self.checkpoint
+                    self.scrapers[name].sink = self.sink
+                    self.scrapers[name].retain_results = self.retain_results
                     self.logger.info(f"Created scraper: {name}")
                 except Exception as e:
                     self.logger.error(
                         f"Failed to create scraper {name}: {e}", exc_info=True)
+
+            # Worker processes build their own pools (see process_worker).
+            if not self._uses_processes():
+                self.browser_pool = BrowserPool.from_config(config.get('browser_pool'))
+                for scraper in self.scrapers.values():
+                    scraper.browser_pool = self.browser_pool
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}", exc_info=True)
             raise
@@ -81,21 +112,138 @@ class ScraperManager:
 
         self.logger.info(f"Running scraper: {name}")
         results = self.scrapers[name].run()
-        self.report[name] = self.scrapers[name].get_report()
+        with self._report_lock:
+            self.report[name] = self.scrapers[name].get_report()
 
         # self.save_results_per_category(name, results)
 
         return results
 
+    def _workers(self) -> int:
+        return min(self.max_workers or 1, len(self.scrapers))
+
+    def _uses_processes(self) -> bool:
+        return self._workers() > 1 and self.executor == 'process'
+
     def run_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        self.logger.info("Running all scrapers")
-        results = {}
+        workers = self._workers()
+        try:
+            if self._uses_processes():
+                return self._run_all_in_processes(workers)
+            if workers > 1:
+                if self.executor != 'thread':
+                    self.logger.warning(f"Unknown executor '{self.executor}', using threads")
+                return self._run_all_concurrently(workers)
+
+            self.logger.info("Running all scrapers")
+            results = {}
+
+            for name, scraper in self.scrapers.items():
+
+                results[name] = self.run_scraper(name)
+            return results
+        finally:
+            self.close_browser_pool()
+
+    def close_browser_pool(self) -> None:
+        """Closes the shared browsers once every scraper is done with them."""
+        if self.browser_pool is None:
+            return
+        self.logger.info(f"Browser pool: {self.browser_pool.metrics()}")
+        self.browser_pool.shutdown()
+
+    def _run_all_concurrently(self, workers: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Runs every scraper on a bounded thread pool. Each scraper opens its own
+        session in setup(), so workers never share a page or context (they may
+        share the browsers of a ``browser_pool``). Results keep the order of the
+        configuration file.
+        """
+        self.logger.info(f"Running all scrapers with {workers} workers")
 
-        for name, scraper in self.scrapers.items():
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            futures = {name: executor.submit(self.run_scraper, name) for name in self.scrapers}
 
-            results[name] = self.run_scraper(name)
+        return {name: future.result() for name, future in futures.items()}
+
+    def _run_all_in_processes(self, workers: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Runs every store in a pool of worker processes (see process_worker), so
+        parsing uses every core instead of sharing one GIL. Each worker builds
+        its own scraper and sessions; this process receives the products over a
+        queue as they are scraped, passes them to the sink, keeps them when
+        retaining results and writes the checkpoint. Results keep the order of
+        the configuration file.
+        """
+        self.logger.info(f"Running all scrapers in {workers} processes")
+        context = multiprocessing.get_context('spawn')
+        channel = context.Queue()
+        collected: Dict[str, Dict[str, List[Dict[str, Any]]]] = {name: {} for name in self.scrapers}
+        done: Dict[str, List[str]] = {}
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=process_worker.init_worker,
+                                 initargs=(channel, self.config.get('browser_pool'))) as executor:
+            futures = {
+                executor.submit(process_worker.scrape_store, name, self.config['scrapers'][name],
+                                self._checkpoint_snapshot(name)): name
+                for name in self.scrapers
+            }
+            while len(done) < len(futures):
+                try:
+                    message = channel.get(timeout=0.5)
+                except queue.Empty:
+                    self._check_workers(futures, done)
+                    continue
+                self._apply_worker_message(message, collected, done)
+
+        results = {}
+        for name in self.scrapers:
+            products = collected[name]
+            results[name] = {category: products.get(category, []) for category in done.get(name, [])}
         return results
 
+    def _checkpoint_snapshot(self, name: str) -> Optional[Dict[str, Any]]:
+        if self.checkpoint is None:
+            return None
+        categories = [category.name for category in self.scrapers[name].categories]
+        return {
+            'complete': [category for category in categories if self.checkpoint.is_complete(name, category)],
+            'products': {category: self.checkpoint.products(name, category) for category in categories},
+        }
+
+    def _apply_worker_message(self, message, collected, done) -> None:
+        kind, name = message[0], message[1]
+        if kind == 'done':
+            _, _, report, categories, error = message
+            if error:
+                self.logger.error(f"Scraper {name} failed in its worker: {error}")
+            with self._report_lock:
+                self.report[name] = report
+            done[name] = categories
+            return
+
+        for entry in message[2]:
+            if entry[0] == 'product':
+                _, category, product = entry
+                if self.retain_results:
+                    collected[name].setdefault(category, []).append(product)
+                if self.sink is not None:
+                    self.sink(name, category, product)
+                url = product.get('url')
+                if self.checkpoint is not None and url and (name, category, url) not in self.checkpoint:
+                    self.checkpoint.record(name, category, url, product)
+            elif entry[0] == 'complete' and self.checkpoint is not None:
+                self.checkpoint.complete(name, entry[1])
+
+    def _check_workers(self, futures, done) -> None:
+        """Marks stores whose worker died without reporting back as done."""
+        for future, name in futures.items():
+            if name not in done and future.done() and future.exception() is not None:
+                self.logger.error(f"Worker for {name} crashed: {future.exception()}")
+                with self._report_lock:
+                    self.report[name] = {}
+                done[name] = []
+
     def get_report(self) -> Dict[str, Any]:
         return self.report
 
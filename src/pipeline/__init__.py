@@ -3,5 +3,6 @@ Pipeline package
 """
 from .pipeline import ScraperPipeline
 from .models import PipelineConfig, PipelineResult, PipelineStage
+from .price_history import PriceHistory
 
-__all__ = ['ScraperPipeline', 'PipelineConfig', 'PipelineResult', 'PipelineStage']
+__all__ = ['ScraperPipeline', 'PipelineConfig', 'PipelineResult', 'PipelineStage', 'PriceHistory']
@@ -0,0 +1,163 @@
+"""
+Content-hash index behind delta uploads
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Fields that change on every run without the product changing.
+VOLATILE_FIELDS = ('timestamp',)
+
+DELTA_PAYLOADS = ('full', 'compact')
+
+Key = Tuple[str, str]
+
+
+def product_key(row: Dict[str, Any]) -> Key:
+    return (str(row.get('store', '')), str(row.get('url', '')))
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    content = {k: v for k, v in row.items() if k not in VOLATILE_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass
+class Delta:
+    """Changes between the last uploaded state and the current run."""
+    inserts: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    deletes: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __len__(self) -> int:
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Changed products followed by ``{"store", "url", "category", "deleted": true}`` tombstones."""
+        return self.inserts + self.updates + self.deletes
+
+    def payload(self, style: str = 'full') -> List[Dict[str, Any]]:
+        """
+        Rows to POST, one per ``entries()`` item. ``full`` sends them as they
+        are; ``compact`` tags each with ``op`` (``upsert``/``delete``), drops
+        empty and volatile fields from upserts and keeps only ``store`` and
+        ``url`` on deletes.
+        """
+        if style not in DELTA_PAYLOADS:
+            raise ValueError(f"Unknown delta payload: {style}")
+        if style == 'full':
+            return self.entries()
+        return [compact_entry(entry) for entry in self.entries()]
+
+    def summary(self) -> str:
+        return (f"{len(self.inserts)} new, {len(self.updates)} changed, "
+                f"{len(self.deletes)} removed, {self.unchanged} unchanged")
+
+
+def crawled(report: Optional[Dict[str, Any]]) -> Tuple[Set[Key], Set[Key]]:
+    """
+    From the scrapers' reports (``{store: {category: {...}}}``): the
+    ``(store, category)`` pairs whose listing was read in full this run, and the
+    ``(store, url)`` of products listed there that failed to scrape.
+    """
+    scopes: Set[Key] = set()
+    failed: Set[Key] = set()
+    for store, categories in (report or {}).items():
+        for category, stats in (categories or {}).items():
+            if isinstance(stats, dict) and stats.get('listing_complete') is True:
+                scopes.add((str(store), str(category)))
+                failed.update((str(store), str(url)) for url in stats.get('failed_urls', ()))
+    return scopes, failed
+
+
+def compact_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    if entry.get('deleted') is True:
+        return {'op': 'delete', 'store': entry['store'], 'url': entry['url']}
+    compact = {'op': 'upsert'}
+    compact.update((k, v) for k, v in entry.items()
+                   if k not in VOLATILE_FIELDS and v not in (None, '', [], {}))
+    return compact
+
+
+class UploadIndex:
+    """
+    What the backend last acknowledged: ``(store, url) -> (content hash,
+    category)``, kept in a JSON file next to the exports.
+
+    ``diff`` sorts the current run into inserts, updates and unchanged products,
+    and turns indexed products that are gone into tombstones. A product is only
+    gone when its category's listing was read in full (``crawled`` on the run's
+    report) and it was not listed there: products past ``batch_size``, behind a
+    failed listing page or whose detail page failed are kept, and so is every
+    product of a scraper that failed outright. ``acknowledge`` records
+    the entries of delivered chunks and ``save`` persists them, so anything that
+    failed to upload is sent again next time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[Key, Tuple[str, str]] = {}
+
+    def load(self) -> 'UploadIndex':
+        if not os.path.exists(self.path):
+            return self
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for store, url, digest, category in data.get('products', []):
+            self._entries[(store, url)] = (digest, category)
+        return self
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        products = [[store, url, digest, category]
+                    for (store, url), (digest, category) in sorted(self._entries.items())]
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'products': products}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def classify(self, row: Dict[str, Any]) -> Optional[str]:
+        """``insert``, ``update``, or None when the backend already has the row."""
+        indexed = self._entries.get(product_key(row))
+        if indexed is None:
+            return 'insert'
+        return None if indexed[0] == content_hash(row) else 'update'
+
+    def tombstones(self, seen: Set[Key], report: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Indexed products of fully crawled categories that were neither in ``seen`` nor listed."""
+        scopes, failed = crawled(report)
+        return [{'store': store, 'url': url, 'category': category, 'deleted': True}
+                for (store, url), (_, category) in sorted(self._entries.items())
+                if (store, category) in scopes and (store, url) not in seen and (store, url) not in failed]
+
+    def diff(self, rows: Iterable[Dict[str, Any]], report: Optional[Dict[str, Any]] = None) -> Delta:
+        """``report`` is the scrapers' report; without it nothing is tombstoned."""
+        delta = Delta()
+        seen: Set[Key] = set()
+        for row in rows:
+            seen.add(product_key(row))
+            change = self.classify(row)
+            if change == 'insert':
+                delta.inserts.append(row)
+            elif change == 'update':
+                delta.updates.append(row)
+            else:
+                delta.unchanged += 1
+        delta.deletes = self.tombstones(seen, report)
+        return delta
+
+    def acknowledge(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Records ``Delta.entries()`` the backend accepted."""
+        for entry in entries:
+            key = product_key(entry)
+            if entry.get('deleted') is True:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = (content_hash(entry), str(entry.get('category', '')))
+
+    def __len__(self) -> int:
+        return len(self._entries)
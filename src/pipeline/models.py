@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 
 class PipelineStage(Enum):
@@ -32,3 +32,39 @@ class PipelineConfig:
     json_filename: str = "prod_result.json"
     excel_filename: str = "consolidated_results.xlsx"
     request_timeout: int = 30
+    # Files written by the export step: json, jsonl, excel (pandas), excel_stream
+    # (constant memory), parquet and arrow (need pyarrow). json, jsonl and excel
+    # files take the *_filename fields; the rest are export_basename + extension.
+    export_formats: Tuple[str, ...] = ("json", "excel")
+    export_basename: str = "prod_result"
+    # SQLite price history under output_dir, appended on every export (None disables it).
+    history_db: Optional[str] = None
+    max_workers: Optional[int] = None
+    # How scrapers run side by side: "thread" or "process" (one store per worker
+    # process); None takes the scraper config file's "executor".
+    executor: Optional[str] = None
+    # Completed products are logged to output_dir/checkpoint_filename (None disables it);
+    # resume reuses them instead of starting over.
+    checkpoint_filename: Optional[str] = "checkpoint.jsonl"
+    resume: bool = False
+    # Streaming mode: products flow through a bounded queue to the JSONL file and
+    # POST batches while scraping runs (see StreamingStage).
+    streaming: bool = False
+    stream_queue_size: int = 1000
+    post_batch_size: int = 500
+    jsonl_filename: str = "prod_result.jsonl"
+    # Bulk upload: items per POST (None sends everything in one request), gzip
+    # bodies, chunks in flight, retries per chunk, and where failed chunks are
+    # kept (under output_dir, None disables) for the next run to replay.
+    upload_chunk_size: Optional[int] = None
+    upload_gzip: bool = False
+    upload_concurrency: int = 1
+    upload_retries: int = 3
+    upload_backoff: float = 1.0
+    upload_spool_dir: Optional[str] = None
+    # Delta upload: only products whose content hash changed since the last
+    # acknowledged upload are POSTed, plus tombstones for vanished ones. The index
+    # lives in output_dir/delta_index_filename; delta_payload is "full" or "compact".
+    delta_upload: bool = False
+    delta_index_filename: str = "upload_index.json"
+    delta_payload: str = "full"
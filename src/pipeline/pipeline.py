@@ -1,6 +1,7 @@
 """
 Main pipeline orchestrator
 """
+import datetime
 import logging
 from typing import Dict, Any, List, Type
 from .models import PipelineConfig, PipelineResult, PipelineStage
@@ -11,7 +12,8 @@ from .stages import (
     ConsolidationStage,
     ExportStage,
     PostRequestStage,
-    CleanupStage
+    CleanupStage,
+    StreamingStage
 )
 from .stages.base import BaseStage
 
@@ -21,10 +23,14 @@ class ScraperPipeline:
     def __init__(self, config: PipelineConfig):
         self.config = config
         self.logger = LoggerFactory.create_logger("ScraperPipeline")
-        self.context = {'config': config}
+        self.context = {'config': config, 'started_at': datetime.datetime.now()}
         self.stages = self._initialize_stages()
 
     def _initialize_stages(self) -> List[BaseStage]:
+        if self.config.streaming:
+            stage_classes = [InitializationStage, StreamingStage, CleanupStage]
+            return [stage_class(self.logger) for stage_class in stage_classes]
+
         stage_classes = [
             InitializationStage,
             ScrapingStage,
@@ -67,7 +73,7 @@ class ScraperPipeline:
             "total_stages": len(pipeline_results),
             "successful_stages": len(successful_stages),
             "failed_stages": len(failed_stages),
-            "total_items_processed": len(consolidated_data),
+            "total_items_processed": self.context.get('items_processed', len(consolidated_data)),
             "scrapers_executed": len(scraper_results),
             "scraping_time": scraping_time,
             "stages_detail": [
@@ -0,0 +1,139 @@
+"""
+Append-only price history of every exported product, kept in SQLite
+"""
+import datetime
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_snapshots (
+    snapshot_date TEXT NOT NULL,
+    store TEXT NOT NULL,
+    url TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    game TEXT,
+    name TEXT,
+    product_type TEXT,
+    price INTEGER,
+    stock TEXT,
+    PRIMARY KEY (snapshot_date, store, url, captured_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_store_url ON price_snapshots (store, url, captured_at);
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_game_name ON price_snapshots (game, name);
+"""
+
+# Products seen since ``:since`` come from a range of the primary key; each one's
+# latest snapshot and the one before it are then looked up through the
+# (store, url, captured_at) index, so the rest of the history is never read.
+# MATERIALIZED and CROSS JOIN pin that plan; without statistics SQLite would
+# rather walk the whole store/url index.
+CHANGES = """
+WITH recent AS MATERIALIZED (
+    SELECT store, url FROM price_snapshots
+    WHERE snapshot_date >= substr(:since, 1, 10) AND captured_at >= :since
+      AND (:store IS NULL OR store = :store)
+), latest AS (
+    SELECT store, url,
+           (SELECT MAX(captured_at) FROM price_snapshots s
+            WHERE s.store = products.store AND s.url = products.url) AS captured_at
+    FROM (SELECT DISTINCT store, url FROM recent) AS products
+)
+SELECT cur.store, cur.url, cur.game, cur.name, cur.captured_at, prev.price AS previous_price, cur.price
+FROM latest
+CROSS JOIN price_snapshots cur
+  ON cur.store = latest.store AND cur.url = latest.url AND cur.captured_at = latest.captured_at
+CROSS JOIN price_snapshots prev
+  ON prev.store = latest.store AND prev.url = latest.url
+ AND prev.captured_at = (SELECT MAX(captured_at) FROM price_snapshots s
+                         WHERE s.store = latest.store AND s.url = latest.url
+                           AND s.captured_at < latest.captured_at)
+WHERE cur.price IS NOT prev.price
+ORDER BY cur.store, cur.url
+"""
+
+
+def _price(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PriceHistory:
+    """
+    One row per product per run in ``price_snapshots``, never updated.
+
+    The primary key starts with ``(snapshot_date, store)``, so each day's
+    snapshots of a store sit together like a partition and can be scanned or
+    pruned as a range. ``(store, url)`` and ``(game, name)`` are indexed for the
+    lookups below. A run is identified by its ``captured_at``: the export stages
+    pass the pipeline's start time, so recording the same run twice is a no-op.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def record(self, rows: Iterable[Dict[str, Any]], captured_at: Optional[datetime.datetime] = None) -> int:
+        """Appends a snapshot of ``rows`` taken at ``captured_at`` (now by default); returns rows added."""
+        captured_at = (captured_at or datetime.datetime.now()).replace(microsecond=0)
+        stamp = captured_at.isoformat(sep=' ')
+        day = captured_at.date().isoformat()
+        snapshots = (
+            (day, str(row.get('store', '')), str(row.get('url', '')), stamp, row.get('game', row.get('category')),
+             row.get('name'), row.get('product_type'), _price(row.get('price')), row.get('stock'))
+            for row in rows if row.get('url')
+        )
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO price_snapshots "
+                "(snapshot_date, store, url, captured_at, game, name, product_type, price, stock) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", snapshots)
+            return self._conn.total_changes - before
+
+    def price_series(self, store: str, url: str) -> List[Dict[str, Any]]:
+        """``captured_at``/``price``/``stock`` of one product, oldest first."""
+        rows = self._conn.execute(
+            "SELECT captured_at, price, stock FROM price_snapshots "
+            "WHERE store = ? AND url = ? ORDER BY captured_at", (store, url))
+        return [dict(row) for row in rows]
+
+    def find(self, game: str, name: str) -> List[Dict[str, Any]]:
+        """Latest snapshot of every store's product called ``name`` in ``game``."""
+        rows = self._conn.execute(
+            "SELECT store, url, game, name, MAX(captured_at) AS captured_at, price, stock "
+            "FROM price_snapshots WHERE game = ? AND name = ? GROUP BY store, url ORDER BY price",
+            (game, name))
+        return [dict(row) for row in rows]
+
+    def changed_since(self, since, store: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Products whose latest snapshot, taken at or after ``since`` (a date,
+        datetime or ISO string), has a different price than the snapshot before
+        it: ``old_price``, ``new_price`` and ``changed_at`` describe that last
+        step only.
+        """
+        if isinstance(since, datetime.datetime):
+            since = since.isoformat(sep=' ')
+        elif isinstance(since, datetime.date):
+            since = since.isoformat()
+        rows = self._conn.execute(CHANGES, {'since': str(since), 'store': store})
+        return [{'store': row['store'], 'url': row['url'], 'game': row['game'], 'name': row['name'],
+                 'old_price': row['previous_price'], 'new_price': row['price'],
+                 'changed_at': row['captured_at']}
+                for row in rows]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'PriceHistory':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
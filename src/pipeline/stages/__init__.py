@@ -7,6 +7,7 @@ from .consolidation import ConsolidationStage
 from .export import ExportStage
 from .post_request import PostRequestStage
 from .cleanup import CleanupStage
+from .streaming import StreamingStage
 
 __all__ = [
     'InitializationStage',
@@ -14,5 +15,6 @@ __all__ = [
     'ConsolidationStage',
     'ExportStage',
     'PostRequestStage',
-    'CleanupStage'
+    'CleanupStage',
+    'StreamingStage'
 ]
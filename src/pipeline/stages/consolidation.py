@@ -6,6 +6,12 @@ from .base import BaseStage
 from ..models import PipelineResult, PipelineStage
 
 
+def consolidate(store: str, category: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    item['store'] = store
+    item['category'] = category
+    return item
+
+
 class ConsolidationStage(BaseStage):
 
     @property
@@ -28,9 +34,7 @@ class ConsolidationStage(BaseStage):
                         continue
 
                     for item in products:
-                        item['store'] = scraper_name
-                        item['category'] = category_name
-                        all_rows.append(item)
+                        all_rows.append(consolidate(scraper_name, category_name, item))
 
             context['consolidated_data'] = all_rows
 
@@ -1,10 +1,226 @@
-
+"""
+Export stage for the pipeline, and the file exporters it picks from
+``PipelineConfig.export_formats``
+"""
+import datetime
+import json
 import os
+import textwrap
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
 import pandas as pd
-from typing import Any, Dict
+from openpyxl import Workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 from .base import BaseStage
-from ..models import PipelineResult, PipelineStage
-from src.utils.save_results import save_dict_as_json
+from ..models import PipelineConfig, PipelineResult, PipelineStage
+from ..price_history import PriceHistory
+
+# Columns of the Excel file when nothing was scraped.
+EMPTY_COLUMNS = ["name", "price", "url", "store", "category", "timestamp"]
+
+# Low-cardinality columns stored as Arrow dictionaries (pandas categoricals on read).
+DICTIONARY_COLUMNS = ("store", "category", "product_type")
+
+Rows = Iterable[Dict[str, Any]]
+
+
+class JsonlRows:
+    """Re-iterable view of a JSONL file, so exporters can make several passes over it."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def columns_of(rows: Rows) -> List[str]:
+    """Every key of ``rows``, in first-seen order."""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
+
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class Exporter(ABC):
+    """
+    Writes rows to one file format. ``rows`` may be iterated more than once
+    (a list, or ``JsonlRows`` in streaming mode).
+    """
+    extension = ''
+
+    @abstractmethod
+    def export(self, rows: Rows, path: str) -> None:
+        pass
+
+
+class JsonExporter(Exporter):
+    """Indented JSON array, written row by row."""
+    extension = '.json'
+
+    def export(self, rows: Rows, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as out:
+            out.write('[')
+            index = -1
+            for index, row in enumerate(rows):
+                out.write(',\n' if index else '\n')
+                out.write(textwrap.indent(json.dumps(row, ensure_ascii=False, indent=4), ' ' * 4))
+            out.write('\n]' if index >= 0 else ']')
+
+
+class JsonlExporter(Exporter):
+    extension = '.jsonl'
+
+    def export(self, rows: Rows, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as out:
+            for row in rows:
+                out.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+
+
+class ExcelExporter(Exporter):
+    """Excel through a pandas DataFrame; simple, but holds the whole sheet in memory."""
+    extension = '.xlsx'
+
+    def export(self, rows: Rows, path: str) -> None:
+        rows = list(rows)
+        df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=EMPTY_COLUMNS)
+        df.to_excel(path, index=False)
+
+
+class StreamingExcelExporter(Exporter):
+    """
+    Excel written row by row: xlsxwriter in ``constant_memory`` mode when it is
+    installed, openpyxl's write-only workbook otherwise. Both flush rows to disk
+    as they go, so memory stays flat however many rows there are.
+    """
+    extension = '.xlsx'
+
+    def export(self, rows: Rows, path: str) -> None:
+        columns = columns_of(rows)
+        if xlsxwriter is not None:
+            self._export_xlsxwriter(rows, columns, path)
+        else:
+            self._export_openpyxl(rows, columns, path)
+
+    @staticmethod
+    def _export_xlsxwriter(rows: Rows, columns: List[str], path: str) -> None:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'strings_to_urls': False})
+        sheet = workbook.add_worksheet('Sheet1')
+        sheet.write_row(0, 0, columns or EMPTY_COLUMNS)
+        for index, row in enumerate(rows, start=1):
+            sheet.write_row(index, 0, [_cell(row.get(column)) for column in columns])
+        workbook.close()
+
+    @staticmethod
+    def _export_openpyxl(rows: Rows, columns: List[str], path: str) -> None:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        sheet.append(columns or EMPTY_COLUMNS)
+        for row in rows:
+            sheet.append([_cell(row.get(column)) for column in columns])
+        workbook.save(path)
+
+
+class ArrowTableExporter(Exporter):
+    """Base for the pyarrow formats: one table, with ``DICTIONARY_COLUMNS`` dictionary-encoded."""
+
+    def export(self, rows: Rows, path: str) -> None:
+        if pa is None:
+            raise ImportError(f"The {type(self).__name__} requires the pyarrow package")
+        self.write(self.table(rows), path)
+
+    @staticmethod
+    def table(rows: Rows) -> 'pa.Table':
+        rows = list(rows)
+        columns = columns_of(rows)
+        # Nested values become JSON text, as in the Excel exports, so columns keep one type.
+        arrays = {column: [_cell(row.get(column)) for row in rows] for column in columns}
+        table = pa.table(arrays) if columns else pa.table({column: pa.array([], pa.string())
+                                                           for column in EMPTY_COLUMNS})
+        for column in DICTIONARY_COLUMNS:
+            if column in table.column_names:
+                index = table.column_names.index(column)
+                table = table.set_column(index, column, table.column(column).dictionary_encode())
+        return table
+
+    @abstractmethod
+    def write(self, table: 'pa.Table', path: str) -> None:
+        pass
+
+
+class ParquetExporter(ArrowTableExporter):
+    extension = '.parquet'
+
+    def write(self, table: 'pa.Table', path: str) -> None:
+        pq.write_table(table, path, compression='zstd')
+
+
+class ArrowExporter(ArrowTableExporter):
+    """Arrow IPC file (Feather v2)."""
+    extension = '.arrow'
+
+    def write(self, table: 'pa.Table', path: str) -> None:
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+EXPORTERS = {
+    'json': JsonExporter,
+    'jsonl': JsonlExporter,
+    'excel': ExcelExporter,
+    'excel_stream': StreamingExcelExporter,
+    'parquet': ParquetExporter,
+    'arrow': ArrowExporter,
+}
+
+
+def create_exporter(export_format: str) -> Exporter:
+    try:
+        return EXPORTERS[export_format]()
+    except KeyError:
+        raise ValueError(f"Unknown export format: {export_format}") from None
+
+
+def export_path(config: PipelineConfig, export_format: str) -> str:
+    """``json_filename``, ``jsonl_filename`` and ``excel_filename`` name their formats; the rest use ``export_basename``."""
+    filenames = {
+        'json': config.json_filename,
+        'jsonl': config.jsonl_filename,
+        'excel': config.excel_filename,
+        'excel_stream': config.excel_filename,
+    }
+    filename = filenames.get(export_format) or config.export_basename + create_exporter(export_format).extension
+    return os.path.join(config.output_dir, filename)
+
+
+def record_history(config: PipelineConfig, rows: Rows, started_at: Optional[datetime.datetime] = None) -> str:
+    """Records ``rows`` as the snapshot of the run started at ``started_at``."""
+    path = os.path.join(config.output_dir, config.history_db)
+    with PriceHistory(path) as history:
+        added = history.record(rows, captured_at=started_at)
+    return f"{added} price snapshots added to {path}"
 
 
 class ExportStage(BaseStage):
@@ -19,27 +235,24 @@ class ExportStage(BaseStage):
             self.logger.info("Exporting results...")
 
             config = context.get('config')
-            results = context.get('scraper_results', {})
             consolidated_data = context.get('consolidated_data', [])
+            if not consolidated_data:
+                self.logger.warning("No data found to export. Creating empty files.")
 
-            json_file = os.path.join(config.output_dir, config.json_filename)
-            save_dict_as_json(results, json_file)
+            paths = []
+            for export_format in config.export_formats:
+                path = export_path(config, export_format)
+                create_exporter(export_format).export(consolidated_data, path)
+                paths.append(path)
 
-            excel_file = os.path.join(config.output_dir, config.excel_filename)
-            if not consolidated_data:
-                self.logger.warning("No data found to export. Creating empty Excel file.")
-                empty_df = pd.DataFrame(
-                    columns=["name", "price", "url", "store", "category", "timestamp"]
-                )
-                empty_df.to_excel(excel_file, index=False)
-            else:
-                df = pd.DataFrame(consolidated_data)
-                df.to_excel(excel_file, index=False)
+            message = f"Results exported to {', '.join(paths)}"
+            if config.history_db:
+                message += "; " + record_history(config, consolidated_data, context.get('started_at'))
 
             return PipelineResult(
                 success=True,
                 stage=PipelineStage.EXPORT,
-                message=f"Results exported to {json_file} and {excel_file}"
+                message=message
             )
         except Exception as e:
             return PipelineResult(
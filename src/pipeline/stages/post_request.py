@@ -1,10 +1,10 @@
-
+import os
 import requests
-import pandas as pd
 from typing import Any, Dict
-import json
 from .base import BaseStage
+from ..delta import UploadIndex
 from ..models import PipelineResult, PipelineStage
+from ..uploader import BulkUploader
 
 
 class PostRequestStage(BaseStage):
@@ -14,7 +14,7 @@ class PostRequestStage(BaseStage):
         return "POST Request"
 
     def execute(self, context: Dict[str, Any]) -> PipelineResult:
-        """Send consolidated results via POST request"""
+        """Send consolidated results via POST request, chunk by chunk"""
         config = context.get('config')
 
         if not config.api_endpoint:
@@ -24,44 +24,69 @@ class PostRequestStage(BaseStage):
                 message="No API endpoint configured, skipping POST request"
             )
 
+        uploader = BulkUploader(config, self.logger, post=requests.post)
+        delta = None
         try:
             self.logger.info(f"Sending POST request to {config.api_endpoint}")
 
             consolidated_data = context.get('consolidated_data', [])
-            results = context.get('scraper_results', {})
-            print(len(consolidated_data), len(results))
-
-            payload = consolidated_data
-
-            response = requests.post(
-                config.api_endpoint,
-                json=payload,
-                headers=config.api_headers or {"Content-Type": "application/json"},
-                timeout=config.request_timeout
-            )
-
-            if response.status_code == 200:
-                return PipelineResult(
-                    success=True,
-                    stage=PipelineStage.POST_REQUEST,
-                    message=f"POST request successful: {response.status_code}"
-                )
+            replayed = uploader.replay_spool()
+            if config.delta_upload:
+                index = UploadIndex(os.path.join(config.output_dir, config.delta_index_filename)).load()
+                delta = index.diff(consolidated_data, context.get('report'))
+                self.logger.info(f"Delta upload: {delta.summary()}")
+                payload = delta.payload(config.delta_payload)
+                chunks = uploader.upload(payload) if payload else []
+                # Only delivered entries are indexed; the rest go again next run.
+                entries = uploader.chunks(delta.entries())
+                for chunk in chunks:
+                    if chunk.ok:
+                        index.acknowledge(entries[chunk.chunk])
+                index.save()
             else:
-                return PipelineResult(
-                    success=False,
-                    stage=PipelineStage.POST_REQUEST,
-                    error=f"POST request failed: {response.status_code} - {response.text}"
-                )
-
-        except requests.exceptions.RequestException as e:
+                payload = consolidated_data
+                chunks = uploader.upload(payload)
+        except Exception as e:
             return PipelineResult(
                 success=False,
                 stage=PipelineStage.POST_REQUEST,
-                error=f"Request error: {str(e)}"
+                error=f"Unexpected error: {str(e)}"
             )
-        except Exception as e:
+        finally:
+            uploader.close()
+
+        report = {
+            'chunks': [chunk.to_dict() for chunk in chunks],
+            'replayed': [chunk.to_dict() for chunk in replayed],
+        }
+        if delta is not None:
+            report['delta'] = {'inserts': len(delta.inserts), 'updates': len(delta.updates),
+                               'deletes': len(delta.deletes), 'unchanged': delta.unchanged}
+        failed = [chunk for chunk in chunks + replayed if not chunk.ok]
+        if failed:
+            error = failed[0].error
+            if len(chunks) + len(replayed) > 1:
+                error = f"{len(failed)} of {len(chunks) + len(replayed)} chunks failed: {error}"
             return PipelineResult(
                 success=False,
                 stage=PipelineStage.POST_REQUEST,
-                error=f"Unexpected error: {str(e)}"
+                data=report,
+                error=error
             )
+
+        if delta is not None and not chunks:
+            message = f"No product changes to POST ({delta.summary()})"
+        elif len(chunks) == 1 and not replayed:
+            message = f"POST request successful: {chunks[0].status_code}"
+        else:
+            message = f"POST request successful: {len(chunks)} chunks, {len(payload)} items"
+            if replayed:
+                message += f", {len(replayed)} spooled chunks replayed"
+        if delta is not None and chunks:
+            message += f" ({delta.summary()})"
+        return PipelineResult(
+            success=True,
+            stage=PipelineStage.POST_REQUEST,
+            data=report,
+            message=message
+        )
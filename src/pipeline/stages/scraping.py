@@ -1,9 +1,11 @@
 """
 Scraping stage for the pipeline
 """
-from typing import Any, Dict
+import os
+from typing import Any, Dict, Optional
 from .base import BaseStage
 from ..models import PipelineResult, PipelineStage
+from src.core.checkpoint import CheckpointStore
 from src.core.scraper_manager import ScraperManager
 from time import perf_counter
 
@@ -18,9 +20,15 @@ class ScrapingStage(BaseStage):
         try:
             self.logger.info("Starting scraping process...")
             config = context.get('config')
-            manager = ScraperManager(config.config_path)
+            checkpoint = self._open_checkpoint(config)
+            manager = ScraperManager(config.config_path, max_workers=config.max_workers, checkpoint=checkpoint,
+                                     executor=config.executor)
             start = perf_counter()
-            results = manager.run_all()
+            try:
+                results = manager.run_all()
+            finally:
+                if checkpoint is not None:
+                    checkpoint.close()
             end = perf_counter()
             report = manager.get_report()
 
@@ -41,3 +49,16 @@ class ScrapingStage(BaseStage):
                 stage=PipelineStage.SCRAPING,
                 error=str(e)
             )
+
+    def _open_checkpoint(self, config) -> Optional[CheckpointStore]:
+        """Loads the previous run's checkpoint when resuming; otherwise starts a fresh one."""
+        filename = config.checkpoint_filename
+        if not filename:
+            return None
+        checkpoint = CheckpointStore(os.path.join(config.output_dir, filename))
+        if config.resume:
+            checkpoint.load()
+            self.logger.info(f"Resuming from {checkpoint.path} ({len(checkpoint)} products done)")
+        else:
+            checkpoint.clear()
+        return checkpoint
@@ -0,0 +1,217 @@
+"""
+Streaming stage for the pipeline
+"""
+import json
+import os
+import queue
+import threading
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from .consolidation import consolidate
+from .export import JsonlRows, create_exporter, export_path, record_history
+from .scraping import ScrapingStage
+from ..delta import UploadIndex, compact_entry, product_key
+from ..models import PipelineConfig, PipelineResult, PipelineStage
+from ..uploader import BulkUploader
+from src.core.scraper_manager import ScraperManager
+
+_DONE = object()
+
+
+class StreamingStage(ScrapingStage):
+    """
+    Scraping, consolidation, export and POST in one overlapped stage, used when
+    ``PipelineConfig.streaming`` is set.
+
+    Scrapers hand every finished product to a bounded queue (a full queue makes
+    them wait) and keep no results of their own. A writer thread consolidates
+    each product, appends it to the JSONL file and POSTs it in batches of
+    ``post_batch_size`` (retried and spooled like ``PostRequestStage`` chunks,
+    over one pooled session, after replaying chunks spooled by earlier runs)
+    while scraping continues; with ``delta_upload`` only changed products are
+    posted, and tombstones follow once scraping ends. Then the other
+    ``export_formats`` are written from the JSONL file with ``json``, ``jsonl``
+    and ``excel_stream`` streaming their rows.
+
+    No product body is held for the whole run: the checkpoint keeps only the
+    URLs it recorded (bodies are loaded only with ``resume``), and
+    ``delta_upload`` keeps a hash per product. What still grows with the
+    catalog is that per-product bookkeeping, not the products themselves.
+    """
+
+    @property
+    def stage_name(self) -> str:
+        return "Streaming"
+
+    def execute(self, context: Dict[str, Any]) -> PipelineResult:
+        try:
+            self.logger.info("Starting streaming scrape...")
+            config = context.get('config')
+            writer = StreamWriter(config, self.logger)
+            checkpoint = self._open_checkpoint(config)
+            manager = ScraperManager(config.config_path, max_workers=config.max_workers,
+                                     checkpoint=checkpoint, sink=writer.put, retain_results=False,
+                                     executor=config.executor)
+
+            writer.start()
+            start = perf_counter()
+            report = None
+            try:
+                results = manager.run_all()
+                report = manager.get_report()
+            finally:
+                # Without a report (the run failed) nothing is tombstoned.
+                writer.finish(report)
+                if checkpoint is not None:
+                    checkpoint.close()
+            end = perf_counter()
+
+            context['manager'] = manager
+            context['scraper_results'] = results
+            context['report'] = report
+            context['scraping_time'] = end - start
+            context['items_processed'] = writer.count
+
+            if writer.write_error:
+                raise RuntimeError(f"Failed to write {writer.jsonl_path}: {writer.write_error}")
+            exported = writer.export()
+
+            if writer.post_errors:
+                return PipelineResult(
+                    success=False,
+                    stage=PipelineStage.POST_REQUEST,
+                    error=(f"{len(writer.post_errors)} of {writer.batches + writer.replayed} POST batches failed: "
+                           f"{writer.post_errors[0]}")
+                )
+
+            message = f"Streamed {writer.count} items to {', '.join([writer.jsonl_path] + exported)}"
+            if config.history_db:
+                message += "; " + record_history(config, writer.rows(), context.get('started_at'))
+            if config.api_endpoint:
+                message += f"; sent {writer.batches} POST batches"
+                if writer.replayed:
+                    message += f", {writer.replayed} spooled chunks replayed"
+            return PipelineResult(
+                success=True,
+                stage=PipelineStage.SCRAPING,
+                data=results,
+                message=message
+            )
+        except Exception as e:
+            return PipelineResult(
+                success=False,
+                stage=PipelineStage.SCRAPING,
+                error=str(e)
+            )
+
+
+class StreamWriter:
+    """Consumer side of the streaming stage; ``put`` is the scrapers' sink."""
+
+    def __init__(self, config: PipelineConfig, logger):
+        self.config = config
+        self.logger = logger
+        self.queue: "queue.Queue" = queue.Queue(maxsize=config.stream_queue_size)
+        self.jsonl_path = os.path.join(config.output_dir, config.jsonl_filename)
+        self.count = 0
+        self.batches = 0
+        self.replayed = 0
+        self.post_errors: List[str] = []
+        self.write_error: Optional[str] = None
+        self._batch: List[Dict[str, Any]] = []
+        self._uploader = BulkUploader(config, logger)
+        self._index = None
+        self._seen = set()
+        self._report = None
+        if config.api_endpoint and config.delta_upload:
+            self._index = UploadIndex(os.path.join(config.output_dir, config.delta_index_filename)).load()
+        self._file = None
+        self._thread = threading.Thread(target=self._consume, name="pipeline-writer", daemon=True)
+
+    def put(self, store: str, category: str, product: Dict[str, Any]) -> None:
+        self.queue.put((store, category, product))
+
+    def start(self) -> None:
+        self._file = open(self.jsonl_path, 'w', encoding='utf-8')
+        self._thread.start()
+
+    def finish(self, report: Optional[Dict[str, Any]] = None) -> None:
+        """Drains the queue; ``report`` (the scrapers' report) decides which products get tombstoned."""
+        self._report = report
+        self.queue.put(_DONE)
+        self._thread.join()
+
+    def _consume(self) -> None:
+        if self.config.api_endpoint:
+            # Older chunks go first so they cannot overwrite this run's products.
+            self._replay_spool()
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                break
+            try:
+                row = consolidate(*item)
+                self._file.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+                self.count += 1
+                if self.config.api_endpoint and self._should_post(row):
+                    self._batch.append(row)
+                    if len(self._batch) >= self.config.post_batch_size:
+                        self._post_batch()
+            except Exception as e:
+                # Keep draining: a stuck consumer would block every scraper on a full queue.
+                self.write_error = self.write_error or str(e)
+
+        if self._index is not None and self.write_error is None:
+            # A run cut short by a write error must not tombstone what it never reached.
+            self._batch.extend(self._index.tombstones(self._seen, self._report))
+        if self.config.api_endpoint and self._batch:
+            self._post_batch()
+        if self._index is not None:
+            self._index.save()
+        self._uploader.close()
+        self._file.close()
+
+    def _should_post(self, row: Dict[str, Any]) -> bool:
+        if self._index is None:
+            return True
+        self._seen.add(product_key(row))
+        return self._index.classify(row) is not None
+
+    def _replay_spool(self) -> None:
+        try:
+            results = self._uploader.replay_spool()
+        except Exception as e:
+            self.post_errors.append(f"Spool replay failed: {e}")
+            return
+        self.replayed = len(results)
+        self.post_errors.extend(result.error for result in results if not result.ok)
+
+    def _post_batch(self) -> None:
+        batch, self._batch = self._batch, []
+        payload = batch
+        if self._index is not None and self.config.delta_payload == 'compact':
+            payload = [compact_entry(entry) for entry in batch]
+        result = self._uploader.send(self.batches, payload)
+        self.batches += 1
+        if not result.ok:
+            self.post_errors.append(result.error)
+            return
+        if self._index is not None:
+            self._index.acknowledge(batch)
+        self.logger.info(f"POST batch {self.batches}: {len(batch)} items")
+
+    def export(self) -> List[str]:
+        """Writes the remaining ``export_formats`` from the JSONL file; returns their paths."""
+        paths = []
+        for export_format in self.config.export_formats:
+            path = export_path(self.config, export_format)
+            if os.path.abspath(path) == os.path.abspath(self.jsonl_path):
+                continue
+            # The pandas Excel writer would load every row; stream it instead.
+            create_exporter('excel_stream' if export_format == 'excel' else export_format).export(self.rows(), path)
+            paths.append(path)
+        return paths
+
+    def rows(self) -> JsonlRows:
+        return JsonlRows(self.jsonl_path)
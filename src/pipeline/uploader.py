@@ -0,0 +1,165 @@
+"""
+Bulk upload of consolidated products to the API endpoint
+"""
+import glob
+import gzip
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from .models import PipelineConfig
+from src.utils.http_client import PooledHTTPClient
+
+# Statuses worth retrying; any other non-200 answer fails the chunk at once.
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of one uploaded chunk, reported in the POST stage result."""
+    chunk: int
+    items: int
+    status_code: Optional[int] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    spooled: Optional[str] = None
+    replayed_from: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BulkUploader:
+    """
+    Sends products to ``config.api_endpoint`` in chunks of ``upload_chunk_size``
+    (all at once when unset), gzip-encoded when ``upload_gzip`` is set, up to
+    ``upload_concurrency`` chunks at a time. Each chunk is retried with
+    exponential backoff on connection errors and retryable statuses; chunks that
+    still fail are written to ``upload_spool_dir`` (under ``output_dir``) and
+    replayed by ``replay_spool`` on the next run.
+
+    A single chunk goes through ``post`` (``requests.post`` by default); several
+    share a pooled keep-alive session.
+    """
+
+    def __init__(self, config: PipelineConfig, logger,
+                 post: Optional[Callable[..., requests.Response]] = None):
+        self.config = config
+        self.logger = logger
+        self.post = post or requests.post
+        self.spool_dir = (os.path.join(config.output_dir, config.upload_spool_dir)
+                          if config.upload_spool_dir else None)
+        self._client: Optional[PooledHTTPClient] = None
+
+    def upload(self, rows: List[Dict[str, Any]]) -> List[ChunkResult]:
+        chunks = self.chunks(rows)
+        post = self.post if len(chunks) == 1 else self._pooled_post()
+        workers = max(1, min(self.config.upload_concurrency, len(chunks)))
+
+        if workers == 1:
+            return [self.send(index, chunk, post) for index, chunk in enumerate(chunks)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload") as pool:
+            return list(pool.map(lambda job: self.send(job[0], job[1], post), enumerate(chunks)))
+
+    def chunks(self, rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        size = self.config.upload_chunk_size
+        if not size or len(rows) <= size:
+            return [rows]
+        return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+    def send(self, index: int, chunk: List[Dict[str, Any]],
+             post: Optional[Callable[..., requests.Response]] = None) -> ChunkResult:
+        """Posts one chunk with retries; a chunk that still fails is spooled."""
+        post = post or self._pooled_post()
+        result = ChunkResult(chunk=index, items=len(chunk))
+        request = self._request_kwargs(chunk)
+
+        for attempt in range(self.config.upload_retries + 1):
+            result.attempts = attempt + 1
+            if attempt:
+                time.sleep(self.config.upload_backoff * (2 ** (attempt - 1)))
+            retryable = False
+            try:
+                response = post(self.config.api_endpoint, timeout=self.config.request_timeout, **request)
+                result.status_code = response.status_code
+                if response.status_code == 200:
+                    result.error = None
+                    return result
+                result.error = f"POST request failed: {response.status_code} - {response.text}"
+                retryable = response.status_code in RETRY_STATUSES
+            except requests.exceptions.RequestException as e:
+                result.error = f"Request error: {str(e)}"
+                retryable = True
+            except Exception as e:
+                result.error = f"Unexpected error: {str(e)}"
+            if not retryable:
+                break
+            self.logger.warning(f"Chunk {index} attempt {attempt + 1} failed: {result.error}")
+
+        result.spooled = self._spool(chunk)
+        return result
+
+    def replay_spool(self) -> List[ChunkResult]:
+        """Re-sends chunks spooled by earlier runs, deleting each one once delivered."""
+        if not self.spool_dir:
+            return []
+        results = []
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, 'chunk-*.json.gz'))):
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    chunk = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Unreadable spooled chunk {path}: {e}")
+                continue
+            os.remove(path)
+            result = self.send(len(results), chunk)
+            result.replayed_from = path
+            results.append(result)
+        if results:
+            self.logger.info(f"Replayed {len(results)} spooled chunks")
+        return results
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _request_kwargs(self, chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+        headers = dict(self.config.api_headers or {"Content-Type": "application/json"})
+        if not self.config.upload_gzip:
+            return {'json': chunk, 'headers': headers}
+        headers['Content-Encoding'] = 'gzip'
+        headers.setdefault('Content-Type', 'application/json')
+        body = gzip.compress(json.dumps(chunk, ensure_ascii=False, default=str).encode('utf-8'))
+        return {'data': body, 'headers': headers}
+
+    def _pooled_post(self) -> Callable[..., requests.Response]:
+        if self._client is None:
+            workers = max(1, self.config.upload_concurrency)
+            self._client = PooledHTTPClient(pool_connections=1, pool_maxsize=workers,
+                                            timeout=self.config.request_timeout)
+        return self._client.post
+
+    def _spool(self, chunk: List[Dict[str, Any]]) -> Optional[str]:
+        if not self.spool_dir:
+            return None
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            path = os.path.join(self.spool_dir, f"chunk-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.json.gz")
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump(chunk, f, ensure_ascii=False, default=str)
+            self.logger.warning(f"Spooled {len(chunk)} items to {path}")
+            return path
+        except OSError as e:
+            self.logger.error(f"Failed to spool chunk: {e}")
+            return None
@@ -7,6 +7,15 @@ from src.core.category import Category
 
 
 class CardUniverseScraper(BaseScraper):
+    PRICE_PATTERN = r'\b\d+(?:\.\d+)?\b'
+    # Tried in order; an image without a src falls through to the next one.
+    FIELD_RULES = {'image': (
+        "div[id^='ImageZoom-template'] img[src]:not([src=''])",
+        ".product-single__photo img[src]:not([src=''])",
+        ".product__photo img[src]:not([src=''])",
+        "img[src*='product']",
+    )}
+    MULTI_VALUE_FIELDS = ('language',)
 
     def navigate_to_category(self, category: Category) -> BeautifulSoup:
         self.logger.info(f"Navigating to {category.url}")
@@ -43,6 +52,7 @@ class CardUniverseScraper(BaseScraper):
                     if url.startswith('/'):
                         base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                         url = base_url + url
+                    self.remember_listing_element(element, url, category)
                     product_urls.append((title_name, url))
             except Exception as e:
                 self.logger.warning(f"Error extracting element data: {e}")
@@ -60,90 +70,42 @@ class CardUniverseScraper(BaseScraper):
             return {}
 
         data = {}
-
-        price_selector = category.selectors.get('price_selector')
-        if price_selector:
-            try:
-                if price_selector.startswith('//'):
-                    price_element = self.find_element(soup, price_selector, 'xpath')
+        plan = self.extraction_plan(category)
+        matches = plan.extract(soup)
+
+        if plan.has('price'):
+            price_element = matches.first('price')
+            if price_element:
+                price_text = self.get_text(price_element)
+                price = plan.match_price(price_text)
+                if price:
+                    data['price'] = price
                 else:
-                    price_element = self.find_element(soup, price_selector, 'css')
-
-                if price_element:
-                    price_text = self.get_text(price_element)
-                    pattern = r'\b\d+(?:\.\d+)?\b'
-                    match = re.search(pattern, price_text)
-                    if match:
-                        data['price'] = match.group()
-                    else:
-                        self.logger.warning(f"Price not found in text: {price_text}")
-                        data['price'] = price_text
-                else:
-                    self.logger.warning("Price element not found")
-                    data['price'] = ""
-            except Exception as e:
-                self.logger.warning(f"Error extracting price: {e}")
+                    self.logger.warning(f"Price not found in text: {price_text}")
+                    data['price'] = price_text
+            else:
+                self.logger.warning("Price element not found")
                 data['price'] = ""
 
-        language_selector = category.selectors.get('language_selector')
-        if language_selector:
-            try:
-                if language_selector.startswith('//'):
-                    language_elements = self.find_elements(soup, language_selector, 'xpath')
-                else:
-                    language_elements = self.find_elements(soup, language_selector, 'css')
-
-                languages = []
-                for option in language_elements:
-                    lang_text = self.get_text(option)
-                    if lang_text:
-                        languages.append(lang_text)
-                data['language'] = ', '.join(languages)
-            except Exception as e:
-                self.logger.warning(f"Error extracting languages: {e}")
-                data['language'] = ""
+        if plan.has('language'):
+            languages = []
+            for option in matches['language']:
+                lang_text = self.get_text(option)
+                if lang_text:
+                    languages.append(lang_text)
+            data['language'] = ', '.join(languages)
 
         data['stock'] = 'unknown'
 
-        description_selector = category.selectors.get('description_selector')
-        if description_selector:
-            try:
-                if description_selector.startswith('//'):
-                    description_element = self.find_element(soup, description_selector, 'xpath')
-                else:
-                    description_element = self.find_element(soup, description_selector, 'css')
+        if plan.has('description'):
+            description_element = matches.first('description')
+            data['description'] = self.get_text(description_element) if description_element else ""
 
-                if description_element:
-                    data['description'] = self.get_text(description_element)
-                else:
-                    data['description'] = ""
-            except Exception as e:
-                self.logger.warning(f"Error extracting description: {e}")
-                data['description'] = ""
-
-        try:
-            img_selectors = [
-                "div[id^='ImageZoom-template'] img",
-                ".product-single__photo img",
-                ".product__photo img",
-                "img[src*='product']"
-            ]
-
-            img_url = ""
-            for selector in img_selectors:
-                img_element = self.find_element(soup, selector, 'css')
-                if img_element:
-                    img_url = self.get_attribute(img_element, 'src')
-                    if img_url:
-                        break
-
-            if img_url and img_url.startswith('/'):
-                base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
-                img_url = base_url + img_url
-
-            data["img_url"] = img_url
-        except Exception as e:
-            self.logger.warning(f"Error extracting image: {e}")
-            data["img_url"] = ""
+        img_element = matches.first('image')
+        img_url = self.get_attribute(img_element, 'src') if img_element else ""
+        if img_url and img_url.startswith('/'):
+            base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
+            img_url = base_url + img_url
+        data["img_url"] = img_url
 
         return data
@@ -8,6 +8,7 @@ from src.core.category import Category
 
 
 class ElReinoScraper(BaseScraper):
+    FIELD_RULES = {'name': ("h1",)}
 
     def navigate_to_category(self, category: Category) -> BeautifulSoup:
         self.logger.info(f"Navigating to {category.url}")
@@ -30,6 +31,7 @@ class ElReinoScraper(BaseScraper):
                         if url.startswith('/'):
                             base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                             url = base_url + url
+                        self.remember_listing_element(container, url, category)
                         urls.append((name, url))
             except Exception as e:
                 self.logger.warning(f"Error extracting URL or name: {e}")
@@ -46,16 +48,10 @@ class ElReinoScraper(BaseScraper):
             return {}
 
         data = {}
+        matches = self.extraction_plan(category).extract(soup)
 
-        try:
-            title_element = soup.select_one("h1")
-            if title_element:
-                data["name"] = title_element.get_text(strip=True)
-            else:
-                data["name"] = "undefined"
-        except Exception as e:
-            self.logger.warning(f"No name found: {e}")
-            data["name"] = "undefined"
+        title_element = matches.first('name')
+        data["name"] = title_element.get_text(strip=True) if title_element else "undefined"
 
         try:
             alternative_price = self.extract_price(soup)
@@ -65,31 +61,17 @@ class ElReinoScraper(BaseScraper):
             self.logger.warning(f"Price not found: {e}")
             data["price"] = ""
 
-        image_selector = category.selectors.get("image_selector")
-        try:
-            if image_selector:
-                if image_selector.startswith('//'):
-                    image_el = self.find_element(soup, image_selector, 'xpath')
-                else:
-                    image_el = self.find_element(soup, image_selector, 'css')
-
-                if image_el:
-                    img_url = self.get_attribute(image_el, "src")
-                    if img_url and not img_url.startswith("data:image"):
-                        if img_url.startswith('/'):
-                            base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
-                            img_url = base_url + img_url
-                        data["img_url"] = img_url
-                    else:
-                        data["img_url"] = ""
-                        self.logger.warning("Fallback image or empty URL encountered")
-                else:
-                    data["img_url"] = ""
+        image_el = matches.first('image')
+        data["img_url"] = ""
+        if image_el:
+            img_url = self.get_attribute(image_el, "src")
+            if img_url and not img_url.startswith("data:image"):
+                if img_url.startswith('/'):
+                    base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
+                    img_url = base_url + img_url
+                data["img_url"] = img_url
             else:
-                data["img_url"] = ""
-        except Exception as e:
-            self.logger.warning(f"Image not found: {e}")
-            data["img_url"] = ""
+                self.logger.warning("Fallback image or empty URL encountered")
 
         return data
 
@@ -51,6 +51,7 @@ class GameOfMagicScraper(BaseScraper):
                         if url.startswith('/'):
                             base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                             url = base_url + url
+                        self.remember_listing_element(container, url, category)
                         urls.append((name, url))
                 else:
                     self.logger.warning("Product container doesn't contain a valid link")
@@ -70,63 +71,22 @@ class GameOfMagicScraper(BaseScraper):
 
         data = {}
 
-        title_xpath = category.selectors.get('title_selector')
-        try:
-            if title_xpath:
-                if title_xpath.startswith('//'):
-                    name_el = self.find_element(soup, title_xpath, 'xpath')
-                else:
-                    name_el = self.find_element(soup, title_xpath, 'css')
+        plan = self.extraction_plan(category)
+        matches = plan.extract(soup)
 
-                if name_el:
-                    data["name"] = self.get_text(name_el)
-                else:
-                    data["name"] = "undefined"
-            else:
-                data["name"] = "undefined"
-        except Exception as e:
-            self.logger.warning(f"No name found: {e}")
-            data["name"] = "undefined"
+        name_el = matches.first('name')
+        data["name"] = self.get_text(name_el) if name_el else "undefined"
 
-        price_xpath = category.selectors.get('price_selector')
-        try:
-            if price_xpath:
-                if price_xpath.startswith('//'):
-                    price_el = self.find_element(soup, price_xpath, 'xpath')
-                else:
-                    price_el = self.find_element(soup, price_xpath, 'css')
+        price_el = matches.first('price')
+        data["price"] = (self.get_text(price_el) or "") if price_el else ""
 
-                if price_el:
-                    price_text = self.get_text(price_el)
-                    data["price"] = price_text if price_text else ""
-                else:
-                    data["price"] = ""
-            else:
-                data["price"] = ""
-        except Exception as e:
-            self.logger.warning(f"No price found: {e}")
-            data["price"] = ""
-
-        image_xpath = category.selectors.get('image_selector')
-        try:
-            if image_xpath:
-                if image_xpath.startswith('//'):
-                    img_el = self.find_element(soup, image_xpath, 'xpath')
-                else:
-                    img_el = self.find_element(soup, image_xpath, 'css')
-
-                if img_el:
-                    img_url = self.get_attribute(img_el, "src")
-                    if img_url and img_url.startswith('/'):
-                        base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
-                        img_url = base_url + img_url
-                    data["img_url"] = img_url
-                else:
-                    data["img_url"] = ""
-            else:
-                data["img_url"] = ""
-        except Exception as e:
-            self.logger.warning(f"No image found: {e}")
-            data["img_url"] = ""
+        data["img_url"] = ""
+        img_el = matches.first('image')
+        if img_el:
+            img_url = self.get_attribute(img_el, "src")
+            if img_url and img_url.startswith('/'):
+                base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
+                img_url = base_url + img_url
+            data["img_url"] = img_url
 
         return data
@@ -7,6 +7,9 @@ from src.core.category import Category
 
 
 class GuildDreamsScraper(BaseScraper):
+    PRICE_PATTERN = r'\b\d+(?:[.,]\d{3})*(?:[.,]\d{2})?\b'
+    LANGUAGE_PATTERN = re.compile(r"Idioma:\s*([^\n\.]+)\.")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.url_to_image: Dict[str, str] = {}
@@ -63,15 +66,21 @@ class GuildDreamsScraper(BaseScraper):
                     self.url_to_image[url] = ""
 
                 if title and url:
+                    image = self.url_to_image.get(url, "")
                     if url.startswith('/'):
                         base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                         url = base_url + url
+                    self.remember_listing_element(element, url, category, image=image)
                     product_urls.append((title, url))
             except Exception as e:
                 self.logger.warning(f"Error extracting element data: {e}")
 
         return product_urls
 
+    def on_listing(self, item, category: Category) -> None:
+        super().on_listing(item, category)
+        self.url_to_image[item.url] = item.image
+
     def process_product(self, product_url: str, category: Category) -> Dict[str, Any]:
         self.logger.info(f"Processing product: {product_url}")
 
@@ -82,112 +91,55 @@ class GuildDreamsScraper(BaseScraper):
             return {}
 
         data = {}
+        plan = self.extraction_plan(category)
+        matches = plan.extract(soup)
 
-        title_selector = category.selectors.get('title_selector')
-        try:
-            if title_selector:
-                if title_selector.startswith('//'):
-                    title_element = self.find_element(soup, title_selector, 'xpath')
-                else:
-                    title_element = self.find_element(soup, title_selector, 'css')
-
-                if title_element:
-                    data['name'] = self.get_text(title_element)
-                else:
-                    self.logger.warning("Title element not found")
-                    data['name'] = "unknown"
+        if plan.has('name'):
+            title_element = matches.first('name')
+            if title_element:
+                data['name'] = self.get_text(title_element)
             else:
-                self.logger.warning("Title selector not defined")
+                self.logger.warning("Title element not found")
                 data['name'] = "unknown"
-        except Exception:
-            self.logger.warning("Name element not found")
+        else:
+            self.logger.warning("Title selector not defined")
             data['name'] = "unknown"
 
-        price_selector = category.selectors.get('price_selector')
-        try:
-            if price_selector:
-                if price_selector.startswith('//'):
-                    price_element = self.find_element(soup, price_selector, 'xpath')
-                else:
-                    price_element = self.find_element(soup, price_selector, 'css')
-
-                if price_element:
-                    price_text = self.get_text(price_element)
-                    pattern = r'\b\d+(?:[.,]\d{3})*(?:[.,]\d{2})?\b'
-                    match = re.search(pattern, price_text.replace('.', '').replace(',', '.'))
-                    data['price'] = match.group() if match else price_text
-                else:
-                    self.logger.warning("Price element not found")
-                    data['price'] = "unknown"
+        if plan.has('price'):
+            price_element = matches.first('price')
+            if price_element:
+                price_text = self.get_text(price_element)
+                data['price'] = plan.match_price(price_text.replace('.', '').replace(',', '.')) or price_text
             else:
-                self.logger.warning("Price selector not defined")
+                self.logger.warning("Price element not found")
                 data['price'] = "unknown"
-        except Exception:
-            self.logger.warning("Price element not found")
+        else:
+            self.logger.warning("Price selector not defined")
             data['price'] = "unknown"
 
-        stock_selector = category.selectors.get('stock_selector')
-        if stock_selector:
-            try:
-                if stock_selector.startswith('//'):
-                    stock_element = self.find_element(soup, stock_selector, 'xpath')
-                else:
-                    stock_element = self.find_element(soup, stock_selector, 'css')
-
-                if stock_element:
-                    data['stock'] = self.get_text(stock_element)
-            except Exception:
-                self.logger.warning("Stock element not found")
-
-        description_selector = category.selectors.get('description_selector')
-        if description_selector:
-            try:
-                if description_selector.startswith('//'):
-                    description_element = self.find_element(soup, description_selector, 'xpath')
-                else:
-                    description_element = self.find_element(soup, description_selector, 'css')
-
-                if description_element:
-                    data['description'] = self.get_text(description_element)
-            except Exception:
-                self.logger.warning("Description element not found")
-
-        language_selector = category.selectors.get('language_selector')
-        if language_selector and 'description' in data:
-            try:
-                pattern = r"Idioma:\s*([^\n\.]+)\."
-                match = re.search(pattern, data['description'])
-                data['language'] = match.group(1) if match else 'unknown'
-            except Exception:
-                self.logger.warning("Error extracting language")
-                data['language'] = "unknown"
-
-        image_xpath = category.selectors.get('image_selector')
-        try:
-            img_url = ""
-            if image_xpath:
-                if image_xpath.startswith('//'):
-                    img_el = self.find_element(soup, image_xpath, 'xpath')
-                else:
-                    img_el = self.find_element(soup, image_xpath, 'css')
-
-                if img_el:
-                    img_url = img_el.get('data-src') or img_el.get('src')
-                    if img_url and not img_url.startswith("data:image"):
-                        if img_url.startswith('/'):
-                            base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
-                            img_url = base_url + img_url
-                    else:
-                        self.logger.warning("Image fallback failed: placeholder found")
-                        img_url = self.url_to_image.get(product_url, "")
-                else:
-                    img_url = self.url_to_image.get(product_url, "")
+        stock_element = matches.first('stock')
+        if stock_element:
+            data['stock'] = self.get_text(stock_element)
+
+        description_element = matches.first('description')
+        if description_element:
+            data['description'] = self.get_text(description_element)
+
+        if plan.has('language') and 'description' in data:
+            match = self.LANGUAGE_PATTERN.search(data['description'])
+            data['language'] = match.group(1) if match else 'unknown'
+
+        img_url = self.url_to_image.get(product_url, "")
+        img_el = matches.first('image')
+        if img_el:
+            src = img_el.get('data-src') or img_el.get('src')
+            if src and not src.startswith("data:image"):
+                if src.startswith('/'):
+                    base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
+                    src = base_url + src
+                img_url = src
             else:
-                img_url = self.url_to_image.get(product_url, "")
-
-            data["img_url"] = img_url
-        except Exception as e:
-            self.logger.warning(f"Image element not found: {e}")
-            data["img_url"] = self.url_to_image.get(product_url, "")
+                self.logger.warning("Image fallback failed: placeholder found")
+        data["img_url"] = img_url
 
         return data
@@ -7,6 +7,9 @@ from src.core.category import Category
 
 
 class HunterCardTCG(BaseScraper):
+    PRICE_PATTERN = r'\d+(?:[.,]\d+)?'
+    LANGUAGE_PATTERN = re.compile(r"[–-]\s*([^\s\n]+)")
+    FIELD_RULES = {'name': ("h1.product_title",)}
 
     def navigate_to_category(self, category: Category) -> BeautifulSoup:
         self.logger.info(f"Navigating to {category.url}")
@@ -44,6 +47,7 @@ class HunterCardTCG(BaseScraper):
                     if url.startswith('/'):
                         base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                         url = base_url + url
+                    self.remember_listing_element(element, url, category)
                     product_urls.append((title, url))
             except Exception as e:
                 self.logger.warning(f"Error extracting element data: {e}")
@@ -60,105 +64,45 @@ class HunterCardTCG(BaseScraper):
             return {}
 
         data = {}
+        plan = self.extraction_plan(category)
+        matches = plan.extract(soup)
 
-        try:
-            name_element = soup.select_one("h1.product_title")
-            if name_element:
-                data["name"] = name_element.get_text(strip=True)
-            else:
-                self.logger.warning("Name element not found")
-                data["name"] = "unknown"
-        except Exception:
+        name_element = matches.first('name')
+        if name_element:
+            data["name"] = name_element.get_text(strip=True)
+        else:
             self.logger.warning("Name element not found")
             data["name"] = "unknown"
 
-        try:
-            price_selector = category.selectors.get('price_selector')
-            if price_selector:
-                if price_selector.startswith('//'):
-                    price_element = self.find_element(soup, price_selector, 'xpath')
-                else:
-                    price_element = self.find_element(soup, price_selector, 'css')
-
-                if price_element:
-                    price_text = self.get_text(price_element)
-                    pattern = r'\d+(?:[.,]\d+)?'
-                    match = re.search(pattern, price_text.replace('.', '').replace(',', '.'))
-                    data["price"] = match.group() if match else "unknown"
-                else:
-                    data["price"] = "unknown"
-            else:
-                data["price"] = "unknown"
-        except Exception:
-            self.logger.warning("Price element not found")
+        price_element = matches.first('price')
+        if price_element:
+            price_text = self.get_text(price_element)
+            data["price"] = plan.match_price(price_text.replace('.', '').replace(',', '.')) or "unknown"
+        else:
             data["price"] = "unknown"
 
-        try:
-            stock_selector = category.selectors.get("stock_selector")
-            if stock_selector:
-                if stock_selector.startswith('//'):
-                    stock_element = self.find_element(soup, stock_selector, 'xpath')
-                else:
-                    stock_element = self.find_element(soup, stock_selector, 'css')
-
-                if stock_element:
-                    data["stock"] = self.get_text(stock_element)
-        except Exception:
-            pass
+        stock_element = matches.first('stock')
+        if stock_element:
+            data["stock"] = self.get_text(stock_element)
 
-        try:
-            desc_selector = category.selectors.get("description_selector")
-            if desc_selector:
-                if desc_selector.startswith('//'):
-                    desc_element = self.find_element(soup, desc_selector, 'xpath')
-                else:
-                    desc_element = self.find_element(soup, desc_selector, 'css')
-
-                if desc_element:
-                    data["description"] = self.get_text(desc_element)
-        except Exception:
-            pass
+        desc_element = matches.first('description')
+        if desc_element:
+            data["description"] = self.get_text(desc_element)
 
-        try:
-            lang_selector = category.selectors.get("language_selector")
-            if lang_selector:
-                if lang_selector.startswith('//'):
-                    lang_element = self.find_element(soup, lang_selector, 'xpath')
-                else:
-                    lang_element = self.find_element(soup, lang_selector, 'css')
-
-                if lang_element:
-                    lang_text = self.get_text(lang_element)
-                    pattern = r"[–-]\s*([^\s\n]+)"
-                    matches = re.findall(pattern, lang_text)
-                    data['language'] = matches[-1] if matches else "unknown"
-                else:
-                    data["language"] = "unknown"
-            else:
-                data["language"] = "unknown"
-        except Exception:
+        lang_element = matches.first('language')
+        if lang_element:
+            found = self.LANGUAGE_PATTERN.findall(self.get_text(lang_element))
+            data['language'] = found[-1] if found else "unknown"
+        else:
             data["language"] = "unknown"
 
-        image_selector = category.selectors.get("image_selector")
-        try:
-            if image_selector:
-                if image_selector.startswith('//'):
-                    image_el = self.find_element(soup, image_selector, 'xpath')
-                else:
-                    image_el = self.find_element(soup, image_selector, 'css')
-
-                if image_el:
-                    img_url = self.get_attribute(image_el, "src")
-                    if img_url and img_url.startswith('/'):
-                        base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
-                        img_url = base_url + img_url
-                    data["img_url"] = img_url
-                else:
-                    data["img_url"] = ""
-            else:
-                data["img_url"] = ""
-        except Exception as e:
-            self.logger.warning(f"Image not found: {e}")
-            data["img_url"] = ""
+        data["img_url"] = ""
+        image_el = matches.first('image')
+        if image_el:
+            img_url = self.get_attribute(image_el, "src")
+            if img_url and img_url.startswith('/'):
+                base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
+                img_url = base_url + img_url
+            data["img_url"] = img_url
 
         return data
@@ -7,6 +7,8 @@ from src.core.category import Category
 
 class LaComarcaScraper(BaseScraper):
 
+    FIELD_RULES = {'name': ("h1.product-single__title",)}
+
     def navigate_to_category(self, category: Category) -> BeautifulSoup:
         self.logger.info(f"Navigating to {category.url}")
         wait_for = category.selectors.get('urls_selector')
@@ -40,6 +42,7 @@ class LaComarcaScraper(BaseScraper):
                     base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                     url = base_url + url
 
+                self.remember_listing_element(container, url, category)
                 urls.append((name, url))
             except Exception as e:
                 self.logger.warning(f"Error processing product container: {e}")
@@ -54,57 +57,25 @@ class LaComarcaScraper(BaseScraper):
             return {}
 
         data = {}
+        plan = self.extraction_plan(category)
+        matches = plan.extract(soup)
 
-        try:
-            name_el = soup.select_one("h1.product-single__title")
-            if name_el:
-                data["name"] = name_el.get_text(strip=True)
-            else:
-                data["name"] = "undefined"
-        except Exception as e:
-            self.logger.warning(f"No name found: {e}")
-            data["name"] = "undefined"
-
-        price_sel = category.selectors.get('price_selector')
-        if price_sel:
-            try:
-                if price_sel.startswith('//'):
-                    price_el = self.find_element(soup, price_sel, 'xpath')
-                else:
-                    price_el = self.find_element(soup, price_sel, 'css')
+        name_el = matches.first('name')
+        data["name"] = name_el.get_text(strip=True) if name_el else "undefined"
 
-                if price_el:
-                    price_text = self.get_text(price_el)
-                    data["price"] = price_text if price_text else ""
-                else:
-                    self.logger.warning(f"Empty price found at {product_url}")
-                    data["price"] = ""
-            except Exception as e:
-                self.logger.warning(f"No price found: {e}")
-                data["price"] = ""
-        else:
-            data["price"] = ""
-
-        image_selector = category.selectors.get('image_selector')
-        if image_selector:
-            try:
-                if image_selector.startswith('//'):
-                    image_el = self.find_element(soup, image_selector, 'xpath')
-                else:
-                    image_el = self.find_element(soup, image_selector, 'css')
-
-                if image_el:
-                    image_url = image_el.get("data-zoom", "")
-                    if image_url:
-                        data["img_url"] = "https:" + image_url
-                    else:
-                        data["img_url"] = ""
-                else:
-                    data["img_url"] = ""
-            except Exception as e:
-                self.logger.warning(f"Image not found: {e}")
-                data["img_url"] = ""
-        else:
-            data["img_url"] = ""
+        data["price"] = ""
+        if plan.has('price'):
+            price_el = matches.first('price')
+            if price_el:
+                data["price"] = self.get_text(price_el) or ""
+            else:
+                self.logger.warning(f"Empty price found at {product_url}")
+
+        data["img_url"] = ""
+        image_el = matches.first('image')
+        if image_el:
+            image_url = image_el.get("data-zoom", "")
+            if image_url:
+                data["img_url"] = "https:" + image_url
 
         return data
@@ -7,6 +7,9 @@ from src.core.category import Category
 
 
 class ThirdImpact(BaseScraper):
+    PRICE_PATTERN = r'\b\d+(?:\.\d+)?\b'
+    FIELD_RULES = {'image': ("picture img",)}
+    MULTI_VALUE_FIELDS = ('language',)
 
     def navigate_to_category(self, category: Category) -> BeautifulSoup:
         self.logger.info(f"Navigating to {category.url}")
@@ -38,6 +41,7 @@ class ThirdImpact(BaseScraper):
                     if url.startswith('/'):
                         base_url = category.url.split('/')[0] + '//' + category.url.split('/')[2]
                         url = base_url + url
+                    self.remember_listing_element(element, url, category)
                     product_urls.append((title, url))
             except Exception as e:
                 self.logger.warning(f"Error extracting element data: {e}")
@@ -55,76 +59,41 @@ class ThirdImpact(BaseScraper):
 
         data = {}
 
-        price_selector = category.selectors.get('price_selector')
-        if price_selector:
-            try:
-                if price_selector.startswith('//'):
-                    price_element = self.find_element(soup, price_selector, 'xpath')
-                else:
-                    price_element = self.find_element(soup, price_selector, 'css')
-
-                if price_element:
-                    price_text = self.get_text(price_element)
-                    pattern = r'\b\d+(?:\.\d+)?\b'
-                    match = re.search(pattern, price_text)
-                    data['price'] = match.group() if match else price_text
-                else:
-                    data['price'] = ""
-            except Exception:
-                data['price'] = ""
+        plan = self.extraction_plan(category)
+        matches = plan.extract(soup)
 
-        try:
-            img_element = soup.select_one("picture img")
-            if img_element:
-                img_url = img_element.get('data-src') or img_element.get('src')
-                if img_url and not img_url.startswith("data:image"):
-                    if img_url.startswith('/'):
-                        base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
-                        img_url = base_url + img_url
-                    data["img_url"] = img_url
-                else:
-                    self.logger.warning("Image fallback failed: placeholder found")
-                    data["img_url"] = ""
+        if plan.has('price'):
+            price_element = matches.first('price')
+            if price_element:
+                price_text = self.get_text(price_element)
+                data['price'] = plan.match_price(price_text) or price_text
             else:
-                data["img_url"] = ""
-        except Exception as e:
-            self.logger.warning(f"Image element not found: {e}")
-            data["img_url"] = ""
+                data['price'] = ""
 
-        description_selector = category.selectors.get('description_selector')
-        if description_selector:
-            try:
-                if description_selector.startswith('//'):
-                    description_element = self.find_element(soup, description_selector, 'xpath')
-                else:
-                    description_element = self.find_element(soup, description_selector, 'css')
-
-                if description_element:
-                    data['description'] = self.get_text(description_element)
-            except Exception:
-                pass
-
-        language_selector = category.selectors.get('language_selector')
-        if language_selector:
-            try:
-                if language_selector.startswith('//'):
-                    language_elements = self.find_elements(soup, language_selector, 'xpath')
-                else:
-                    language_elements = self.find_elements(soup, language_selector, 'css')
-
-                if language_elements:
-
-                    first_lang = self.get_text(language_elements[0])
-                    data['language'] = first_lang if first_lang else "unknown"
-                    if len(language_elements) > 1:
-                        data['stock'] = "Disponible"
-                    else:
-                        data['stock'] = "Agotado"
-                else:
-                    data['language'] = "Español"
-                    data['stock'] = "Disponible"
-            except Exception:
-                data['language'] = "unknown"
-                data['stock'] = "Agotado"
+        data["img_url"] = ""
+        img_element = matches.first('image')
+        if img_element:
+            img_url = img_element.get('data-src') or img_element.get('src')
+            if img_url and not img_url.startswith("data:image"):
+                if img_url.startswith('/'):
+                    base_url = product_url.split('/')[0] + '//' + product_url.split('/')[2]
+                    img_url = base_url + img_url
+                data["img_url"] = img_url
+            else:
+                self.logger.warning("Image fallback failed: placeholder found")
+
+        description_element = matches.first('description')
+        if description_element:
+            data['description'] = self.get_text(description_element)
+
+        if plan.has('language'):
+            language_elements = matches['language']
+            if language_elements:
+                first_lang = self.get_text(language_elements[0])
+                data['language'] = first_lang if first_lang else "unknown"
+                data['stock'] = "Disponible" if len(language_elements) > 1 else "Agotado"
+            else:
+                data['language'] = "Español"
+                data['stock'] = "Disponible"
 
         return data
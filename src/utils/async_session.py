@@ -0,0 +1,261 @@
+import asyncio
+import threading
+from playwright.async_api import async_playwright
+from src.utils.html_parser import DEFAULT_PARSER
+from src.utils.session_html import (
+    RequestsHTMLSession,
+    CONTEXT_OPTIONS,
+    STEALTH_SCRIPT,
+)
+
+POOL_BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-background-networking',
+    '--no-first-run',
+]
+
+JS_HEAP_SCRIPT = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class AsyncPlaywrightSession(RequestsHTMLSession):
+    """
+    Drop-in replacement for RequestsHTMLSession backed by playwright.async_api.
+
+    A single browser context keeps ``pool_size`` warm pages that are reused across
+    fetches. The event loop runs on a background thread, so ``get`` can be called
+    from any number of worker threads at once and every call is served by the
+    next free page. The browser is recycled after ``max_consecutive_errors``
+    failures in a row, and a page is replaced once its JS heap grows past
+    ``max_page_heap_mb``.
+
+    With a ``browser_pool`` the session launches nothing: it runs on the pool's
+    loop, takes its context from the pool and hands it back for a fresh one
+    every ``context_max_pages`` pages or after an error streak. Once a context
+    has served its pages no new fetch starts on it: pages in flight finish,
+    and the last one to come back hands the context in.
+    """
+
+    thread_safe = True
+
+    def __init__(self, debug=False, rate_limiter=None, http_client=None, cache=None, parser=DEFAULT_PARSER,
+                 pool_size=4, headless=True, max_consecutive_errors=5, max_page_heap_mb=256, page_timeout=30000,
+                 debug_capture=None, readiness=None, resource_policy=None, browser_pool=None):
+        super().__init__(debug=debug, rate_limiter=rate_limiter, http_client=http_client, cache=cache,
+                         parser=parser, debug_capture=debug_capture, readiness=readiness,
+                         resource_policy=resource_policy)
+        self.pool_size = max(1, pool_size)
+        self.headless = headless
+        self.max_consecutive_errors = max_consecutive_errors
+        self.max_page_heap_bytes = max_page_heap_mb * 1024 * 1024
+        self.page_timeout = page_timeout
+        self.browser_pool = browser_pool
+        self.stats = {'fetches': 0, 'errors': 0, 'page_recycles': 0, 'browser_recycles': 0,
+                      'context_recycles': 0}
+
+        self._consecutive_errors = 0
+        self._context_pages = 0
+        self._retired_pages = 0
+        self._pages = None
+        self._lifecycle_lock = None
+        self._closed = False
+        if browser_pool is not None:
+            self._loop = browser_pool.loop
+            self._thread = None
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever,
+                                            name="async-playwright", daemon=True)
+            self._thread.start()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _get_with_playwright(self, url, wait_for=None, wait_time=2):
+        content = self._run(self.fetch(url, wait_for=wait_for, wait_time=wait_time))
+        return self._accept_rendered(url, content)
+
+    async def fetch(self, url, wait_for=None, wait_time=2) -> str:
+        """Loads ``url`` on a pooled page and returns the rendered HTML."""
+        while True:
+            await self._ensure_started()
+            pages = self._pages
+            page = await pages.get()
+            if page is None or pages is not self._pages:
+                # Wake-up marker left by _shutdown: the pool was replaced, retry on the new one.
+                pages.put_nowait(None)
+                continue
+            if not self._context_expired():
+                break
+            # Idle page of a context that has served its pages: wait for the next one.
+            self._retired_pages += 1
+            await self._recycle_context()
+
+        healthy = True
+        self._begin_page(page)
+        try:
+            self._log(f"Navegando a: {url}")
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=self.page_timeout)
+            if response and response.status >= 400:
+                raise Exception(f"HTTP {response.status}")
+
+            waited = await self.readiness.wait_async(page, url, wait_for, max_wait=wait_time)
+            self._log(f"Página lista en {waited:.2f}s")
+
+            content = await page.content()
+            healthy = await self._page_is_healthy(page)
+            self._consecutive_errors = 0
+            self._context_pages += 1
+            self.stats['fetches'] += 1
+            return content
+        except Exception:
+            healthy = False
+            self._consecutive_errors += 1
+            self.stats['errors'] += 1
+            raise
+        finally:
+            self._end_page(page)
+            await self._release_page(page, healthy, pages)
+            if self._consecutive_errors >= self.max_consecutive_errors:
+                await self._recycle_browser()
+            elif self._context_expired():
+                await self._recycle_context()
+
+    async def _page_is_healthy(self, page) -> bool:
+        try:
+            heap = await page.evaluate(JS_HEAP_SCRIPT)
+        except Exception:
+            return False
+        return heap < self.max_page_heap_bytes
+
+    async def _release_page(self, page, healthy: bool, pages: asyncio.Queue) -> None:
+        if pages is not self._pages:
+            # The browser was recycled while this page was in flight.
+            return
+        if self._context_expired():
+            # Kept out of the pool; the context is recycled once every page is back.
+            self._retired_pages += 1
+            return
+
+        if not healthy:
+            self.stats['page_recycles'] += 1
+            try:
+                await page.close()
+            except Exception:
+                pass
+            try:
+                page = await self.context.new_page()
+                self._watch_resources(page)
+            except Exception as e:
+                self._log(f"No se pudo reemplazar la página: {e}")
+                self._consecutive_errors = max(self._consecutive_errors, self.max_consecutive_errors)
+                page = None
+
+        if page is not None:
+            page.set_default_timeout(20000)
+            page.set_default_navigation_timeout(self.page_timeout)
+            pages.put_nowait(page)
+
+    async def _ensure_started(self) -> None:
+        if self._lifecycle_lock is None:
+            self._lifecycle_lock = asyncio.Lock()
+        async with self._lifecycle_lock:
+            if self._pages is None:
+                await self._start()
+
+    async def _start(self) -> None:
+        if self.browser_pool is not None:
+            self.context = await self.browser_pool.new_context(**CONTEXT_OPTIONS)
+        else:
+            self._log("Inicializando Playwright async...")
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=self.headless, args=POOL_BROWSER_ARGS)
+            self.context = await self.browser.new_context(**CONTEXT_OPTIONS)
+
+        await self.context.route('**/*', self.resource_policy.async_route_handler(self._resources_for))
+        await self.context.add_init_script(STEALTH_SCRIPT)
+
+        self._pages = asyncio.Queue()
+        for _ in range(self.pool_size):
+            page = await self.context.new_page()
+            self._watch_resources(page)
+            page.set_default_timeout(20000)
+            page.set_default_navigation_timeout(self.page_timeout)
+            self._pages.put_nowait(page)
+
+        self._consecutive_errors = 0
+        self._context_pages = 0
+        self._retired_pages = 0
+        self._log(f"Playwright async inicializado con {self.pool_size} páginas")
+
+    async def _recycle_browser(self) -> None:
+        async with self._lifecycle_lock:
+            if self._consecutive_errors < self.max_consecutive_errors:
+                return
+            if self.browser_pool is not None:
+                self._log("Reciclando contexto por errores consecutivos")
+                self.stats['context_recycles'] += 1
+            else:
+                self._log("Reciclando browser por errores consecutivos")
+                self.stats['browser_recycles'] += 1
+            await self._shutdown()
+
+    def _context_expired(self) -> bool:
+        return self.browser_pool is not None and self._context_pages >= self.browser_pool.context_max_pages
+
+    async def _recycle_context(self) -> None:
+        async with self._lifecycle_lock:
+            # Pages still in flight finish first; the last one to come back recycles.
+            if not self._context_expired() or self._pages is None or self._retired_pages < self.pool_size:
+                return
+            self.stats['context_recycles'] += 1
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        pages, context, browser, playwright = self._pages, self.context, self.browser, self.playwright
+        self._pages = None
+        self.context = None
+        self.browser = None
+        self.playwright = None
+        self._consecutive_errors = 0
+        if pages is not None:
+            pages.put_nowait(None)
+        if self.browser_pool is not None:
+            if context is not None:
+                await self.browser_pool.release(context)
+            return
+        for resource in (context, browser):
+            if resource is not None:
+                try:
+                    await resource.close()
+                except Exception as e:
+                    self._log(f"Error en limpieza: {e}")
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                self._log(f"Error en limpieza: {e}")
+
+    def _cleanup_playwright(self):
+        # The sync retry loop calls this after browser errors; with a shared pool
+        # the error counter decides when to recycle, so nothing is torn down here.
+        pass
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self._shutdown())
+        finally:
+            # A pool's loop outlives its sessions.
+            if self._thread is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop.close()
+            if self._owns_http_client:
+                self.http_client.close()
@@ -0,0 +1,241 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from playwright.async_api import async_playwright
+from src.core.logger_factory import LoggerFactory
+from src.utils.async_session import POOL_BROWSER_ARGS
+
+
+def process_tree_rss(marker: str, proc: str = '/proc') -> int:
+    """
+    Resident bytes of the processes whose command line carries ``marker`` plus
+    all their descendants (renderers, GPU and utility processes), read from /proc.
+    Returns 0 when /proc is not available.
+    """
+    parents: Dict[int, int] = {}
+    roots = set()
+    # Arguments are NUL-terminated, so "-1" does not match "-10".
+    needle = marker.encode() + b'\0'
+    try:
+        entries = os.listdir(proc)
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(os.path.join(proc, entry, 'stat'), 'rb') as f:
+                stat = f.read()
+            with open(os.path.join(proc, entry, 'cmdline'), 'rb') as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        # The command name may hold spaces and parentheses; ppid is the second
+        # field after the last ')'.
+        parents[int(entry)] = int(stat[stat.rindex(b')') + 2:].split()[1])
+        if needle in cmdline:
+            roots.add(int(entry))
+
+    tree = set(roots)
+    grown = True
+    while grown:
+        children = {pid for pid, ppid in parents.items() if ppid in tree and pid not in tree}
+        tree |= children
+        grown = bool(children)
+    return sum(_rss(proc, pid) for pid in tree)
+
+
+def _rss(proc: str, pid: int) -> int:
+    try:
+        with open(os.path.join(proc, str(pid), 'status'), encoding='ascii', errors='replace') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+class _Slot:
+    """One browser of the pool and the contexts it currently hosts."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        self.marker = ''
+        self.generation = 0
+        self.contexts: Set[Any] = set()
+        self.draining = False
+        self.rss = 0
+
+
+class BrowserPool:
+    """
+    Chromium instances shared by every scraper of the process.
+
+    Up to ``browsers`` browsers are launched on first use and kept for the whole
+    run. Each session gets its own ``BrowserContext`` (cookies, cache, routes)
+    from the least busy browser, so stores stay isolated without a browser
+    each, and hands it back every ``context_max_pages`` pages for a fresh one
+    instead of relaunching the browser.
+
+    Every ``rss_check_interval`` seconds the resident memory of each browser's
+    process tree is read from /proc; a browser past ``max_rss_mb`` takes no new
+    contexts and is restarted once its last context has been released.
+
+    The pool owns an asyncio loop on a background thread: sessions run their
+    coroutines on ``loop`` and call ``new_context``/``release`` from there.
+    ``close`` only closes the browsers; ``shutdown`` also stops the loop and
+    its thread once the pool is no longer needed.
+    """
+
+    def __init__(self, browsers: int = 2, headless: bool = True, context_max_pages: int = 100,
+                 max_rss_mb: int = 1536, rss_check_interval: float = 30.0,
+                 rss_reader: Callable[[str], int] = process_tree_rss):
+        self.headless = headless
+        self.context_max_pages = max(1, context_max_pages)
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.rss_check_interval = rss_check_interval
+        self.rss_reader = rss_reader
+        self.logger = LoggerFactory.create_logger("browser_pool")
+        self.stats = {'launches': 0, 'restarts': 0, 'contexts_opened': 0, 'contexts_released': 0}
+
+        self._slots = [_Slot(index) for index in range(max(1, browsers))]
+        self._slot_of: Dict[Any, _Slot] = {}
+        self._playwright = None
+        self._lock = asyncio.Lock()
+        self._last_rss_check = 0.0
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="browser-pool", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, config) -> Optional['BrowserPool']:
+        """
+        Builds the pool from the ``browser_pool`` config block, e.g.
+        {"browsers": 2, "context_max_pages": 100, "max_rss_mb": 1536};
+        ``true`` uses the defaults and a missing or false block disables it.
+        """
+        if not config:
+            return None
+        config = config if isinstance(config, dict) else {}
+        return cls(
+            browsers=config.get('browsers', 2),
+            headless=config.get('headless', True),
+            context_max_pages=config.get('context_max_pages', 100),
+            max_rss_mb=config.get('max_rss_mb', 1536),
+            rss_check_interval=config.get('rss_check_interval', 30.0),
+        )
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def new_context(self, **options):
+        """Opens a context on the least busy browser, launching it if needed."""
+        async with self._lock:
+            await self._check_rss()
+            slot = min(self._slots, key=lambda s: (s.draining, len(s.contexts), s.browser is None))
+            if slot.browser is None:
+                await self._launch(slot)
+            context = await slot.browser.new_context(**options)
+            slot.contexts.add(context)
+            self._slot_of[context] = slot
+            self.stats['contexts_opened'] += 1
+            return context
+
+    async def release(self, context) -> None:
+        """Closes a context from ``new_context``; restarts its browser if it was draining."""
+        async with self._lock:
+            slot = self._slot_of.pop(context, None)
+            try:
+                await context.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing context: {e}")
+            if slot is None:
+                return
+            slot.contexts.discard(context)
+            self.stats['contexts_released'] += 1
+            await self._check_rss()
+
+    async def _launch(self, slot: _Slot) -> None:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        slot.generation += 1
+        # Chromium ignores unknown switches; this one finds the process in /proc.
+        slot.marker = f"--browser-pool={os.getpid()}-{slot.index}-{slot.generation}"
+        start = time.perf_counter()
+        slot.browser = await self._playwright.chromium.launch(headless=self.headless,
+                                                              args=POOL_BROWSER_ARGS + [slot.marker])
+        self.stats['launches'] += 1
+        self.logger.info(f"Browser {slot.index} launched in {time.perf_counter() - start:.2f}s")
+
+    async def _check_rss(self) -> None:
+        now = time.monotonic()
+        if now - self._last_rss_check >= self.rss_check_interval:
+            self._last_rss_check = now
+            for slot in self._slots:
+                if slot.browser is None or slot.draining:
+                    continue
+                slot.rss = self.rss_reader(slot.marker)
+                if slot.rss > self.max_rss_bytes:
+                    slot.draining = True
+                    self.logger.info(f"Browser {slot.index} at {slot.rss / 1024 / 1024:.0f} MB RSS, "
+                                     f"restarting once its {len(slot.contexts)} contexts are released")
+        for slot in self._slots:
+            if slot.draining and not slot.contexts:
+                await self._restart(slot)
+
+    async def _restart(self, slot: _Slot) -> None:
+        await self._close_browser(slot)
+        slot.draining = False
+        slot.rss = 0
+        self.stats['restarts'] += 1
+
+    async def _close_browser(self, slot: _Slot) -> None:
+        browser, slot.browser = slot.browser, None
+        for context in list(slot.contexts):
+            self._slot_of.pop(context, None)
+        slot.contexts.clear()
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing browser {slot.index}: {e}")
+
+    async def _shutdown(self) -> None:
+        async with self._lock:
+            for slot in self._slots:
+                await self._close_browser(slot)
+                slot.draining = False
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    self.logger.debug(f"Error stopping Playwright: {e}")
+                self._playwright = None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'browsers': sum(1 for slot in self._slots if slot.browser is not None),
+            'open_contexts': len(self._slot_of),
+            'rss_mb': {slot.index: round(slot.rss / 1024 / 1024, 1) for slot in self._slots if slot.rss},
+        }
+
+    def close(self) -> None:
+        """Closes every browser; the pool relaunches them if it is used again."""
+        self.run(self._shutdown())
+
+    def shutdown(self) -> None:
+        """Closes every browser and stops the pool's loop; the pool cannot be used afterwards."""
+        if self.loop.is_closed():
+            return
+        try:
+            self.close()
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            self.loop.close()
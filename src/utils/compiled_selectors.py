@@ -0,0 +1,235 @@
+import re
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import soupsieve
+from bs4 import Tag
+from lxml import etree
+
+from src.utils.css_contain_adapter import EnhancedSelector
+from src.utils.html_parser import HTMLNode, LxmlNode
+
+XPATH = 'xpath'
+CSS = 'css'
+
+# Same pattern CSSContainsHandler uses for "base:contains('text')".
+CONTAINS_PATTERN = re.compile(r'([^:]+):contains\([\'"]([^\'"]+)[\'"]\)')
+SUBJECT_TAG = re.compile(r'^([A-Za-z][\w-]*)')
+SUBJECT_CLASS = re.compile(r'\.([A-Za-z_-][\w-]*)')
+
+
+def is_xpath(selector: str) -> bool:
+    return selector.lstrip().startswith(('/', '(', './'))
+
+
+@lru_cache(maxsize=1024)
+def subject_keys(selector: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Tag name and first class of the subject (rightmost) compound of a CSS
+    selector, read from its text, with attribute and pseudo-class arguments
+    left out. Either is None when the compound has none; both are None for a
+    selector list, escapes or namespaces, which are not worth narrowing.
+    """
+    compound, depth, quote = [], 0, None
+    for char in selector.strip():
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif depth == 0 and char in ',\\|':
+            return None, None
+        elif depth == 0 and (char.isspace() or char in '>+~'):
+            compound = []
+        elif depth == 0:
+            compound.append(char)
+    flat = ''.join(compound)
+    tag = SUBJECT_TAG.match(flat)
+    class_name = SUBJECT_CLASS.search(flat)
+    return (tag.group(1).lower() if tag else None), (class_name.group(1) if class_name else None)
+
+
+class CompiledSelector:
+    """
+    A CSS or XPath selector compiled once and reused for every page.
+
+    XPath selectors become ``etree.XPath`` objects and run on an lxml tree, so
+    unions, ``contains(., ...)`` and arbitrary attributes keep their meaning.
+    BeautifulSoup documents are re-parsed into lxml once per document for that.
+    CSS selectors are compiled with soupsieve; ``:contains()`` parts become a
+    compiled base selector plus the case-insensitive text test CSSContainsHandler
+    applies. ``:first-child`` keeps the EnhancedSelector meaning (first sibling of
+    its type), i.e. ``:first-of-type``.
+    An invalid selector compiles to one that never matches.
+    """
+
+    def __init__(self, selector: str, kind: Optional[str] = None):
+        self.selector = selector
+        self.kind = kind or (XPATH if is_xpath(selector) else CSS)
+        self.error: Optional[str] = None
+        self._xpath = None
+        self._css_parts = []
+
+        try:
+            if self.kind == XPATH:
+                self._xpath = etree.XPath(selector)
+            else:
+                for part in selector.split(','):
+                    self._css_parts.append(self._compile_css_part(part.strip()))
+        except (etree.XPathSyntaxError, soupsieve.SelectorSyntaxError, ValueError) as e:
+            self.error = str(e)
+
+    @staticmethod
+    def _compile_css_part(part: str):
+        """Returns (compiled base selector or None for any element, lowercase text or None)."""
+        if ':contains(' not in part:
+            return soupsieve.compile(part.replace(':first-child', ':first-of-type')), None
+        match = CONTAINS_PATTERN.search(part)
+        if not match:
+            return soupsieve.compile(part.replace(':contains(', '').replace(')', '')), None
+        base = match.group(1).strip()
+        return (soupsieve.compile(base) if base else None), match.group(2).lower()
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    @property
+    def indexable(self) -> bool:
+        """True when the selector can run against a DocumentIndex (valid CSS)."""
+        return self.valid and self.kind == CSS
+
+    def select_indexed(self, index: 'DocumentIndex', first_only: bool = False) -> List[Tag]:
+        """
+        Same result as ``select(index.document)`` (or its first element), matching
+        only the indexed candidates that can satisfy each part.
+        """
+        elements = []
+        for compiled, contains in self._css_parts:
+            for element in index.candidates(compiled):
+                if compiled is not None and not compiled.match(element):
+                    continue
+                if contains is not None and contains not in element.get_text().lower():
+                    continue
+                elements.append(element)
+                if first_only:
+                    return elements
+        return elements
+
+    def select(self, document) -> List[Any]:
+        if not self.valid or document is None:
+            return []
+        if self.kind == XPATH:
+            return self._select_xpath(document)
+        if not isinstance(document, Tag):
+            return EnhancedSelector.select(document, self.selector)
+
+        elements = []
+        for compiled, contains in self._css_parts:
+            candidates = compiled.select(document) if compiled is not None else document.find_all()
+            if contains is None:
+                elements.extend(candidates)
+            else:
+                elements.extend(element for element in candidates if contains in element.get_text().lower())
+        return elements
+
+    def select_one(self, document) -> Optional[Any]:
+        elements = self.select(document)
+        return elements[0] if elements else None
+
+    def _select_xpath(self, document) -> List[LxmlNode]:
+        node = as_lxml(document)
+        try:
+            results = self._xpath(node.element)
+        except etree.XPathEvalError:
+            return []
+        if not isinstance(results, list):
+            return []
+        return [LxmlNode(result) for result in results if isinstance(result, etree._Element)]
+
+    def __repr__(self) -> str:
+        return f"CompiledSelector({self.selector!r}, {self.kind!r})"
+
+
+def compile_selector(selector: str, kind: Optional[str] = None) -> CompiledSelector:
+    """Returns the shared compiled form of ``selector``; ``kind`` is detected when omitted."""
+    return _compile(selector, kind or (XPATH if is_xpath(selector) else CSS))
+
+
+@lru_cache(maxsize=1024)
+def _compile(selector: str, kind: str) -> CompiledSelector:
+    return CompiledSelector(selector, kind)
+
+
+class _LxmlTreeCache:
+    """lxml trees built for non-lxml documents, dropped with the document."""
+
+    def __init__(self):
+        self._trees: Dict[int, LxmlNode] = {}
+        self._lock = threading.Lock()
+
+    def get(self, document) -> LxmlNode:
+        key = id(document)
+        with self._lock:
+            node = self._trees.get(key)
+        if node is not None:
+            return node
+
+        node = LxmlNode.from_html(str(document))
+        with self._lock:
+            self._trees[key] = node
+        weakref.finalize(document, self._discard, key)
+        return node
+
+    def _discard(self, key: int) -> None:
+        with self._lock:
+            self._trees.pop(key, None)
+
+
+_lxml_trees = _LxmlTreeCache()
+
+
+class DocumentIndex:
+    """
+    One traversal of a BeautifulSoup document, indexing its elements by tag name
+    and class. Compiled CSS parts are then only tested (``SoupSieve.match``)
+    against the elements that can match their subject (rightmost) compound,
+    found from the selector text (``subject_keys``).
+    """
+
+    def __init__(self, document: Tag):
+        self.document = document
+        self.elements: List[Tag] = []
+        self.by_name: Dict[str, List[Tag]] = {}
+        self.by_class: Dict[str, List[Tag]] = {}
+
+        for element in document.descendants:
+            if not isinstance(element, Tag):
+                continue
+            self.elements.append(element)
+            self.by_name.setdefault(element.name, []).append(element)
+            for class_name in element.get('class') or ():
+                self.by_class.setdefault(class_name, []).append(element)
+
+    def candidates(self, compiled) -> List[Tag]:
+        if compiled is None:
+            return self.elements
+        tag, class_name = subject_keys(compiled.pattern)
+        if class_name:
+            return self.by_class.get(class_name, [])
+        if tag:
+            return self.by_name.get(tag, [])
+        return self.elements
+
+
+def as_lxml(document) -> LxmlNode:
+    if isinstance(document, LxmlNode):
+        return document
+    if isinstance(document, (Tag, HTMLNode)):
+        return _lxml_trees.get(document)
+    raise TypeError(f"Cannot evaluate XPath on {type(document).__name__}")
@@ -1,6 +1,7 @@
 import re
 from typing import List, Optional, Union
 from bs4 import BeautifulSoup, Tag, NavigableString
+from src.utils.html_parser import HTMLNode
 
 
 class CSSContainsHandler:
@@ -42,7 +43,7 @@ class CSSContainsHandler:
 
     @staticmethod
     def _element_contains_text(element: Tag, text: str, case_sensitive: bool = False) -> bool:
-        if not isinstance(element, Tag):
+        if not isinstance(element, (Tag, HTMLNode)):
             return False
 
         element_text = element.get_text()
@@ -99,7 +100,7 @@ class StockChecker:
 
     @staticmethod
     def _check_element_for_stock_out(element: Tag) -> bool:
-        if not isinstance(element, Tag):
+        if not isinstance(element, (Tag, HTMLNode)):
             return False
 
         text = element.get_text().lower()
@@ -179,7 +180,8 @@ class EnhancedSelector:
         for element in elements:
             parent = element.parent
             if parent:
-                siblings = [child for child in parent.children if isinstance(child, Tag) and child.name == element.name]
+                siblings = [child for child in parent.children
+                            if isinstance(child, (Tag, HTMLNode)) and child.name == element.name]
                 if siblings and siblings[0] == element:
                     first_children.append(element)
 
@@ -0,0 +1,122 @@
+import datetime
+import json
+import os
+import queue
+import random
+import re
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+CAPTURE_PATTERN = re.compile(r'^(\d+)-[\w-]+\.html$')
+
+_STOP = object()
+
+
+class DebugCapture:
+    """
+    Keeps the raw HTML of recent pages of one store for debugging, off the fetch path.
+
+    Failed pages (``reason`` other than ``sample``) are always kept and successful
+    ones with probability ``sample_rate``. ``capture`` only queues the content; a
+    background thread writes it as ``<seq>-<reason>.html`` plus a small JSON
+    sidecar (url, reason, time, size) under ``directory``. Only the last ``keep``
+    captures are kept, older ones are deleted as new ones land. When the queue
+    is full the capture is dropped rather than stalling the fetch.
+    """
+
+    def __init__(self, directory: str, keep: int = 20, sample_rate: float = 0.0, queue_size: int = 64):
+        self.directory = directory
+        self.keep = max(1, keep)
+        self.sample_rate = sample_rate
+        self.stats = {'captured': 0, 'written': 0, 'dropped': 0, 'evicted': 0}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._ring: Optional[Deque[str]] = None
+        self._seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def capture(self, url: str, content, reason: str = 'sample') -> bool:
+        """Queues ``content`` (str or bytes) for writing; returns False when it was not kept."""
+        if reason == 'sample' and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return False
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((url, content, reason, datetime.datetime.now()))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            return False
+        self.stats['captured'] += 1
+        return True
+
+    def flush(self) -> None:
+        """Blocks until every queued capture is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def files(self):
+        """Paths of the kept captures, oldest first."""
+        self.flush()
+        return list(self._ring or [])
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="debug-capture", daemon=True)
+                self._thread.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(*item)
+            except OSError:
+                # Debug output must never break scraping.
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _write(self, url: str, content, reason: str, captured_at: datetime.datetime) -> None:
+        if self._ring is None:
+            self._load_ring()
+        body = content.encode('utf-8') if isinstance(content, str) else content
+        self._seq += 1
+        slug = re.sub(r'[^\w-]', '_', reason)
+        path = os.path.join(self.directory, f"{self._seq:06d}-{slug}.html")
+        with open(path, 'wb') as f:
+            f.write(body)
+        with open(path[:-len('.html')] + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'reason': reason, 'captured_at': captured_at.isoformat(),
+                       'size': len(body)}, f, ensure_ascii=False)
+        self.stats['written'] += 1
+        self._ring.append(path)
+        while len(self._ring) > self.keep:
+            self._remove(self._ring.popleft())
+            self.stats['evicted'] += 1
+
+    def _load_ring(self) -> None:
+        """Picks up captures left by earlier runs so the limit holds across runs."""
+        os.makedirs(self.directory, exist_ok=True)
+        existing = sorted((int(match.group(1)), name) for name in os.listdir(self.directory)
+                          if (match := CAPTURE_PATTERN.match(name)))
+        self._ring = deque(os.path.join(self.directory, name) for _, name in existing)
+        self._seq = existing[-1][0] if existing else 0
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        for stale in (path, path[:-len('.html')] + '.json'):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
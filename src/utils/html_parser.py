@@ -0,0 +1,305 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup, FeatureNotFound
+from bs4.dammit import UnicodeDammit
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is listed in requirements.txt
+    lxml = None
+    etree = None
+
+try:
+    from cssselect import HTMLTranslator
+except ImportError:  # pragma: no cover
+    HTMLTranslator = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml.html', 'selectolax')
+DEFAULT_PARSER = 'lxml'
+
+# Attributes bs4 treats as whitespace-separated token lists.
+MULTI_VALUED_ATTRIBUTES = ('class', 'rel')
+
+
+def parse_html(content: Union[str, bytes], parser: str = DEFAULT_PARSER):
+    """
+    Parses ``content`` with the selected backend.
+
+    ``html.parser`` and ``lxml`` return a BeautifulSoup document. ``lxml.html`` and
+    ``selectolax`` skip bs4 entirely and return an HTMLNode, which implements the
+    subset of the Tag API the scrapers use (select, find, get, get_text, ...).
+    """
+    if parser in ('html.parser', 'lxml'):
+        try:
+            return BeautifulSoup(content, parser)
+        except FeatureNotFound:
+            return BeautifulSoup(content, 'html.parser')
+    if parser == 'lxml.html':
+        return LxmlNode.from_html(content)
+    if parser == 'selectolax':
+        return SelectolaxNode.from_html(content)
+    raise ValueError(f"Unknown parser backend '{parser}', expected one of {PARSER_BACKENDS}")
+
+
+def decode_html(content: Union[str, bytes]) -> str:
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(content, is_html=True).unicode_markup or ''
+
+
+@lru_cache(maxsize=512)
+def compile_css(selector: str):
+    """Translates a CSS selector to a compiled XPath expression, cached per selector."""
+    if HTMLTranslator is None:
+        raise ImportError("The lxml.html parser backend requires the cssselect package")
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector))
+
+
+class HTMLNode(ABC):
+    """
+    Backend-neutral element with a BeautifulSoup-like interface. Subclasses provide
+    the primitives (name, attrs, parent, children, select, get_text, html).
+    """
+
+    name: str = ''
+
+    @property
+    @abstractmethod
+    def attrs(self) -> Dict[str, Any]:
+        pass
+
+    @property
+    @abstractmethod
+    def parent(self) -> Optional['HTMLNode']:
+        pass
+
+    @property
+    @abstractmethod
+    def children(self) -> Iterator['HTMLNode']:
+        pass
+
+    @abstractmethod
+    def select(self, selector: str) -> List['HTMLNode']:
+        pass
+
+    @abstractmethod
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        pass
+
+    @abstractmethod
+    def __str__(self) -> str:
+        pass
+
+    def select_one(self, selector: str) -> Optional['HTMLNode']:
+        elements = self.select(selector)
+        return elements[0] if elements else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def has_attr(self, key: str) -> bool:
+        return key in self.attrs
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> str:
+        return self.get_text()
+
+    @property
+    def title(self) -> Optional['HTMLNode']:
+        return self.find('title')
+
+    def prettify(self) -> str:
+        return str(self)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def find_all(self, name=None, attrs: Optional[Dict[str, Any]] = None, class_: Optional[str] = None,
+                 string=None, limit: Optional[int] = None, **kwargs) -> List['HTMLNode']:
+        names = name if isinstance(name, (list, tuple)) else [name or '*']
+        criteria = self._criteria(attrs, class_, kwargs)
+        # Narrow the candidates with CSS, then apply bs4's exact matching rules.
+        narrowing = ''.join(f'[{key}]' for key in criteria)
+        selector = ', '.join(f'{tag}{narrowing}' for tag in names)
+        elements = [element for element in self.select(selector) if element._matches(None, criteria)]
+        if string is not None:
+            elements = [element for element in elements if self._text_matches(element.get_text(), string)]
+        return elements[:limit] if limit else elements
+
+    def find(self, name=None, attrs: Optional[Dict[str, Any]] = None, class_: Optional[str] = None,
+             string=None, **kwargs) -> Optional['HTMLNode']:
+        elements = self.find_all(name, attrs, class_, string=string, limit=1, **kwargs)
+        return elements[0] if elements else None
+
+    def find_parent(self, name=None, attrs: Optional[Dict[str, Any]] = None,
+                    class_: Optional[str] = None, **kwargs) -> Optional['HTMLNode']:
+        criteria = self._criteria(attrs, class_, kwargs)
+        parent = self.parent
+        while parent is not None:
+            if parent._matches(name, criteria):
+                return parent
+            parent = parent.parent
+        return None
+
+    @staticmethod
+    def _criteria(attrs, class_, kwargs) -> Dict[str, Any]:
+        criteria = dict(attrs or {})
+        criteria.update(kwargs)
+        if class_ is not None:
+            criteria['class'] = class_
+        return criteria
+
+    @staticmethod
+    def _text_matches(text: str, expected) -> bool:
+        if hasattr(expected, 'search'):
+            return expected.search(text) is not None
+        return text == expected
+
+    def _matches(self, name, criteria: Dict[str, Any]) -> bool:
+        if name is not None:
+            names = name if isinstance(name, (list, tuple)) else [name]
+            if self.name not in names:
+                return False
+        attrs = self.attrs
+        for key, expected in criteria.items():
+            actual = attrs.get(key)
+            if expected is True:
+                if actual is None:
+                    return False
+            elif key in MULTI_VALUED_ATTRIBUTES:
+                if actual is None or expected not in actual.split() and expected != actual:
+                    return False
+            elif actual != expected:
+                return False
+        return True
+
+
+class LxmlNode(HTMLNode):
+    """HTMLNode over an lxml.html element; CSS selectors are compiled to XPath once."""
+
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        self.element = element
+
+    @classmethod
+    def from_html(cls, content: Union[str, bytes]) -> 'LxmlNode':
+        text = decode_html(content)
+        try:
+            root = lxml.html.document_fromstring(text) if text.strip() else None
+        except (etree.ParserError, ValueError):
+            root = None
+        if root is None:
+            root = lxml.html.document_fromstring('<html></html>')
+        return cls(root)
+
+    @property
+    def name(self) -> str:
+        tag = self.element.tag
+        return tag if isinstance(tag, str) else ''
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return dict(self.element.attrib)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.element.get(key, default)
+
+    @property
+    def parent(self) -> Optional['LxmlNode']:
+        parent = self.element.getparent()
+        return LxmlNode(parent) if parent is not None else None
+
+    @property
+    def children(self) -> Iterator['LxmlNode']:
+        return (LxmlNode(child) for child in self.element if isinstance(child.tag, str))
+
+    def select(self, selector: str) -> List['LxmlNode']:
+        return [LxmlNode(element) for element in compile_css(selector)(self.element)]
+
+    def xpath(self, expression: str) -> List[Any]:
+        return [LxmlNode(result) if isinstance(result, etree._Element) else result
+                for result in self.element.xpath(expression)]
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        texts = self.element.xpath('.//text()[not(parent::script) and not(parent::style)]')
+        if strip:
+            texts = [text.strip() for text in texts]
+            texts = [text for text in texts if text]
+        return separator.join(texts)
+
+    def __str__(self) -> str:
+        return lxml.html.tostring(self.element, encoding='unicode')
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LxmlNode) and other.element is self.element
+
+    def __hash__(self) -> int:
+        return id(self.element)
+
+
+class SelectolaxNode(HTMLNode):
+    """HTMLNode over a selectolax (lexbor) node."""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @classmethod
+    def from_html(cls, content: Union[str, bytes]) -> 'SelectolaxNode':
+        if LexborHTMLParser is None:
+            raise ImportError("The selectolax parser backend requires the selectolax package")
+        return cls(LexborHTMLParser(decode_html(content)).root)
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return {key: value if value is not None else '' for key, value in self.node.attributes.items()}
+
+    @property
+    def parent(self) -> Optional['SelectolaxNode']:
+        parent = self.node.parent
+        if parent is None or parent.tag == '-document':
+            return None
+        return SelectolaxNode(parent)
+
+    @property
+    def children(self) -> Iterator['SelectolaxNode']:
+        return (SelectolaxNode(child) for child in self.node.iter() if not child.tag.startswith('-'))
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        return [SelectolaxNode(node) for node in self.node.css(selector)]
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def __str__(self) -> str:
+        return self.node.html or ''
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SelectolaxNode) and other.node.mem_id == self.node.mem_id
+
+    def __hash__(self) -> int:
+        return self.node.mem_id
@@ -0,0 +1,153 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+
+class CacheEntry:
+
+    def __init__(self, key: str, url: str, mode: str, body: bytes, etag: Optional[str],
+                 last_modified: Optional[str], stored_at: float):
+        self.key = key
+        self.url = url
+        self.mode = mode
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class HTTPCache:
+    """
+    On-disk page cache keyed by URL and render mode ("static" or "render").
+
+    Static entries keep the ETag/Last-Modified validators so the next request can
+    be made conditional and answered with 304. Entries younger than the mode's
+    freshness window are served without any request at all, which is how rendered
+    HTML gets reused. Bodies are zlib-compressed in SQLite; entries older than
+    ``max_age`` are dropped and the least recently used ones are evicted once the
+    cache grows past ``max_bytes``.
+
+    Args:
+        path (str): SQLite file holding the cache.
+        max_age (float): Seconds after which an entry is discarded.
+        fresh_for (Dict[str, float]): Seconds an entry of each mode is served without revalidation.
+        max_bytes (int): Upper bound for the compressed size of all bodies.
+    """
+
+    def __init__(self, path: str, max_age: float = 7 * 24 * 3600,
+                 fresh_for: Optional[Dict[str, float]] = None, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_age = max_age
+        self.fresh_for = {'static': 0, 'render': 3600}
+        self.fresh_for.update(fresh_for or {})
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, url TEXT, mode TEXT, etag TEXT, last_modified TEXT,"
+            " body BLOB, size INTEGER, stored_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str, mode: str) -> str:
+        return hashlib.sha1(f"{mode} {url}".encode('utf-8')).hexdigest()
+
+    def lookup(self, url: str, mode: str) -> Optional[CacheEntry]:
+        key = self.make_key(url, mode)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            etag, last_modified, body, stored_at = row
+            if time.time() - stored_at > self.max_age:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return CacheEntry(key, url, mode, zlib.decompress(body), etag, last_modified, stored_at)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        fresh = entry.age <= self.fresh_for.get(entry.mode, 0)
+        if fresh:
+            self.stats['hits'] += 1
+        return fresh
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self, entry: CacheEntry) -> None:
+        """Marks an entry as confirmed by a 304 response."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, entry.key)
+            )
+            self._conn.commit()
+        entry.stored_at = now
+        self.stats['revalidated'] += 1
+
+    def store(self, url: str, mode: str, body: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, url, mode, etag, last_modified, body, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(url, mode), url, mode, etag, last_modified,
+                 compressed, len(compressed), now, now)
+            )
+            self.stats['stored'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        self._conn.execute("DELETE FROM entries WHERE stored_at < ?", (time.time() - self.max_age,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.stats['evicted'] += 1
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
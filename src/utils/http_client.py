@@ -0,0 +1,84 @@
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    # Only advertise encodings urllib3 can decode (br requires the brotli package).
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class PooledHTTPClient:
+    """
+    Keep-alive HTTP client with one urllib3 connection pool per host.
+
+    Args:
+        pool_connections (int): Number of per-host pools kept alive.
+        pool_maxsize (int): Maximum open connections per host.
+        timeout (float): Default request timeout in seconds.
+        headers (Dict[str, str]): Extra default headers.
+    """
+
+    def __init__(self, pool_connections: int = 20, pool_maxsize: int = 10,
+                 timeout: float = 30, headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._adapter = adapter
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        return self.request('GET', url, headers=headers, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Connection reuse statistics taken from the live urllib3 pools. Pools evicted
+        after ``pool_connections`` hosts are no longer counted.
+        """
+        pools = self._adapter.poolmanager.pools
+        hosts = {}
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats = hosts.setdefault(pool.host, {'requests': 0, 'connections': 0})
+            stats['requests'] += pool.num_requests
+            stats['connections'] += pool.num_connections
+
+        total_requests = sum(stats['requests'] for stats in hosts.values())
+        total_connections = sum(stats['connections'] for stats in hosts.values())
+        reused = max(total_requests - total_connections, 0)
+        return {
+            'requests': total_requests,
+            'connections_opened': total_connections,
+            'connections_reused': reused,
+            'reuse_ratio': reused / total_requests if total_requests else 0.0,
+            'hosts': hosts,
+        }
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,147 @@
+import urllib.parse
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from cssselect import HTMLTranslator, SelectorError, parse as parse_css
+from cssselect.parser import CombinedSelector
+from lxml import etree
+
+
+class ListingItem(NamedTuple):
+    title: str
+    url: str
+    image: str
+    price: str
+
+
+def supports_streaming(selector: Optional[str]) -> bool:
+    """
+    True when ``selector`` can be tested on an element without looking at the rest
+    of the document: a single compound CSS selector such as ``a.prod-th`` or
+    ``a[href*='/product/']`` (no combinators, no ``:contains``, no XPath).
+    """
+    if not selector or ':contains(' in selector:
+        return False
+    try:
+        parsed = parse_css(selector)
+    except SelectorError:
+        return False
+    return len(parsed) == 1 and not isinstance(parsed[0].parsed_tree, CombinedSelector)
+
+
+@lru_cache(maxsize=256)
+def _element_matcher(selector: str) -> etree.XPath:
+    """XPath that yields the context element itself when it matches ``selector``."""
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix='self::'))
+
+
+@lru_cache(maxsize=256)
+def _descendant_matcher(selector: str) -> etree.XPath:
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix='descendant-or-self::'))
+
+
+class StreamingListingExtractor:
+    """
+    Pulls product listings out of a category page while its HTML is still
+    arriving, without building a full tree.
+
+    Chunks go through lxml's ``HTMLPullParser``; an item is emitted as soon as
+    its product container (``product_selector``) closes, or, without a container
+    selector, as soon as the product link (``urls_selector``) closes. Emitted
+    subtrees and everything before them are dropped, so memory stays bounded by
+    one product card instead of the whole page.
+
+    Both selectors must pass ``supports_streaming``. Only the first link with
+    text in each container is emitted; the image is the first ``<img>`` of the
+    container (or link) and the price the text of ``price_selector`` in it.
+    """
+
+    def __init__(self, urls_selector: str, product_selector: Optional[str] = None,
+                 price_selector: Optional[str] = None, base_url: str = ''):
+        for selector in (urls_selector, product_selector, price_selector):
+            if selector and not supports_streaming(selector):
+                raise ValueError(f"Selector cannot be streamed: {selector}")
+
+        self.base_url = base_url
+        self._is_link = _element_matcher(urls_selector)
+        self._links = _descendant_matcher(urls_selector)
+        self._is_container = _element_matcher(product_selector) if product_selector else None
+        self._price = _descendant_matcher(price_selector) if price_selector else None
+        self._parser = etree.HTMLPullParser(events=('start', 'end'))
+        self._open_containers = 0
+        self.emitted = 0
+
+    def feed(self, chunk: bytes) -> List[ListingItem]:
+        """Parses ``chunk`` and returns the listings completed by it."""
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[ListingItem]:
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        return self._drain()
+
+    def iter_listings(self, chunks: Iterable[bytes]) -> Iterator[ListingItem]:
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def _drain(self) -> List[ListingItem]:
+        items = []
+        for event, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            if self._is_container is not None:
+                if not self._is_container(element):
+                    continue
+                if event == 'start':
+                    self._open_containers += 1
+                    continue
+                self._open_containers -= 1
+                # Nested containers: the outermost one carries the listing.
+                if self._open_containers:
+                    continue
+            elif event == 'start' or not self._is_link(element):
+                continue
+
+            item = self._item_from(element)
+            if item is not None:
+                items.append(item)
+            self._release(element)
+        self.emitted += len(items)
+        return items
+
+    def _item_from(self, element) -> Optional[ListingItem]:
+        links = self._links(element) if self._is_container is not None else [element]
+        for link in links:
+            title = ' '.join(''.join(link.itertext()).split())
+            url = (link.get('href') or '').strip()
+            if title and url:
+                return ListingItem(title, self._absolute(url), self._image(element), self._price_text(element))
+        return None
+
+    def _image(self, element) -> str:
+        for img in element.iter('img'):
+            src = img.get('data-src') or img.get('src')
+            if src and not src.startswith('data:image'):
+                return self._absolute(src)
+        return ''
+
+    def _price_text(self, element) -> str:
+        if self._price is None:
+            return ''
+        found = self._price(element)
+        return ' '.join(''.join(found[0].itertext()).split()) if found else ''
+
+    def _absolute(self, url: str) -> str:
+        return urllib.parse.urljoin(self.base_url, url) if self.base_url else url
+
+    @staticmethod
+    def _release(element) -> None:
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve a token under the lock and sleep
+    outside of it, so concurrent workers queue up without blocking each other
+    on the lock itself.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes one token and returns how many seconds the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """
+    Keeps one TokenBucket per host so each shop gets its own politeness budget.
+
+    Args:
+        rate (float): Requests per second allowed for any host without override.
+        burst (float): Number of requests a host may receive back to back.
+        host_rates (Dict[str, float]): Per-host overrides of ``rate``, keyed by
+            host name (``host_requests_per_second`` in the scraper config).
+    """
+
+    def __init__(self, rate: float = 0.5, burst: float = 1.0,
+                 host_rates: Optional[Dict[str, float]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = {host.lower(): host_rate for host, host_rate in (host_rates or {}).items()}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower() if url else ""
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.rate), self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Blocks until a request to the host of ``url`` is allowed and returns the time waited."""
+        return self.bucket_for(self.host_of(url)).acquire()
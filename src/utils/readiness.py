@@ -0,0 +1,136 @@
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Resolves once the DOM has had no mutation for ``quietMs``; the observer is
+# installed on the first poll and outlives it.
+QUIET_SCRIPT = """
+(quietMs) => {
+    if (!window.__readiness) {
+        window.__readiness = {last: performance.now()};
+        new MutationObserver(() => { window.__readiness.last = performance.now(); })
+            .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+    return performance.now() - window.__readiness.last >= quietMs;
+}
+"""
+
+SCROLL_SCRIPT = "window.scrollTo(0, 300)"
+
+
+class ReadinessWaiter:
+    """
+    Decides when a rendered page is ready instead of sleeping a fixed time.
+
+    With a selector the wait ends as soon as it is attached; without one it ends
+    once the DOM has been quiet for ``quiet_ms``. Either wait is bounded by a
+    per-host budget learned from earlier pages: ``headroom`` times the slowest
+    of the last ``window`` readiness times, kept between ``min_timeout`` and the
+    ceiling for the mode (``selector_timeout``, or the caller's ``max_wait`` for
+    quiet waits). Hosts start with the full ceiling. A wait that runs out is
+    not an error: the page is used as it is, as before.
+
+    ``metrics`` reports the time actually spent waiting.
+    """
+
+    def __init__(self, quiet_ms: int = 300, min_timeout: float = 0.5, selector_timeout: float = 10.0,
+                 headroom: float = 2.0, window: int = 50, poll_ms: int = 100):
+        self.quiet_ms = quiet_ms
+        self.min_timeout = min_timeout
+        self.selector_timeout = selector_timeout
+        self.headroom = headroom
+        self.window = window
+        self.poll_ms = poll_ms
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'pages': 0, 'waited': 0.0, 'timeouts': 0, 'max_wait': 0.0}
+
+    def budget(self, url: str, mode: str, ceiling: float) -> float:
+        with self._lock:
+            samples = self._samples.get((_host(url), mode))
+            if not samples:
+                return ceiling
+            learned = max(samples) * self.headroom
+        return max(self.min_timeout, min(ceiling, learned))
+
+    def wait(self, page, url: str, selector: Optional[str] = None, max_wait: float = 2.0) -> float:
+        """Waits on a sync Playwright page; returns the seconds spent."""
+        mode, ceiling = self._mode(selector, max_wait)
+        timeout = self.budget(url, mode, ceiling)
+        start = time.perf_counter()
+        try:
+            _scroll(page)
+            if selector:
+                page.wait_for_selector(selector, state='attached', timeout=timeout * 1000)
+            else:
+                page.wait_for_function(QUIET_SCRIPT, arg=self.quiet_ms, polling=self.poll_ms,
+                                       timeout=timeout * 1000)
+            timed_out = False
+        except Exception:
+            timed_out = True
+        return self.record(url, mode, time.perf_counter() - start, timed_out)
+
+    async def wait_async(self, page, url: str, selector: Optional[str] = None, max_wait: float = 2.0) -> float:
+        """``wait`` for an async Playwright page."""
+        mode, ceiling = self._mode(selector, max_wait)
+        timeout = self.budget(url, mode, ceiling)
+        start = time.perf_counter()
+        try:
+            try:
+                await page.evaluate(SCROLL_SCRIPT)
+            except Exception:
+                pass
+            if selector:
+                await page.wait_for_selector(selector, state='attached', timeout=timeout * 1000)
+            else:
+                await page.wait_for_function(QUIET_SCRIPT, arg=self.quiet_ms, polling=self.poll_ms,
+                                             timeout=timeout * 1000)
+            timed_out = False
+        except Exception:
+            timed_out = True
+        return self.record(url, mode, time.perf_counter() - start, timed_out)
+
+    def record(self, url: str, mode: str, elapsed: float, timed_out: bool = False) -> float:
+        with self._lock:
+            samples = self._samples.setdefault((_host(url), mode), deque(maxlen=self.window))
+            # A timed-out wait only says readiness took at least this long.
+            samples.append(elapsed)
+            self.stats['pages'] += 1
+            self.stats['waited'] += elapsed
+            self.stats['max_wait'] = max(self.stats['max_wait'], elapsed)
+            if timed_out:
+                self.stats['timeouts'] += 1
+        return elapsed
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            pages = self.stats['pages']
+            budgets = {f"{host} {mode}": round(max(samples) * self.headroom, 3)
+                       for (host, mode), samples in self._samples.items() if samples}
+            return {
+                'pages': pages,
+                'waited_seconds': round(self.stats['waited'], 3),
+                'avg_wait': round(self.stats['waited'] / pages, 3) if pages else 0.0,
+                'max_wait': round(self.stats['max_wait'], 3),
+                'timeouts': self.stats['timeouts'],
+                'learned_budgets': budgets,
+            }
+
+    def _mode(self, selector: Optional[str], max_wait: float) -> Tuple[str, float]:
+        if selector:
+            return 'selector', self.selector_timeout
+        return 'quiet', max(self.min_timeout, max_wait)
+
+
+def _host(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+def _scroll(page) -> None:
+    # Nudges lazy-loaded listings into view before the wait starts.
+    try:
+        page.evaluate(SCROLL_SCRIPT)
+    except Exception:
+        pass
@@ -0,0 +1,146 @@
+import fnmatch
+import threading
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Resource types a scraper needs to get at the rendered HTML.
+DEFAULT_ALLOW_TYPES = ('document', 'script', 'xhr', 'fetch', 'other')
+
+# Analytics, ads, social embeds and chat widgets: never needed, whatever the type.
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'googleadservices.com', 'facebook.com', 'facebook.net', 'instagram.com', 'tiktok.com',
+    'twitter.com', 'adsystem.amazon.com', 'amazon-adsystem.com', 'hotjar.com', 'clarity.ms',
+    'zendesk.com', 'zdassets.com', 'intercom.io', 'tawk.to', 'crisp.chat', 'jivosite.com',
+    'livechatinc.com', 'hs-scripts.com', 'hubspot.com', 'manychat.com', 'onesignal.com',
+)
+
+
+def host_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+def site_of(url: str) -> str:
+    host = urllib.parse.urlsplit(url).hostname or ''
+    return host[4:] if host.startswith('www.') else host
+
+
+class ResourceStats:
+    """Requests let through or aborted for one page (or a whole session)."""
+
+    def __init__(self):
+        self.allowed = 0
+        self.blocked = 0
+        self.allowed_bytes = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, resource_type: str, allowed: bool) -> None:
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.blocked += 1
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def record_response(self, response) -> None:
+        """``page.on('response')`` listener; counts the bytes the server announced."""
+        try:
+            length = int(response.headers.get('content-length') or 0)
+        except (AttributeError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.allowed_bytes += length
+
+    def merge(self, other: 'ResourceStats') -> None:
+        with self._lock:
+            self.allowed += other.allowed
+            self.blocked += other.blocked
+            self.allowed_bytes += other.allowed_bytes
+            for resource_type, count in other.blocked_by_type.items():
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'allowed': self.allowed, 'blocked': self.blocked, 'allowed_bytes': self.allowed_bytes,
+                    'blocked_by_type': dict(self.blocked_by_type)}
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """
+    Which requests a rendered page may make, from a store's ``resource_policy``
+    config:
+
+    - ``allow_types``: Playwright resource types let through (images, media,
+      fonts and stylesheets are not, by default);
+    - ``block_hosts``: always aborted (config entries add to ``TRACKER_HOSTS``);
+    - ``third_party_scripts``: with false, scripts (and xhr/fetch) only load from
+      ``first_party`` (the store's own sites) and ``allow_hosts``;
+    - ``script_paths``: glob patterns first-party script paths must match, when set.
+
+    Installed with a single ``context.route('**/*', ...)``; every decision is
+    counted in the page's ``ResourceStats``.
+    """
+
+    allow_types: Tuple[str, ...] = DEFAULT_ALLOW_TYPES
+    block_hosts: Tuple[str, ...] = TRACKER_HOSTS
+    third_party_scripts: bool = True
+    first_party: Tuple[str, ...] = ()
+    allow_hosts: Tuple[str, ...] = ()
+    script_paths: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], first_party: Iterable[str] = ()) -> 'ResourcePolicy':
+        config = config or {}
+        known = {key: tuple(value) if isinstance(value, list) else value
+                 for key, value in config.items() if key in cls.__dataclass_fields__}
+        known['block_hosts'] = TRACKER_HOSTS + tuple(known.get('block_hosts', ()))
+        known['first_party'] = tuple(sorted(set(first_party) | set(known.get('first_party', ()))))
+        return cls(**known)
+
+    def allows(self, url: str, resource_type: str) -> bool:
+        if resource_type not in self.allow_types:
+            return False
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme in ('data', 'blob'):
+            return True
+        host = (parts.hostname or '').lower()
+        if host_matches(host, self.block_hosts):
+            return False
+        if resource_type == 'document':
+            return True
+        if host_matches(host, self.allow_hosts):
+            return True
+        first_party = not self.first_party or host_matches(host, self.first_party)
+        if not first_party:
+            return self.third_party_scripts
+        if resource_type == 'script' and self.script_paths:
+            return any(fnmatch.fnmatch(parts.path, pattern) for pattern in self.script_paths)
+        return True
+
+    def route_handler(self, stats_for: Callable[[Any], Optional[ResourceStats]]):
+        """``context.route`` handler for the sync Playwright API."""
+        def handle(route):
+            if self._decide(route.request, stats_for):
+                route.continue_()
+            else:
+                route.abort()
+        return handle
+
+    def async_route_handler(self, stats_for: Callable[[Any], Optional[ResourceStats]]):
+        """``context.route`` handler for the async Playwright API."""
+        async def handle(route):
+            if self._decide(route.request, stats_for):
+                await route.continue_()
+            else:
+                await route.abort()
+        return handle
+
+    def _decide(self, request, stats_for) -> bool:
+        allowed = self.allows(request.url, request.resource_type)
+        stats = stats_for(request)
+        if stats is not None:
+            stats.record(request.resource_type, allowed)
+        return allowed
@@ -1,19 +1,112 @@
 import time
 import random
-from bs4 import BeautifulSoup
 import os
+import re
 import logging
 from playwright.sync_api import sync_playwright
-from src.utils.save_soup import save_soup_to_file
+from src.utils.rate_limiter import HostRateLimiter
+from src.utils.http_client import PooledHTTPClient, USER_AGENT
+from src.utils.html_parser import parse_html, DEFAULT_PARSER
+from src.utils.readiness import ReadinessWaiter
+from src.utils.resource_policy import ResourcePolicy, ResourceStats
+
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-images',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-features=TranslateUI',
+    '--disable-ipc-flooding-protection',
+    '--memory-pressure-off',
+    '--max_old_space_size=512',
+    '--single-process',
+    '--no-zygote',
+    '--window-size=1024,768',
+    '--disable-web-security',
+    '--disable-dev-tools',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=VizDisplayCompositor',
+    f'--user-agent={USER_AGENT}',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--disable-background-networking'
+]
+
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1024, 'height': 768},
+    'user_agent': USER_AGENT,
+    'locale': 'es-CL',
+    'timezone_id': 'America/Santiago',
+    'extra_http_headers': {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+        'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    }
+}
+
+# A rendered page shorter than this, or without <head> and <body>, was cut off.
+MIN_PAGE_LENGTH = 500
+HEAD_TAG = re.compile(r'<head[\s>]', re.IGNORECASE)
+BODY_TAG = re.compile(r'<body[\s>]', re.IGNORECASE)
+
+STEALTH_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined,
+});
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [1, 2, 3, 4, 5],
+});
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['es-ES', 'es', 'en'],
+});
+window.chrome = {
+    runtime: {},
+};
+delete navigator.__proto__.webdriver;
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [
+        {
+            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
+            description: "Portable Document Format",
+            filename: "internal-pdf-viewer",
+            length: 1,
+            name: "Chrome PDF Plugin"
+        }
+    ]
+});
+"""
 
 
 class RequestsHTMLSession:
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, rate_limiter=None, http_client=None, cache=None, parser=DEFAULT_PARSER,
+                 debug_capture=None, readiness=None, resource_policy=None):
         self._setup_encoding()
         self._setup_logging(debug)
         self.playwright = None
         self.browser = None
         self.context = None
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.http_client = http_client or PooledHTTPClient()
+        self._owns_http_client = http_client is None
+        self.cache = cache
+        self.parser = parser
+        self.debug_capture = debug_capture
+        self.readiness = readiness or ReadinessWaiter()
+        self.resource_policy = resource_policy or ResourcePolicy()
+        self.resource_stats = ResourceStats()
+        self._page_resources = {}
+        self.resource_pages = 0
         self.last_request_time = 0
         self._page_count = 0
         self._max_pages_per_browser = 10
@@ -46,55 +139,12 @@ class RequestsHTMLSession:
             self._log("Inicializando Playwright...")
             self.playwright = sync_playwright().start()
 
-            browser_args = [
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-accelerated-2d-canvas',
-                '--disable-gpu',
-                '--disable-extensions',
-                '--disable-plugins',
-                '--disable-images',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--disable-features=TranslateUI',
-                '--disable-ipc-flooding-protection',
-                '--memory-pressure-off',
-                '--max_old_space_size=512',
-                '--single-process',
-                '--no-zygote',
-                '--window-size=1024,768',
-                '--disable-web-security',
-                '--disable-dev-tools',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-features=VizDisplayCompositor',
-                '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                '--disable-default-apps',
-                '--disable-sync',
-                '--no-first-run',
-                '--disable-background-networking'
-            ]
-
             self.browser = self.playwright.chromium.launch(
                 headless=True,
-                args=browser_args
+                args=BROWSER_ARGS
             )
 
-            self.context = self.browser.new_context(
-                viewport={'width': 1024, 'height': 768},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='es-CL',
-                timezone_id='America/Santiago',
-                extra_http_headers={
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                }
-            )
+            self.context = self.browser.new_context(**CONTEXT_OPTIONS)
 
             self._setup_resource_blocking()
             self._inject_stealth_scripts()
@@ -103,64 +153,51 @@ class RequestsHTMLSession:
             self._log("Playwright inicializado")
 
     def _setup_resource_blocking(self):
-        self.context.route("**/*.{png,jpg,jpeg,gif,svg,webp,ico,bmp,tiff}",
-                           lambda route: route.abort())
-
-        blocking_domains = [
-            "**/google-analytics.com/**",
-            "**/googletagmanager.com/**",
-            "**/facebook.com/**",
-            "**/instagram.com/**",
-            "**/tiktok.com/**",
-            "**/twitter.com/**",
-            "**/doubleclick.net/**",
-            "**/adsystem.amazon.com/**",
-            "**/amazon-adsystem.com/**",
-            "**/googlesyndication.com/**",
-            "**/hotjar.com/**",
-            "**/zendesk.com/**",
-            "**/intercom.io/**"
-        ]
+        self.context.route('**/*', self.resource_policy.route_handler(self._resources_for))
 
-        for domain in blocking_domains:
-            self.context.route(domain, lambda route: route.abort())
+    def _resources_for(self, request):
+        try:
+            return self._page_resources.get(request.frame.page)
+        except Exception:
+            # Requests without a page (service workers) are decided but not counted.
+            return None
+
+    def _watch_resources(self, page):
+        page.on('response', lambda response: self._record_response(page, response))
+
+    def _record_response(self, page, response):
+        stats = self._page_resources.get(page)
+        if stats is not None:
+            stats.record_response(response)
+
+    def _begin_page(self, page):
+        self._page_resources[page] = ResourceStats()
+
+    def _end_page(self, page):
+        stats = self._page_resources.pop(page, None)
+        if stats is None:
+            return
+        self.resource_stats.merge(stats)
+        self.resource_pages += 1
+        self._log(f"Recursos: {stats.allowed} permitidos ({stats.allowed_bytes / 1024:.0f} KB), "
+                  f"{stats.blocked} bloqueados")
 
     def _inject_stealth_scripts(self):
-        stealth_script = """
-        Object.defineProperty(navigator, 'webdriver', {
-            get: () => undefined,
-        });
-        Object.defineProperty(navigator, 'plugins', {
-            get: () => [1, 2, 3, 4, 5],
-        });
-        Object.defineProperty(navigator, 'languages', {
-            get: () => ['es-ES', 'es', 'en'],
-        });
-        window.chrome = {
-            runtime: {},
-        };
-        delete navigator.__proto__.webdriver;
-        Object.defineProperty(navigator, 'plugins', {
-            get: () => [
-                {
-                    0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
-                    description: "Portable Document Format",
-                    filename: "internal-pdf-viewer",
-                    length: 1,
-                    name: "Chrome PDF Plugin"
-                }
-            ]
-        });
-        """
-
-        self.context.add_init_script(stealth_script)
+        self.context.add_init_script(STEALTH_SCRIPT)
 
     def get(self, url, wait_for=None, render_js=True, wait_time=2):
         max_attempts = 3
 
+        cached = None
+        if self.cache:
+            cached = self.cache.lookup(url, 'render' if render_js else 'static')
+            if cached and self.cache.is_fresh(cached):
+                self._log(f"Cache hit: {url}")
+                return self._parse(cached.body)
+
         for attempt in range(max_attempts):
             try:
-                self._apply_rate_limit()
+                self._apply_rate_limit(url)
 
                 if attempt > 0:
                     delay = 2 * (2 ** attempt) + random.uniform(0.5, 1.5)
@@ -170,7 +207,7 @@ class RequestsHTMLSession:
                 if render_js:
                     return self._get_with_playwright(url, wait_for, wait_time)
                 else:
-                    return self._get_with_requests(url)
+                    return self._get_with_requests(url, cached)
 
             except Exception as e:
                 self._log(f"Intento {attempt + 1} falló: {e}")
@@ -184,22 +221,35 @@ class RequestsHTMLSession:
 
         raise Exception(f"Failed to load page after {max_attempts} attempts")
 
-    def _get_with_requests(self, url):
-        import requests
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+    def _get_with_requests(self, url, cached=None):
+        headers = self.cache.conditional_headers(cached) if self.cache else None
+        response = self.http_client.get(url, headers=headers or None)
+
+        if cached is not None and response.status_code == 304:
+            self._log(f"304 Not Modified: {url}")
+            self.cache.revalidated(cached)
+            return self._parse(cached.body)
 
-        response = requests.get(url, timeout=30, headers=headers)
         response.raise_for_status()
-        return BeautifulSoup(response.content, 'html.parser')
+        if self.cache:
+            self.cache.store(url, 'static', response.content,
+                             etag=response.headers.get('ETag'),
+                             last_modified=response.headers.get('Last-Modified'))
+        return self._parse(response.content)
+
+    def _parse(self, content):
+        return parse_html(content, self.parser)
+
+    def _store_rendered(self, url, content):
+        if self.cache:
+            self.cache.store(url, 'render', content.encode('utf-8'))
+
+    def metrics(self):
+        metrics = {'http': self.http_client.metrics(), 'readiness': self.readiness.metrics(),
+                   'resources': dict(self.resource_stats.to_dict(), pages=self.resource_pages)}
+        if self.cache:
+            metrics['cache'] = dict(self.cache.stats)
+        return metrics
 
     def _get_with_playwright(self, url, wait_for=None, wait_time=2):
         self._init_playwright()
@@ -208,6 +258,8 @@ class RequestsHTMLSession:
         try:
             page = self.context.new_page()
             self._page_count += 1
+            self._watch_resources(page)
+            self._begin_page(page)
 
             page.set_default_timeout(20000)
             page.set_default_navigation_timeout(30000)
@@ -227,57 +279,46 @@ class RequestsHTMLSession:
                 else:
                     raise
 
-            page.wait_for_timeout(wait_time * 1000)
-
-            if wait_for:
-                try:
-                    page.wait_for_selector(wait_for, timeout=10000)
-                    self._log(f"Selector encontrado: {wait_for}")
-                except Exception:
-                    self._log(f"Selector {wait_for} no encontrado, continuando...")
-
-            try:
-                page.evaluate("window.scrollTo(0, 300)")
-                page.wait_for_timeout(1000)
-            except Exception:
-                pass
+            waited = self.readiness.wait(page, url, wait_for, max_wait=wait_time)
+            self._log(f"Página lista en {waited:.2f}s")
 
             content = page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-
-            if self._is_complete_page(soup):
-                self._log(f"Página cargada exitosamente ({len(content)} caracteres)")
-                return soup
-            else:
-                raise Exception("Página incompleta detectada")
+            return self._accept_rendered(url, content)
 
         finally:
             if page:
+                self._end_page(page)
                 try:
                     page.close()
                 except Exception as e:
                     pass
 
-    def _apply_rate_limit(self):
-        min_delay = 2.0
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < min_delay:
-            sleep_time = min_delay - time_since_last
-            time.sleep(sleep_time)
+    def _apply_rate_limit(self, url=None):
+        waited = self.rate_limiter.acquire(url)
+        if waited:
+            self._log(f"Rate limit: esperando {waited:.2f}s")
 
         self.last_request_time = time.time()
 
-    def _is_complete_page(self, soup):
-        save_soup_to_file(soup, 'debug_page.html', prettify=True, debug=self.debug)
-        if not soup.find('body') or not soup.find('head'):
-            return False
+    def _accept_rendered(self, url, content):
+        """Parses a rendered page once it passes the completeness check on its raw HTML."""
+        if not self._is_complete_page(content):
+            self._capture(url, content, 'incomplete')
+            raise Exception("Página incompleta detectada")
+
+        self._log(f"Página cargada exitosamente ({len(content)} caracteres)")
+        self._capture(url, content)
+        self._store_rendered(url, content)
+        return self._parse(content)
 
-        if len(str(soup)) < 500:
-            return False
+    def _is_complete_page(self, content):
+        return (len(content) >= MIN_PAGE_LENGTH
+                and HEAD_TAG.search(content) is not None
+                and BODY_TAG.search(content) is not None)
 
-        return True
+    def _capture(self, url, content, reason='sample'):
+        if self.debug_capture is not None:
+            self.debug_capture.capture(url, content, reason)
 
     def _cleanup_playwright(self):
         try:
@@ -297,6 +338,8 @@ class RequestsHTMLSession:
 
     def close(self):
         self._cleanup_playwright()
+        if self._owns_http_client:
+            self.http_client.close()
 
 
 class LightweightPlaywrightSession(RequestsHTMLSession):
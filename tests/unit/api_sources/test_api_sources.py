@@ -0,0 +1,180 @@
+import pytest
+from unittest.mock import Mock
+
+from src.api_sources import (
+    ApiSource,
+    ApiSourceUnavailable,
+    ShopifySource,
+    WooCommerceSource,
+    create_api_source,
+)
+
+
+def json_response(payload, status_code=200, headers=None):
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = payload
+    return response
+
+
+def shopify_product(handle, price='12990.00', available=True):
+    return {
+        'title': f'Booster {handle}',
+        'handle': handle,
+        'body_html': '<p>Sobre de <b>10</b> cartas</p>',
+        'variants': [{'price': '15990.00', 'available': False}, {'price': price, 'available': available}],
+        'images': [{'src': f'https://cdn.shopify.test/{handle}.png'}],
+        'options': [{'name': 'Idioma', 'values': ['Inglés', 'Español']}],
+    }
+
+
+class TestShopifySource:
+
+    def test_record_matches_process_product_schema(self):
+        http_client = Mock()
+        http_client.get.return_value = json_response({'products': [shopify_product('sv1')]})
+        source = ShopifySource(http_client)
+
+        records = source.fetch_category('https://carduniverse.cl/collections/pokemon-tcg?page=1')
+
+        http_client.get.assert_called_once_with(
+            'https://carduniverse.cl/collections/pokemon-tcg/products.json',
+            params={'limit': 250, 'page': 1}, headers={'Accept': 'application/json'})
+        assert records == [{
+            'name': 'Booster sv1',
+            'url': 'https://carduniverse.cl/products/sv1',
+            'price': '12990',
+            'stock': 'in_stock',
+            'description': 'Sobre de 10 cartas',
+            'img_url': 'https://cdn.shopify.test/sv1.png',
+            'language': 'Inglés, Español',
+        }]
+
+    def test_pages_until_short_page(self):
+        http_client = Mock()
+        http_client.get.side_effect = [
+            json_response({'products': [shopify_product('a'), shopify_product('b')]}),
+            json_response({'products': [shopify_product('c', available=False)]}),
+        ]
+        source = ShopifySource(http_client, per_page=2)
+
+        records = source.fetch_category('https://shop.test/collections/magic')
+
+        assert [record['url'] for record in records] == [
+            'https://shop.test/products/a', 'https://shop.test/products/b', 'https://shop.test/products/c']
+        assert records[2]['stock'] == 'out_of_stock'
+        assert records.complete is True
+
+    def test_limit_stops_paging(self):
+        http_client = Mock()
+        http_client.get.return_value = json_response({'products': [shopify_product('a'), shopify_product('b')]})
+
+        records = ShopifySource(http_client, per_page=2).fetch_category('https://shop.test/collections/x', limit=1)
+
+        assert len(records) == 1
+        assert records.complete is False
+        assert http_client.get.call_count == 1
+
+    @pytest.mark.parametrize('response', [
+        json_response({}, status_code=404),
+        json_response(['not', 'a', 'catalog']),
+    ])
+    def test_unavailable_endpoint(self, response):
+        http_client = Mock()
+        http_client.get.return_value = response
+
+        with pytest.raises(ApiSourceUnavailable):
+            ShopifySource(http_client).fetch_category('https://shop.test/collections/x')
+
+    def test_later_page_failure_keeps_earlier_pages(self):
+        http_client = Mock()
+        http_client.get.side_effect = [json_response({'products': [shopify_product('a')]}),
+                                       json_response({}, status_code=429)]
+
+        records = ShopifySource(http_client, per_page=1).fetch_category('https://shop.test/collections/x')
+
+        assert len(records) == 1
+        assert records.complete is False
+
+    def test_max_pages_leaves_listing_incomplete(self):
+        http_client = Mock()
+        http_client.get.return_value = json_response({'products': [shopify_product('a')]})
+
+        records = ShopifySource(http_client, per_page=1, max_pages=2).fetch_category('https://shop.test/collections/x')
+
+        assert len(records) == 2
+        assert records.complete is False
+
+    def test_rate_limiter_is_used(self):
+        http_client, rate_limiter = Mock(), Mock()
+        http_client.get.return_value = json_response({'products': []})
+
+        ShopifySource(http_client, rate_limiter=rate_limiter).fetch_category('https://shop.test/collections/x')
+
+        rate_limiter.acquire.assert_called_once_with('https://shop.test/collections/x/products.json')
+
+
+class TestWooCommerceSource:
+
+    PRODUCT = {
+        'name': 'Sobre Silver Tempest &#8211; Español',
+        'permalink': 'https://elreino.test/producto/sobre-silver-tempest/',
+        'prices': {'price': '499000', 'currency_minor_unit': 2},
+        'is_in_stock': True,
+        'description': '<p>Incluye 10 cartas</p>',
+        'images': [{'src': 'https://elreino.test/wp-content/st.jpg'}],
+    }
+
+    def test_record_and_endpoint(self):
+        http_client = Mock()
+        http_client.get.return_value = json_response([self.PRODUCT], headers={'X-WP-TotalPages': '1'})
+
+        records = WooCommerceSource(http_client).fetch_category(
+            'https://elreino.test/categoria-producto/pokemon-tcg/sobres-pokemon-tcg/')
+
+        http_client.get.assert_called_once_with(
+            'https://elreino.test/wp-json/wc/store/v1/products',
+            params={'category': 'sobres-pokemon-tcg', 'per_page': 100, 'page': 1},
+            headers={'Accept': 'application/json'})
+        assert records == [{
+            'name': 'Sobre Silver Tempest – Español',
+            'url': 'https://elreino.test/producto/sobre-silver-tempest/',
+            'price': '4990',
+            'stock': 'in_stock',
+            'description': 'Incluye 10 cartas',
+            'img_url': 'https://elreino.test/wp-content/st.jpg',
+        }]
+
+    def test_total_pages_header_stops_paging(self):
+        http_client = Mock()
+        http_client.get.return_value = json_response([self.PRODUCT], headers={'X-WP-TotalPages': '2'})
+
+        records = WooCommerceSource(http_client, per_page=1).fetch_category('https://elreino.test/categoria-producto/yu-gi-oh/')
+
+        assert len(records) == 2
+        assert records.complete is True
+        assert http_client.get.call_count == 2
+
+    def test_url_without_category(self):
+        with pytest.raises(ApiSourceUnavailable):
+            WooCommerceSource(Mock()).fetch_category('https://elreino.test/')
+
+
+class TestCreateApiSource:
+
+    def test_by_name_and_dict(self):
+        assert isinstance(create_api_source('shopify', Mock()), ShopifySource)
+        source = create_api_source({'type': 'woocommerce', 'per_page': 50, 'max_pages': 3}, Mock())
+        assert isinstance(source, WooCommerceSource)
+        assert (source.per_page, source.max_pages) == (50, 3)
+        assert create_api_source(None, Mock()) is None
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError):
+            create_api_source('bsale', Mock())
+
+    def test_format_price(self):
+        assert ApiSource.format_price('12990.00') == '12990'
+        assert ApiSource.format_price('12990.5') == '12991'
+        assert ApiSource.format_price(12990.4) == '12990'
+        assert ApiSource.format_price('n/a') == ''
+        assert ApiSource.format_price('NaN') == ''
@@ -0,0 +1,117 @@
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.pipeline.delta import Delta, UploadIndex, content_hash
+from src.pipeline.models import PipelineConfig
+from src.pipeline.stages.post_request import PostRequestStage
+
+
+def product(url, price, store='store_a', category='magic', **extra):
+    row = {'name': url.title(), 'price': price, 'url': url, 'store': store, 'category': category,
+           'timestamp': '2024-01-01 10:00:00'}
+    row.update(extra)
+    return row
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = UploadIndex(str(tmp_path / 'upload_index.json'))
+    index.acknowledge([product('a', 100), product('b', 200), product('c', 300, category='pokemon')])
+    return index
+
+
+class TestUploadIndex:
+
+    def test_hash_ignores_timestamp(self):
+        assert content_hash(product('a', 100)) == content_hash(product('a', 100, timestamp='later'))
+        assert content_hash(product('a', 100)) != content_hash(product('a', 101))
+
+    def test_diff(self, index):
+        delta = index.diff([product('a', 100), product('b', 250), product('d', 50)])
+
+        assert [row['url'] for row in delta.inserts] == ['d']
+        assert [row['url'] for row in delta.updates] == ['b']
+        assert delta.unchanged == 1
+        # Without the scrapers' report no listing is known to be complete.
+        assert delta.deletes == []
+
+    def test_tombstones_within_fully_crawled_categories(self, index):
+        report = {'store_a': {'magic': {'listing_complete': True, 'failed_urls': []}}}
+
+        delta = index.diff([product('a', 100)], report)
+
+        assert delta.deletes == [{'store': 'store_a', 'url': 'b', 'category': 'magic', 'deleted': True}]
+
+    def test_truncated_or_failed_products_are_not_tombstoned(self, index):
+        # batch_size cut the listing short: 'b' may well still be on sale.
+        truncated = {'store_a': {'magic': {'listing_complete': False, 'failed_urls': []}}}
+        # 'b' was listed but its product page failed to scrape.
+        failed = {'store_a': {'magic': {'listing_complete': True, 'failed_urls': ['b']}}}
+
+        assert index.diff([product('a', 100)], truncated).deletes == []
+        assert index.diff([product('a', 100)], failed).deletes == []
+
+    def test_save_and_load(self, index):
+        index.acknowledge([{'store': 'store_a', 'url': 'b', 'category': 'magic', 'deleted': True}])
+        index.save()
+
+        loaded = UploadIndex(index.path).load()
+
+        assert len(loaded) == 2
+        assert loaded.classify(product('a', 100)) is None
+        assert loaded.classify(product('b', 200)) == 'insert'
+
+    def test_compact_payload(self):
+        delta = Delta(updates=[product('a', 100, stock='')],
+                      deletes=[{'store': 'store_a', 'url': 'b', 'category': 'magic', 'deleted': True}])
+
+        assert delta.payload('compact') == [
+            {'op': 'upsert', 'name': 'A', 'price': 100, 'url': 'a', 'store': 'store_a', 'category': 'magic'},
+            {'op': 'delete', 'store': 'store_a', 'url': 'b'},
+        ]
+        with pytest.raises(ValueError):
+            delta.payload('xml')
+
+
+class TestDeltaPostRequest:
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        return PipelineConfig(config_path='test/config.json', output_dir=str(tmp_path),
+                              api_endpoint='https://api.test/bulk', delta_upload=True,
+                              upload_retries=0)
+
+    @pytest.fixture
+    def stage(self):
+        return PostRequestStage(Mock(spec=logging.Logger))
+
+    @patch('src.pipeline.stages.post_request.requests.post')
+    def test_second_run_posts_only_changes(self, mock_post, stage, config):
+        mock_post.return_value = Mock(status_code=200)
+        report = {'store_a': {'magic': {'listing_complete': True, 'failed_urls': []}}}
+        stage.execute({'config': config, 'consolidated_data': [product('a', 100), product('b', 200)]})
+
+        result = stage.execute({'config': config, 'consolidated_data': [product('a', 120)], 'report': report})
+
+        sent = mock_post.call_args.kwargs['json']
+        assert [(row['url'], row.get('deleted', False)) for row in sent] == [('a', False), ('b', True)]
+        assert result.data['delta'] == {'inserts': 0, 'updates': 1, 'deletes': 1, 'unchanged': 0}
+
+        result = stage.execute({'config': config, 'consolidated_data': [product('a', 120)]})
+
+        assert mock_post.call_count == 2
+        assert result.success is True
+        assert result.message == "No product changes to POST (0 new, 0 changed, 0 removed, 1 unchanged)"
+
+    @patch('src.pipeline.stages.post_request.requests.post')
+    def test_failed_upload_is_not_indexed(self, mock_post, stage, config):
+        mock_post.return_value = Mock(status_code=502, text='bad gateway')
+        stage.execute({'config': config, 'consolidated_data': [product('a', 100)]})
+
+        mock_post.return_value = Mock(status_code=200)
+        result = stage.execute({'config': config, 'consolidated_data': [product('a', 100)]})
+
+        assert result.data['delta']['inserts'] == 1
+        assert [row['url'] for row in mock_post.call_args.kwargs['json']] == ['a']
@@ -0,0 +1,113 @@
+import json
+import logging
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from src.pipeline.models import PipelineConfig, PipelineStage
+from src.pipeline.stages import export
+from src.pipeline.stages.export import (ExportStage, JsonlRows, StreamingExcelExporter, create_exporter,
+                                        export_path)
+
+ROWS = [
+    {'name': 'Booster', 'price': 100, 'url': 'https://a.test/1', 'store': 'store_a', 'category': 'magic'},
+    {'name': 'Bundle', 'price': 250, 'url': 'https://a.test/2', 'store': 'store_a', 'category': 'magic',
+     'stock': 'in_stock', 'variants': [{'sku': 1}]},
+    {'name': 'Sobre', 'price': 30, 'url': 'https://b.test/1', 'store': 'store_b', 'category': 'pokemon'},
+]
+
+
+@pytest.fixture
+def config(tmp_path):
+    return PipelineConfig(config_path='test/config.json', output_dir=str(tmp_path))
+
+
+class TestExporters:
+
+    def test_export_paths(self, config, tmp_path):
+        assert export_path(config, 'json') == str(tmp_path / 'prod_result.json')
+        assert export_path(config, 'excel_stream') == str(tmp_path / 'consolidated_results.xlsx')
+        assert export_path(config, 'parquet') == str(tmp_path / 'prod_result.parquet')
+        with pytest.raises(ValueError, match='Unknown export format: csv'):
+            export_path(config, 'csv')
+
+    def test_json_and_jsonl(self, tmp_path):
+        create_exporter('json').export(ROWS, str(tmp_path / 'out.json'))
+        create_exporter('jsonl').export(ROWS, str(tmp_path / 'out.jsonl'))
+
+        assert json.loads((tmp_path / 'out.json').read_text(encoding='utf-8')) == ROWS
+        assert list(JsonlRows(str(tmp_path / 'out.jsonl'))) == ROWS
+
+    def test_empty_json(self, tmp_path):
+        create_exporter('json').export([], str(tmp_path / 'out.json'))
+
+        assert json.loads((tmp_path / 'out.json').read_text(encoding='utf-8')) == []
+
+    @pytest.mark.parametrize('backend', ['xlsxwriter', 'openpyxl'])
+    def test_streaming_excel(self, backend, tmp_path):
+        path = str(tmp_path / 'out.xlsx')
+        if backend == 'openpyxl':
+            with patch.object(export, 'xlsxwriter', None):
+                StreamingExcelExporter().export(ROWS, path)
+        else:
+            pytest.importorskip('xlsxwriter')
+            StreamingExcelExporter().export(ROWS, path)
+
+        sheet = pd.read_excel(path)
+        assert list(sheet.columns) == ['name', 'price', 'url', 'store', 'category', 'stock', 'variants']
+        assert sheet['price'].tolist() == [100, 250, 30]
+        assert sheet['variants'][1] == '[{"sku": 1}]'
+
+    def test_parquet_dictionary_encodes_low_cardinality_columns(self, tmp_path):
+        pa = pytest.importorskip('pyarrow')
+        path = str(tmp_path / 'out.parquet')
+
+        create_exporter('parquet').export(ROWS, path)
+
+        table = pytest.importorskip('pyarrow.parquet').read_table(path)
+        assert pa.types.is_dictionary(table.schema.field('store').type)
+        assert pa.types.is_dictionary(table.schema.field('category').type)
+        assert table.column('price').to_pylist() == [100, 250, 30]
+        assert table.column('stock').to_pylist() == [None, 'in_stock', None]
+
+    def test_arrow_ipc(self, tmp_path):
+        pa = pytest.importorskip('pyarrow')
+        path = str(tmp_path / 'out.arrow')
+
+        create_exporter('arrow').export(ROWS, path)
+
+        with pa.OSFile(path, 'rb') as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert table.column('name').to_pylist() == ['Booster', 'Bundle', 'Sobre']
+
+    def test_arrow_formats_need_pyarrow(self, tmp_path):
+        with patch.object(export, 'pa', None):
+            with pytest.raises(ImportError, match='pyarrow'):
+                create_exporter('parquet').export(ROWS, str(tmp_path / 'out.parquet'))
+
+    def test_base_exporters_are_abstract(self):
+        with pytest.raises(TypeError):
+            export.Exporter()
+        with pytest.raises(TypeError):
+            export.ArrowTableExporter()
+
+
+class TestExportStageFormats:
+
+    def test_writes_selected_formats(self, config, tmp_path):
+        config.export_formats = ('jsonl', 'excel_stream')
+
+        result = ExportStage(Mock(spec=logging.Logger)).execute({'config': config, 'consolidated_data': ROWS})
+
+        assert result.success is True
+        assert result.stage == PipelineStage.EXPORT
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['consolidated_results.xlsx', 'prod_result.jsonl']
+
+    def test_unknown_format_fails(self, config):
+        config.export_formats = ('csv',)
+
+        result = ExportStage(Mock(spec=logging.Logger)).execute({'config': config, 'consolidated_data': ROWS})
+
+        assert result.success is False
+        assert result.error == 'Unknown export format: csv'
@@ -109,6 +109,30 @@ class TestScrapingStage:
         assert result.stage == PipelineStage.SCRAPING
         assert result.message == "Scraping completed. Found 0 scrapers"
 
+    @patch('src.pipeline.stages.scraping.ScraperManager')
+    def test_execute_starts_fresh_checkpoint(self, mock_scraper_manager_class, scraping_stage, tmp_path):
+        previous = tmp_path / 'checkpoint.jsonl'
+        previous.write_text('{"store": "s", "category": "c", "url": "u", "product": {}}\n', encoding='utf-8')
+        mock_scraper_manager_class.return_value.run_all.return_value = {}
+
+        scraping_stage.execute({'config': PipelineConfig(config_path="test/config.json", output_dir=str(tmp_path))})
+
+        checkpoint = mock_scraper_manager_class.call_args.kwargs['checkpoint']
+        assert len(checkpoint) == 0
+        assert not previous.exists()
+
+    @patch('src.pipeline.stages.scraping.ScraperManager')
+    def test_execute_resume_loads_checkpoint(self, mock_scraper_manager_class, scraping_stage, tmp_path):
+        (tmp_path / 'checkpoint.jsonl').write_text(
+            '{"store": "s", "category": "c", "url": "u", "product": {"name": "A"}}\n', encoding='utf-8')
+        mock_scraper_manager_class.return_value.run_all.return_value = {}
+        config = PipelineConfig(config_path="test/config.json", output_dir=str(tmp_path), resume=True)
+
+        scraping_stage.execute({'config': config})
+
+        checkpoint = mock_scraper_manager_class.call_args.kwargs['checkpoint']
+        assert checkpoint.get('s', 'c', 'u') == {'name': 'A'}
+
 
 class TestConsolidationStage:
 
@@ -0,0 +1,111 @@
+import datetime
+import logging
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from src.pipeline.models import PipelineConfig
+from src.pipeline.price_history import CHANGES, PriceHistory
+from src.pipeline.stages.export import ExportStage
+
+
+def product(url, price, store='store_a', name=None, game='magic'):
+    return {'name': name or url.title(), 'price': price, 'url': url, 'store': store, 'game': game,
+            'category': game, 'stock': 'in_stock'}
+
+
+def at(day, hour=10):
+    return datetime.datetime(2024, 3, day, hour, 0, 0)
+
+
+@pytest.fixture
+def history(tmp_path):
+    with PriceHistory(str(tmp_path / 'history.sqlite')) as history:
+        history.record([product('a', 100), product('b', 200)], captured_at=at(1))
+        history.record([product('a', 100), product('b', 180)], captured_at=at(2))
+        history.record([product('a', 120), product('b', 150)], captured_at=at(3))
+        yield history
+
+
+class TestPriceHistory:
+
+    def test_price_series(self, history):
+        assert history.price_series('store_a', 'b') == [
+            {'captured_at': '2024-03-01 10:00:00', 'price': 200, 'stock': 'in_stock'},
+            {'captured_at': '2024-03-02 10:00:00', 'price': 180, 'stock': 'in_stock'},
+            {'captured_at': '2024-03-03 10:00:00', 'price': 150, 'stock': 'in_stock'},
+        ]
+
+    def test_recording_a_run_twice_is_a_no_op(self, history):
+        assert history.record([product('a', 120)], captured_at=at(3)) == 0
+        assert history.record([product('a', 125)], captured_at=at(3, hour=18)) == 1
+
+    def test_changed_since(self, history):
+        changed = history.changed_since(datetime.date(2024, 3, 2))
+
+        assert changed == [
+            {'store': 'store_a', 'url': 'a', 'game': 'magic', 'name': 'A',
+             'old_price': 100, 'new_price': 120, 'changed_at': '2024-03-03 10:00:00'},
+            {'store': 'store_a', 'url': 'b', 'game': 'magic', 'name': 'B',
+             'old_price': 180, 'new_price': 150, 'changed_at': '2024-03-03 10:00:00'},
+        ]
+        assert [row['url'] for row in history.changed_since('2024-03-03 12:00:00')] == []
+        assert history.changed_since(at(3), store='store_b') == []
+
+    def test_changed_since_compares_latest_two_snapshots(self, history):
+        history.record([product('a', 120), product('b', 150)], captured_at=at(4))
+
+        assert history.changed_since(at(2)) == []
+
+    def test_changed_since_reads_recent_snapshots_through_indexes(self, history):
+        plan = [row[3] for row in history._conn.execute(
+            "EXPLAIN QUERY PLAN " + CHANGES, {'since': '2024-03-02', 'store': None})]
+
+        assert not [step for step in plan if step.startswith('SCAN price_snapshots')]
+        assert 'SEARCH price_snapshots USING PRIMARY KEY (snapshot_date>?)' in plan
+
+    def test_first_sighting_is_not_a_change(self, history):
+        history.record([product('c', 10)], captured_at=at(4))
+
+        assert 'c' not in [row['url'] for row in history.changed_since('2024-03-01')]
+
+    def test_find_across_stores(self, history):
+        history.record([product('x', 90, store='store_b', name='A')], captured_at=at(3))
+
+        assert [(row['store'], row['price']) for row in history.find('magic', 'A')] == [
+            ('store_b', 90), ('store_a', 120)]
+
+    def test_indexes(self, history):
+        indexes = {row[1]: row for row in sqlite3.connect(history.path).execute("PRAGMA index_list('price_snapshots')")}
+
+        assert {'idx_price_snapshots_store_url', 'idx_price_snapshots_game_name'} <= set(indexes)
+
+
+class TestExportStageHistory:
+
+    def test_export_appends_snapshot(self, tmp_path):
+        config = PipelineConfig(config_path='test/config.json', output_dir=str(tmp_path),
+                                export_formats=('jsonl',), history_db='history.sqlite')
+
+        result = ExportStage(Mock(spec=logging.Logger)).execute(
+            {'config': config, 'consolidated_data': [product('a', 100), product('b', 200)]})
+
+        assert result.success is True
+        assert result.message.endswith(f"2 price snapshots added to {tmp_path / 'history.sqlite'}")
+        with PriceHistory(str(tmp_path / 'history.sqlite')) as history:
+            assert [point['price'] for point in history.price_series('store_a', 'b')] == [200]
+
+    def test_export_records_a_run_once(self, tmp_path):
+        config = PipelineConfig(config_path='test/config.json', output_dir=str(tmp_path),
+                                export_formats=('jsonl',), history_db='history.sqlite')
+        context = {'config': config, 'consolidated_data': [product('a', 100)], 'started_at': at(1, hour=9)}
+        stage = ExportStage(Mock(spec=logging.Logger))
+
+        stage.execute(context)
+        result = stage.execute(context)
+
+        assert result.message.endswith(f"0 price snapshots added to {tmp_path / 'history.sqlite'}")
+        with PriceHistory(str(tmp_path / 'history.sqlite')) as history:
+            assert history.price_series('store_a', 'a') == [
+                {'captured_at': '2024-03-01 09:00:00', 'price': 100, 'stock': 'in_stock'}]
@@ -0,0 +1,153 @@
+import json
+import logging
+import pytest
+import pandas as pd
+from unittest.mock import Mock, patch
+
+import requests
+
+from src.pipeline.models import PipelineConfig, PipelineStage
+from src.pipeline.pipeline import ScraperPipeline
+from src.pipeline.stages.streaming import StreamingStage
+
+
+class FakeManager:
+    """Scrapes a fixed set of products, handing each to the sink like BaseScraper does."""
+
+    products = [
+        ('store_a', 'magic', {'name': 'Booster', 'price': 100, 'url': 'https://a.test/1'}),
+        ('store_a', 'magic', {'name': 'Bundle', 'price': 250, 'url': 'https://a.test/2', 'stock': 'in_stock'}),
+        ('store_b', 'pokemon', {'name': 'Sobre', 'price': 30, 'url': 'https://b.test/1'}),
+    ]
+
+    def __init__(self, config_path, max_workers=None, checkpoint=None, sink=None, retain_results=True,
+                 executor=None):
+        self.sink = sink
+        self.retain_results = retain_results
+
+    def run_all(self):
+        for store, category, product in self.products:
+            self.sink(store, category, dict(product))
+        return {'store_a': {'magic': []}, 'store_b': {'pokemon': []}}
+
+    def get_report(self):
+        return {'store_a': {'magic': {'total_products': 2, 'processed_products': 2, 'success_rate': 100}}}
+
+    def make_report(self):
+        pass
+
+
+@pytest.fixture
+def config(tmp_path):
+    return PipelineConfig(config_path='test/config.json', output_dir=str(tmp_path), streaming=True,
+                          post_batch_size=2, checkpoint_filename=None)
+
+
+@pytest.fixture
+def stage():
+    return StreamingStage(Mock(spec=logging.Logger))
+
+
+@patch('src.pipeline.stages.streaming.ScraperManager', FakeManager)
+class TestStreamingStage:
+
+    def test_writes_consolidated_outputs(self, stage, config, tmp_path):
+        context = {'config': config}
+
+        result = stage.execute(context)
+
+        assert result.success is True
+        rows = [json.loads(line) for line in (tmp_path / 'prod_result.jsonl').read_text(encoding='utf-8').splitlines()]
+        assert [(row['store'], row['category'], row['name']) for row in rows] == [
+            ('store_a', 'magic', 'Booster'), ('store_a', 'magic', 'Bundle'), ('store_b', 'pokemon', 'Sobre')]
+        assert json.loads((tmp_path / 'prod_result.json').read_text(encoding='utf-8')) == rows
+        sheet = pd.read_excel(tmp_path / 'consolidated_results.xlsx')
+        assert list(sheet.columns) == ['name', 'price', 'url', 'store', 'category', 'stock']
+        assert sheet['price'].tolist() == [100, 250, 30]
+        assert context['items_processed'] == 3
+
+    def test_manager_keeps_no_results(self, stage, config):
+        with patch('src.pipeline.stages.streaming.ScraperManager', wraps=FakeManager) as manager_class:
+            stage.execute({'config': config})
+
+        assert manager_class.call_args.kwargs['retain_results'] is False
+
+    @patch('src.pipeline.uploader.PooledHTTPClient')
+    def test_posts_in_batches(self, mock_client, stage, config):
+        config.api_endpoint = 'https://api.test/bulk'
+        mock_post = mock_client.return_value.post
+        mock_post.return_value = Mock(status_code=200)
+
+        result = stage.execute({'config': config})
+
+        assert result.success is True
+        assert [len(call.kwargs['json']) for call in mock_post.call_args_list] == [2, 1]
+        assert mock_post.call_args_list[0].kwargs['json'][0]['store'] == 'store_a'
+        assert result.message.endswith('sent 2 POST batches')
+
+    @patch('src.pipeline.uploader.PooledHTTPClient')
+    def test_failed_batches_fail_the_post(self, mock_client, stage, config, tmp_path):
+        config.api_endpoint = 'https://api.test/bulk'
+        config.upload_retries = 0
+        mock_post = mock_client.return_value.post
+        mock_post.side_effect = [Mock(status_code=500, text='boom'), requests.exceptions.ConnectionError('down')]
+
+        result = stage.execute({'config': config})
+
+        assert result.success is False
+        assert result.stage == PipelineStage.POST_REQUEST
+        assert result.error == "2 of 2 POST batches failed: POST request failed: 500 - boom"
+        assert (tmp_path / 'consolidated_results.xlsx').exists()
+
+    def test_empty_run(self, stage, config, tmp_path):
+        with patch.object(FakeManager, 'products', []):
+            result = stage.execute({'config': config})
+
+        assert result.success is True
+        assert json.loads((tmp_path / 'prod_result.json').read_text(encoding='utf-8')) == []
+        assert list(pd.read_excel(tmp_path / 'consolidated_results.xlsx').columns) == [
+            "name", "price", "url", "store", "category", "timestamp"]
+
+    def test_pipeline_uses_streaming_stages(self, config):
+        pipeline = ScraperPipeline(config)
+
+        assert [stage.stage_name for stage in pipeline.stages] == ['Initialization', 'Streaming', 'Cleanup']
+
+        summary = pipeline.run()
+
+        assert summary['total_items_processed'] == 3
+
+    @patch('src.pipeline.uploader.PooledHTTPClient')
+    def test_delta_upload_skips_unchanged(self, mock_client, stage, config):
+        config.api_endpoint = 'https://api.test/bulk'
+        config.delta_upload = True
+        mock_post = mock_client.return_value.post
+        mock_post.return_value = Mock(status_code=200)
+        stage.execute({'config': config})
+        first_run = mock_post.call_count
+
+        result = stage.execute({'config': config})
+
+        assert first_run == 2
+        assert mock_post.call_count == first_run
+        assert result.message.endswith('sent 0 POST batches')
+
+    @patch('src.pipeline.uploader.PooledHTTPClient')
+    def test_spooled_batches_are_replayed_first(self, mock_client, stage, config, tmp_path):
+        config.api_endpoint = 'https://api.test/bulk'
+        config.upload_retries = 0
+        config.upload_spool_dir = 'spool'
+        mock_post = mock_client.return_value.post
+        mock_post.return_value = Mock(status_code=503, text='down')
+        stage.execute({'config': config})
+        assert len(list((tmp_path / 'spool').iterdir())) == 2
+
+        mock_post.reset_mock()
+        mock_post.return_value = Mock(status_code=200)
+        result = stage.execute({'config': config})
+
+        assert result.success is True
+        sizes = [len(call.kwargs['json']) for call in mock_post.call_args_list]
+        assert sorted(sizes[:2]) == [1, 2] and sizes[2:] == [2, 1]
+        assert result.message.endswith('sent 2 POST batches, 2 spooled chunks replayed')
+        assert list((tmp_path / 'spool').iterdir()) == []
@@ -0,0 +1,134 @@
+import gzip
+import json
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.pipeline.models import PipelineConfig, PipelineStage
+from src.pipeline.stages.post_request import PostRequestStage
+from src.pipeline.uploader import BulkUploader
+
+
+def rows(count):
+    return [{'name': f'Product {i}', 'price': i} for i in range(count)]
+
+
+@pytest.fixture
+def config(tmp_path):
+    return PipelineConfig(config_path='test/config.json', output_dir=str(tmp_path),
+                          api_endpoint='https://api.test/bulk', upload_backoff=0)
+
+
+@pytest.fixture
+def uploader(config):
+    return BulkUploader(config, Mock(spec=logging.Logger))
+
+
+class TestBulkUploader:
+
+    def test_chunks(self, uploader, config):
+        assert uploader.chunks(rows(5)) == [rows(5)]
+
+        config.upload_chunk_size = 2
+        assert [len(chunk) for chunk in uploader.chunks(rows(5))] == [2, 2, 1]
+
+    def test_single_chunk_uses_injected_post(self, config):
+        post = Mock(return_value=Mock(status_code=200))
+
+        results = BulkUploader(config, Mock(spec=logging.Logger), post=post).upload(rows(3))
+
+        assert [result.ok for result in results] == [True]
+        assert post.call_args.kwargs['json'] == rows(3)
+        assert post.call_args.kwargs['timeout'] == config.request_timeout
+
+    def test_gzip_body(self, uploader, config):
+        config.upload_gzip = True
+        post = Mock(return_value=Mock(status_code=200))
+
+        uploader.send(0, rows(2), post)
+
+        kwargs = post.call_args.kwargs
+        assert kwargs['headers']['Content-Encoding'] == 'gzip'
+        assert kwargs['headers']['Content-Type'] == 'application/json'
+        assert json.loads(gzip.decompress(kwargs['data'])) == rows(2)
+        assert 'json' not in kwargs
+
+    def test_retries_retryable_status(self, uploader):
+        post = Mock(side_effect=[Mock(status_code=503, text='busy'),
+                                 requests.exceptions.ConnectionError('reset'),
+                                 Mock(status_code=200)])
+
+        result = uploader.send(0, rows(1), post)
+
+        assert result.ok is True
+        assert result.attempts == 3
+        assert result.status_code == 200
+
+    def test_does_not_retry_client_error(self, uploader):
+        post = Mock(return_value=Mock(status_code=400, text='bad payload'))
+
+        result = uploader.send(0, rows(1), post)
+
+        assert result.error == "POST request failed: 400 - bad payload"
+        assert result.attempts == 1
+        assert result.spooled is None
+
+    def test_spools_and_replays_failed_chunk(self, uploader, config, tmp_path):
+        config.upload_retries = 0
+        uploader.spool_dir = str(tmp_path / 'spool')
+        failing = Mock(side_effect=requests.exceptions.ConnectionError('down'))
+
+        result = uploader.send(0, rows(2), failing)
+
+        assert result.error == "Request error: down"
+        with gzip.open(result.spooled, 'rt', encoding='utf-8') as f:
+            assert json.load(f) == rows(2)
+
+        with patch.object(uploader, '_pooled_post', return_value=Mock(return_value=Mock(status_code=200))):
+            replayed = uploader.replay_spool()
+
+        assert [(chunk.ok, chunk.items, chunk.replayed_from) for chunk in replayed] == [(True, 2, result.spooled)]
+        assert list((tmp_path / 'spool').iterdir()) == []
+
+    def test_concurrent_chunks_share_pooled_client(self, uploader, config):
+        config.upload_chunk_size = 2
+        config.upload_concurrency = 3
+        post = Mock(return_value=Mock(status_code=200))
+
+        with patch.object(uploader, '_pooled_post', return_value=post):
+            results = uploader.upload(rows(5))
+
+        assert [(result.chunk, result.items) for result in results] == [(0, 2), (1, 2), (2, 1)]
+        sent = sorted(item['price'] for call in post.call_args_list for item in call.kwargs['json'])
+        assert sent == list(range(5))
+
+
+class TestPostRequestStageChunks:
+
+    @patch('src.pipeline.uploader.PooledHTTPClient')
+    def test_reports_failed_chunks(self, mock_client, config):
+        config.upload_chunk_size = 2
+        config.upload_retries = 0
+        mock_client.return_value.post.side_effect = [Mock(status_code=200), Mock(status_code=422, text='invalid')]
+
+        result = PostRequestStage(Mock(spec=logging.Logger)).execute(
+            {'config': config, 'consolidated_data': rows(4)})
+
+        assert result.success is False
+        assert result.stage == PipelineStage.POST_REQUEST
+        assert result.error == "1 of 2 chunks failed: POST request failed: 422 - invalid"
+        assert [chunk['status_code'] for chunk in result.data['chunks']] == [200, 422]
+        mock_client.return_value.close.assert_called_once()
+
+    @patch('src.pipeline.uploader.PooledHTTPClient')
+    def test_chunked_success(self, mock_client, config):
+        config.upload_chunk_size = 2
+        mock_client.return_value.post.return_value = Mock(status_code=200)
+
+        result = PostRequestStage(Mock(spec=logging.Logger)).execute(
+            {'config': config, 'consolidated_data': rows(3)})
+
+        assert result.success is True
+        assert result.message == "POST request successful: 2 chunks, 3 items"
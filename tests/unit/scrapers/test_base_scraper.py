@@ -8,6 +8,7 @@ import pandas as pd
 
 from src.core.base_scraper import BaseScraper
 from src.core.category import Category
+from src.core.fetch_strategy import StaticFirstStrategy
 
 
 class ConcreteScraper(BaseScraper):
@@ -21,6 +22,20 @@ class ConcreteScraper(BaseScraper):
         return {'title': 'Test Product', 'price': '$10', 'url': url}
 
 
+class ListingScraper(ConcreteScraper):
+    page = ''
+
+    def navigate_to_category(self, category):
+        return BeautifulSoup(self.page, 'html.parser')
+
+    def extract_product_urls(self, soup, category):
+        urls = []
+        for link in self.find_elements(soup, 'a.product-link'):
+            self.remember_listing_element(link, link.get('href'), category)
+            urls.append((self.get_text(link), link.get('href')))
+        return urls
+
+
 class TestBaseScraper:
 
     @pytest.fixture
@@ -90,6 +105,19 @@ class TestBaseScraper:
             scraper.setup()
 
         assert scraper.batch_size == 4
+        assert scraper.max_concurrency == 1
+
+    def test_setup_reads_host_rates(self, scraper_config):
+        scraper_config['requests_per_second'] = 2
+        scraper_config['host_requests_per_second'] = {'CDN.example.com': 10}
+        scraper = ConcreteScraper('test', scraper_config)
+
+        with patch('src.core.base_scraper.RequestsHTMLSession'):
+            scraper.setup()
+
+        assert scraper.rate_limiter.bucket_for('cdn.example.com').rate == 10
+        assert scraper.rate_limiter.bucket_for('shop.example.com').rate == 2
+        scraper.teardown()
 
     def test_teardown(self, concrete_scraper):
         mock_session = Mock()
@@ -227,6 +255,13 @@ class TestBaseScraper:
 
         assert len(elements) >= 0
 
+    def test_find_elements_native_xpath(self, concrete_scraper):
+        soup = BeautifulSoup('<p>Antes</p><p>Ahora $10</p><b>Ahora</b>', 'html.parser')
+
+        elements = concrete_scraper.find_elements(soup, '//p[contains(., "Ahora")] | //b', 'xpath')
+
+        assert [concrete_scraper.get_text(element) for element in elements] == ['Ahora $10', 'Ahora']
+
     @patch('src.utils.css_contain_adapter.StockChecker.is_out_of_stock')
     def test_check_stock_in_stock(self, mock_stock_checker, concrete_scraper):
         mock_stock_checker.return_value = False
@@ -254,20 +289,6 @@ class TestBaseScraper:
 
         assert result == 'unknown'
 
-    def test_xpath_to_css(self, concrete_scraper):
-        xpath = '//div[@class="test"]'
-
-        result = concrete_scraper._xpath_to_css(xpath)
-
-        assert 'div' in result
-
-    def test_xpath_to_css_non_xpath(self, concrete_scraper):
-        css = 'div.test'
-
-        result = concrete_scraper._xpath_to_css(css)
-
-        assert result == css
-
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.makedirs')
     def test_save_screenshot(self, mock_makedirs, mock_file, concrete_scraper):
@@ -388,3 +409,402 @@ class TestBaseScraper:
 
         assert result == {}
         mock_teardown.assert_called_once()
+
+    @patch.object(ConcreteScraper, 'teardown')
+    @patch.object(ConcreteScraper, 'extract_product_urls')
+    @patch.object(ConcreteScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_concurrent_keeps_order(self, mock_session, mock_process, mock_extract, mock_teardown, scraper_config):
+        scraper_config['max_concurrency'] = 3
+        scraper_config['batch_size'] = 10
+        scraper = ConcreteScraper('test', scraper_config)
+        mock_extract.return_value = [(f'Product {i}', f'https://test.com/{i}') for i in range(6)]
+        mock_process.side_effect = lambda url, category: {} if url.endswith('/2') else {'price': url[-1]}
+
+        result = scraper.run()
+
+        names = [product['name'] for product in result['test_category']]
+        assert names == ['Product 0', 'Product 1', 'Product 3', 'Product 4', 'Product 5']
+        assert scraper.report['test_category']['total_products'] == 6
+        assert scraper.report['test_category']['processed_products'] == 5
+        assert mock_session.call_count >= 2
+
+    @patch('src.core.base_scraper.AsyncPlaywrightSession')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_setup_async_engine(self, mock_sync_session, mock_async_session, scraper_config):
+        scraper_config['engine'] = 'async'
+        scraper_config['page_pool_size'] = 6
+        scraper = ConcreteScraper('test', scraper_config)
+
+        scraper.setup()
+
+        assert scraper.session == mock_async_session.return_value
+        assert mock_async_session.call_args.kwargs['pool_size'] == 6
+        mock_sync_session.assert_not_called()
+
+    def test_get_page_static_first_uses_static_html(self, scraper_config):
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.fetch_strategy = StaticFirstStrategy('test')
+        scraper._local.category = scraper.categories[0]
+        mock_session = Mock()
+        mock_session.get.return_value = BeautifulSoup(
+            '<html><body><h1 class="title">Card</h1><span class="price">$10</span></body></html>', 'html.parser')
+        scraper.session = mock_session
+
+        scraper.get_page('https://test.com/product')
+
+        mock_session.get.assert_called_once_with('https://test.com/product', wait_for=None, render_js=False)
+
+    def test_get_page_static_first_falls_back_to_render(self, scraper_config):
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.fetch_strategy = StaticFirstStrategy('test', probe_limit=1)
+        scraper._local.category = scraper.categories[0]
+        rendered = BeautifulSoup('<html><body><h1 class="title">Card</h1><span class="price">$10</span></body></html>', 'html.parser')
+        mock_session = Mock()
+        mock_session.get.side_effect = [BeautifulSoup('<html><body></body></html>', 'html.parser'), rendered]
+        scraper.session = mock_session
+
+        result = scraper.get_page('https://test.com/category', wait_for='a.product-link')
+
+        assert result is rendered
+        mock_session.get.assert_called_with('https://test.com/category', wait_for='a.product-link')
+        assert scraper.fetch_strategy.decision('category') == StaticFirstStrategy.RENDER
+
+    def test_get_page_waits_for_key_selectors(self, scraper_config):
+        scraper_config['categories']['test_category']['selectors']['title_selector'] = "//h1[@class='title']"
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper._local.category = scraper.categories[0]
+        scraper.session = Mock()
+
+        scraper.get_page('https://test.com/product')
+        scraper.get_page('https://test.com/category')
+
+        assert [call.kwargs['wait_for'] for call in scraper.session.get.call_args_list] == ['.price', 'a.product-link']
+
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_sessions_share_readiness_waiter(self, mock_session, scraper_config):
+        scraper = ConcreteScraper('test', scraper_config)
+
+        scraper.setup()
+        scraper._init_worker_session()
+
+        waiters = [call.kwargs['readiness'] for call in mock_session.call_args_list]
+        assert len(waiters) == 2 and waiters[0] is waiters[1] is scraper.readiness
+
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_resource_policy_from_config(self, mock_session, scraper_config):
+        scraper_config['resource_policy'] = {'third_party_scripts': False, 'allow_hosts': ['cdn.test.net']}
+        scraper = ConcreteScraper('test', scraper_config)
+
+        scraper.setup()
+
+        policy = mock_session.call_args.kwargs['resource_policy']
+        assert policy.first_party == ('test.com',)
+        assert policy.allows('https://cdn.test.net/app.js', 'script') is True
+        assert policy.allows('https://widgets.other.net/chat.js', 'script') is False
+
+    @staticmethod
+    def listing(*cards):
+        return ''.join(f'<div class="card"><a class="product-link" href="https://test.com/{slug}">{title}</a>'
+                       f'{price and f"<span class=price>{price}</span>"}</div>' for slug, title, price in cards)
+
+    @patch.object(ListingScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_incremental_carries_unchanged_products(self, mock_session, mock_process, scraper_config, tmp_path):
+        scraper_config['incremental'] = True
+        scraper_config['index_path'] = str(tmp_path / 'index.json')
+        scraper_config['batch_size'] = 10
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+
+        ListingScraper.page = self.listing(('a', 'Product A', '$10'), ('b', 'Product B', '$20'))
+        first = ListingScraper('test', scraper_config).run()
+        assert mock_process.call_count == 2
+        assert len(first['test_category']) == 2
+
+        ListingScraper.page = self.listing(('a', 'Product A', '$10'), ('b', 'Product B v2', '$20'))
+        scraper = ListingScraper('test', scraper_config)
+        second = scraper.run()
+
+        assert mock_process.call_count == 3
+        assert [p['name'] for p in second['test_category']] == ['Product A', 'Product B v2']
+        assert second['test_category'][0]['price'] == 10
+        assert scraper.listing_metadata['https://test.com/a'] == {'price': '$10'}
+        assert scraper.report['test_category']['processed_products'] == 2
+        assert scraper.report['test_category']['carried_forward'] == 1
+
+    @patch.object(ListingScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_incremental_refetches_on_listing_price_change(self, mock_session, mock_process, scraper_config,
+                                                               tmp_path):
+        scraper_config['incremental'] = True
+        scraper_config['index_path'] = str(tmp_path / 'index.json')
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+
+        ListingScraper.page = self.listing(('a', 'Product A', '$10'), ('b', 'Product B', '$20'))
+        ListingScraper('test', scraper_config).run()
+        ListingScraper.page = self.listing(('a', 'Product A', '$12'), ('b', 'Product B', '$20'))
+        scraper = ListingScraper('test', scraper_config)
+        scraper.run()
+
+        assert [c.args[0] for c in mock_process.call_args_list[2:]] == ['https://test.com/a']
+        assert scraper.report['test_category']['carried_forward'] == 1
+
+    @patch.object(ListingScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_incremental_needs_listing_price_and_fresh_record(self, mock_session, mock_process, scraper_config,
+                                                                  tmp_path):
+        scraper_config['incremental'] = True
+        scraper_config['index_path'] = str(tmp_path / 'index.json')
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+
+        ListingScraper.page = self.listing(('a', 'Product A', ''), ('b', 'Product B', '$20'))
+        for _ in range(2):
+            ListingScraper('test', scraper_config).run()
+        assert mock_process.call_count == 3
+
+        scraper_config['index_max_age'] = 0
+        ListingScraper('test', scraper_config).run()
+        assert mock_process.call_count == 5
+
+    @patch.object(ListingScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_report_marks_truncated_listing_and_failed_products(self, mock_session, mock_process, scraper_config):
+        ListingScraper.page = self.listing(('a', 'Product A', '$10'), ('b', 'Product B', '$20'),
+                                           ('c', 'Product C', '$30'))
+        mock_process.side_effect = lambda url, category: None if url.endswith('/b') else {'price': '$10'}
+
+        scraper_config['batch_size'] = 2
+        scraper = ListingScraper('test', scraper_config)
+        scraper.run()
+        assert scraper.report['test_category']['listing_complete'] is False
+
+        scraper_config['batch_size'] = 3
+        scraper = ListingScraper('test', scraper_config)
+        scraper.run()
+        assert scraper.report['test_category']['listing_complete'] is True
+        assert scraper.report['test_category']['failed_urls'] == ['https://test.com/b']
+
+    @patch.object(ConcreteScraper, 'navigate_to_category')
+    @patch.object(ConcreteScraper, 'process_product')
+    @patch('src.core.base_scraper.PooledHTTPClient')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_streams_listing_page(self, mock_session, mock_client, mock_process, mock_navigate, scraper_config):
+        mock_client.return_value.metrics.return_value = {'requests': 1, 'connections_opened': 1, 'reuse_ratio': 0.0}
+        scraper_config['stream_listings'] = True
+        scraper_config['batch_size'] = 2
+        scraper_config['categories']['test_category']['selectors']['product_selector'] = 'div.card'
+        page = b''.join(b'<div class="card"><a class="product-link" href="/p/%d">Product %d</a>'
+                        b'<img src="/i/%d.png"></div>' % (i, i, i) for i in range(3))
+        response = mock_client.return_value.get.return_value
+        response.iter_content.return_value = [page[:40], page[40:]]
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+        scraper = ConcreteScraper('test', scraper_config)
+
+        result = scraper.run()
+
+        mock_client.return_value.get.assert_called_once_with('https://test.com/category', stream=True)
+        mock_navigate.assert_not_called()
+        assert [p['url'] for p in result['test_category']] == ['https://test.com/p/0', 'https://test.com/p/1']
+        assert scraper.listing_metadata['https://test.com/p/1'] == {'image': 'https://test.com/i/1.png'}
+        assert scraper.report['test_category']['total_products'] == 2
+        response.close.assert_called_once()
+
+    @patch.object(ConcreteScraper, 'process_product')
+    @patch('src.core.base_scraper.PooledHTTPClient')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_stream_falls_back_to_parsed_page(self, mock_session, mock_client, mock_process, scraper_config):
+        mock_client.return_value.metrics.return_value = {'requests': 1, 'connections_opened': 1, 'reuse_ratio': 0.0}
+        scraper_config['stream_listings'] = True
+        mock_client.return_value.get.return_value.iter_content.return_value = [b'<html><body></body></html>']
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+
+        result = ConcreteScraper('test', scraper_config).run()
+
+        assert [p['url'] for p in result['test_category']] == ['https://test.com/product']
+
+    def test_listing_extractor_requires_streamable_selectors(self, scraper_config):
+        scraper_config['stream_listings'] = True
+        scraper_config['categories']['test_category']['selectors']['urls_selector'] = 'div.card a'
+        scraper = ConcreteScraper('test', scraper_config)
+
+        assert scraper._listing_extractor(scraper.categories[0]) is None
+
+    @patch.object(ConcreteScraper, 'get_page')
+    @patch.object(ConcreteScraper, 'extract_product_urls')
+    @patch.object(ConcreteScraper, 'navigate_to_category')
+    def test_collect_product_urls_fetches_announced_pages(self, mock_navigate, mock_extract, mock_get_page, scraper_config):
+        scraper_config['batch_size'] = 100
+        scraper_config['categories']['test_category']['pagination'] = {
+            'page_param': 'page', 'last_page_selector': 'nav a', 'max_pages': 3}
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.batch_size = 100
+        mock_navigate.return_value = BeautifulSoup('<nav><a>1</a><a>2</a><a>9</a></nav>', 'html.parser')
+        mock_get_page.side_effect = lambda url, wait_for=None: url
+        mock_extract.side_effect = lambda soup, category: {
+            'https://test.com/category?page=2': [('B', 'https://test.com/b'), ('A', 'https://test.com/a')],
+            'https://test.com/category?page=3': [('C', 'https://test.com/c')],
+        }.get(soup, [('A', 'https://test.com/a')])
+
+        product_urls = scraper._collect_product_urls(scraper.categories[0])
+
+        assert product_urls == [('A', 'https://test.com/a'), ('B', 'https://test.com/b'), ('C', 'https://test.com/c')]
+        assert sorted(call.args[0] for call in mock_get_page.call_args_list) == [
+            'https://test.com/category?page=2', 'https://test.com/category?page=3']
+        assert scraper._page_type('https://test.com/category?page=3') == 'category'
+        # 9 pages announced, max_pages stopped at 3.
+        assert scraper._incomplete_listings == {'test_category'}
+
+    @patch.object(ConcreteScraper, 'process_product')
+    @patch.object(ConcreteScraper, 'get_page')
+    @patch.object(ConcreteScraper, 'extract_product_urls')
+    @patch.object(ConcreteScraper, 'navigate_to_category')
+    def test_listing_capped_by_max_pages_is_incomplete(self, mock_navigate, mock_extract, mock_get_page,
+                                                       mock_process, scraper_config):
+        scraper_config['batch_size'] = 100
+        pagination = {'page_param': 'page', 'last_page_selector': 'nav a', 'max_pages': 2}
+        scraper_config['categories']['test_category']['pagination'] = pagination
+        mock_get_page.side_effect = lambda url, wait_for=None: url
+        mock_extract.side_effect = lambda soup, category: [
+            (f'P{i}', f'{soup if isinstance(soup, str) else "page1"}/{i}') for i in range(2)]
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+
+        mock_navigate.return_value = BeautifulSoup('<nav><a>1</a><a>5</a></nav>', 'html.parser')
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.run()
+        assert scraper.report['test_category']['total_products'] == 4
+        assert scraper.report['test_category']['listing_complete'] is False
+
+        mock_navigate.return_value = BeautifulSoup('<nav><a>1</a><a>2</a></nav>', 'html.parser')
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.run()
+        assert scraper.report['test_category']['listing_complete'] is True
+
+    @patch.object(ConcreteScraper, 'get_page')
+    @patch.object(ConcreteScraper, 'extract_product_urls')
+    @patch.object(ConcreteScraper, 'navigate_to_category')
+    def test_collect_product_urls_stops_on_page_without_new_products(self, mock_navigate, mock_extract,
+                                                                     mock_get_page, scraper_config):
+        scraper_config['categories']['test_category']['pagination'] = {'page_param': 'page'}
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.batch_size = 100
+        pages = {
+            'https://test.com/category?page=2': [('B', 'https://test.com/b')],
+            'https://test.com/category?page=3': [('B', 'https://test.com/b')],
+        }
+        mock_get_page.side_effect = lambda url, wait_for=None: url
+        mock_extract.side_effect = lambda soup, category: pages.get(soup, [('A', 'https://test.com/a')])
+
+        product_urls = scraper._collect_product_urls(scraper.categories[0])
+
+        assert [url for _, url in product_urls] == ['https://test.com/a', 'https://test.com/b']
+        assert mock_get_page.call_count == 2
+
+    @patch.object(ConcreteScraper, 'get_page')
+    def test_collect_product_urls_without_pagination(self, mock_get_page, concrete_scraper):
+        product_urls = concrete_scraper._collect_product_urls(concrete_scraper.categories[0])
+
+        assert product_urls == [('Test Product', 'https://test.com/product')]
+        mock_get_page.assert_not_called()
+
+    def test_invalid_pagination_is_ignored(self, scraper_config):
+        scraper_config['categories']['test_category']['pagination'] = {'max_pages': 2}
+
+        scraper = ConcreteScraper('test', scraper_config)
+
+        assert scraper.categories[0].pagination is None
+
+    @patch.object(ConcreteScraper, 'navigate_to_category')
+    @patch('src.core.base_scraper.create_api_source')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_reads_catalog_api(self, mock_session, mock_create_source, mock_navigate, scraper_config):
+        from src.api_sources import CategoryRecords
+        scraper_config['api_source'] = 'shopify'
+        mock_create_source.return_value.fetch_category.return_value = CategoryRecords([
+            {'name': 'Booster Box', 'url': 'https://test.com/products/box', 'price': '12990',
+             'stock': 'in_stock', 'description': '', 'img_url': ''},
+        ], complete=True)
+        scraper = ConcreteScraper('test', scraper_config)
+
+        result = scraper.run()
+
+        mock_create_source.return_value.fetch_category.assert_called_once_with('https://test.com/category', limit=4)
+        mock_navigate.assert_not_called()
+        product = result['test_category'][0]
+        assert (product['name'], product['price'], product['product_type']) == ('Booster Box', 12990, 'booster')
+        assert scraper.report['test_category']['source'] == 'api'
+        assert scraper.report['test_category']['listing_complete'] is True
+
+    @patch('src.core.base_scraper.create_api_source')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_partial_catalog_api_listing_is_incomplete(self, mock_session, mock_create_source, scraper_config):
+        from src.api_sources import CategoryRecords
+        scraper_config['api_source'] = 'shopify'
+        # e.g. page 2 failed: a short list that is not the end of the catalog.
+        mock_create_source.return_value.fetch_category.return_value = CategoryRecords([
+            {'name': 'Booster Box', 'url': 'https://test.com/products/box', 'price': '12990',
+             'stock': 'in_stock', 'description': '', 'img_url': ''},
+        ], complete=False)
+        scraper = ConcreteScraper('test', scraper_config)
+
+        scraper.run()
+
+        assert scraper.report['test_category']['total_products'] == 1
+        assert scraper.report['test_category']['listing_complete'] is False
+
+    @patch('src.core.base_scraper.create_api_source')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_falls_back_to_html_when_api_unavailable(self, mock_session, mock_create_source, scraper_config):
+        from src.api_sources import ApiSourceUnavailable
+        scraper_config['api_source'] = 'shopify'
+        mock_create_source.return_value.fetch_category.side_effect = ApiSourceUnavailable('HTTP 404')
+        scraper = ConcreteScraper('test', scraper_config)
+
+        result = scraper.run()
+
+        assert [p['url'] for p in result['test_category']] == ['https://test.com/product']
+        assert 'source' not in scraper.report['test_category']
+
+    @patch.object(ConcreteScraper, 'extract_product_urls')
+    @patch.object(ConcreteScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_resumes_from_checkpoint(self, mock_session, mock_process, mock_extract, scraper_config, tmp_path):
+        from src.core.checkpoint import CheckpointStore
+        scraper_config['batch_size'] = 10
+        scraper_config['categories']['done_category'] = {'url': 'https://test.com/done', 'selectors': {}}
+        checkpoint = CheckpointStore(str(tmp_path / 'checkpoint.jsonl'))
+        checkpoint.record('test', 'test_category', 'https://test.com/a', {'name': 'Product A', 'price': 7})
+        checkpoint.record('test', 'done_category', 'https://test.com/d', {'name': 'Product D', 'price': 9})
+        checkpoint.complete('test', 'done_category')
+        checkpoint.close()
+        mock_extract.return_value = [('Product A', 'https://test.com/a'), ('Product B', 'https://test.com/b')]
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.checkpoint = CheckpointStore(checkpoint.path).load()
+
+        result = scraper.run()
+
+        mock_process.assert_called_once_with('https://test.com/b', scraper.categories[0])
+        assert [p['price'] for p in result['test_category']] == [7, 10]
+        assert result['done_category'] == [{'name': 'Product D', 'price': 9}]
+        assert scraper.report['test_category']['resumed'] == 1
+        assert scraper.checkpoint.is_complete('test', 'test_category')
+        scraper.checkpoint.close()
+        assert CheckpointStore(checkpoint.path).load().get('test', 'test_category', 'https://test.com/b')['price'] == 10
+
+    @patch.object(ConcreteScraper, 'extract_product_urls')
+    @patch.object(ConcreteScraper, 'process_product')
+    @patch('src.core.base_scraper.RequestsHTMLSession')
+    def test_run_hands_products_to_sink(self, mock_session, mock_process, mock_extract, scraper_config):
+        scraper_config['batch_size'] = 10
+        mock_extract.return_value = [('Product A', 'https://test.com/a'), ('Product B', 'https://test.com/b')]
+        mock_process.side_effect = lambda url, category: {'price': '$10'}
+        scraper = ConcreteScraper('test', scraper_config)
+        scraper.sink = Mock()
+        scraper.retain_results = False
+
+        result = scraper.run()
+
+        assert [call.args[:2] for call in scraper.sink.call_args_list] == [('test', 'test_category')] * 2
+        assert [call.args[2]['name'] for call in scraper.sink.call_args_list] == ['Product A', 'Product B']
+        assert result['test_category'] == []
+        assert scraper.report['test_category']['processed_products'] == 2
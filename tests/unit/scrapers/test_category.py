@@ -50,3 +50,15 @@ class TestCategory:
         assert category.name == 'yugioh'
         assert category.url == 'https://example.com/yugioh'
         assert category.selectors == selectors
+
+    def test_selectors_are_precompiled(self):
+        selectors = {
+            'price_selector': "//span[@class='price'] | //span[@class='sale']",
+            'title_selector': 'h1.title',
+            'description_selector': '',
+        }
+        category = Category('pokemon', 'https://example.com/pokemon', selectors)
+
+        assert set(category.compiled_selectors) == {'price_selector', 'title_selector'}
+        assert category.compiled_selectors['price_selector'].kind == 'xpath'
+        assert category.compiled_selectors['title_selector'].kind == 'css'
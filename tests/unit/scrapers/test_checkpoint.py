@@ -0,0 +1,71 @@
+import json
+
+from src.core.checkpoint import CheckpointStore
+
+
+class TestCheckpointStore:
+
+    def test_records_survive_reload(self, tmp_path):
+        path = tmp_path / 'run' / 'checkpoint.jsonl'
+        store = CheckpointStore(str(path))
+        store.record('shop', 'magic', 'https://shop.test/a', {'name': 'A', 'price': 10})
+        store.record('shop', 'magic', 'https://shop.test/b', {'name': 'B', 'price': 20})
+        store.complete('shop', 'pokemon')
+        store.close()
+
+        reloaded = CheckpointStore(str(path)).load()
+
+        assert len(reloaded) == 2
+        assert list(reloaded.products('shop', 'magic')) == ['https://shop.test/a', 'https://shop.test/b']
+        assert reloaded.get('shop', 'magic', 'https://shop.test/b') == {'name': 'B', 'price': 20}
+        assert reloaded.is_complete('shop', 'pokemon')
+        assert not reloaded.is_complete('shop', 'magic')
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        path = tmp_path / 'checkpoint.jsonl'
+        line = json.dumps({'store': 'shop', 'category': 'magic', 'url': 'u1', 'product': {'name': 'A'}})
+        path.write_text(line + '\n' + line[:25], encoding='utf-8')
+
+        store = CheckpointStore(str(path)).load()
+
+        assert store.get('shop', 'magic', 'u1') == {'name': 'A'}
+        assert len(store) == 1
+
+    def test_nothing_written_until_first_record(self, tmp_path):
+        path = tmp_path / 'checkpoint.jsonl'
+        store = CheckpointStore(str(path)).load()
+
+        store.clear()
+        store.close()
+
+        assert not path.exists()
+
+    def test_clear_drops_previous_run(self, tmp_path):
+        path = tmp_path / 'checkpoint.jsonl'
+        store = CheckpointStore(str(path))
+        store.record('shop', 'magic', 'u1', {'name': 'A'})
+
+        store.clear()
+
+        assert not path.exists()
+        assert store.get('shop', 'magic', 'u1') is None
+
+    def test_get_returns_a_copy(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / 'checkpoint.jsonl'))
+        store.record('shop', 'magic', 'u1', {'name': 'A'})
+        store.close()
+        store = CheckpointStore(store.path).load()
+
+        store.get('shop', 'magic', 'u1')['name'] = 'changed'
+
+        assert store.get('shop', 'magic', 'u1') == {'name': 'A'}
+
+    def test_records_keep_only_urls_in_memory(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / 'checkpoint.jsonl'))
+
+        store.record('shop', 'magic', 'u1', {'name': 'A', 'description': 'x' * 1000})
+
+        assert ('shop', 'magic', 'u1') in store
+        assert len(store) == 1
+        assert store.get('shop', 'magic', 'u1') is None
+        assert store.products('shop', 'magic') == {}
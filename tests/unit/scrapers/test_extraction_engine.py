@@ -0,0 +1,121 @@
+import os
+import pytest
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+
+from src.core.extraction_engine import ExtractionEngine, FieldRule
+from src.utils.compiled_selectors import DocumentIndex, compile_selector, subject_keys
+from src.utils.html_parser import parse_html
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'saved_html', 'debug_page.html')
+
+HTML = '''
+<html><body>
+  <div class="gallery"><img src=""><img src="/a.png"></div>
+  <h1>Booster Box</h1>
+  <div class="price"><span>$ 10</span><span>Ahora $ 8</span></div>
+  <select><option>Inglés</option><option>Español</option></select>
+  <blockquote><ul><li>Uno</li></ul><ul><li>Dos</li></ul></blockquote>
+</body></html>
+'''
+
+
+def rule(field, *selectors, many=False):
+    return FieldRule(field, tuple(compile_selector(selector) for selector in selectors), many=many)
+
+
+class TestExtractionEngine:
+
+    @pytest.fixture
+    def soup(self):
+        return BeautifulSoup(HTML, 'html.parser')
+
+    def test_first_match_per_field_with_provenance(self, soup):
+        engine = ExtractionEngine([
+            rule('name', 'h2.title', 'h1'),
+            rule('price', "div.price span:contains('ahora')"),
+            rule('image', ".gallery img[src]:not([src=''])"),
+        ])
+
+        result = engine.extract(soup)
+
+        assert result.first('name').get_text() == 'Booster Box'
+        assert result.provenance['name'] == 'h1'
+        assert result.first('price').get_text() == 'Ahora $ 8'
+        assert result.first('image')['src'] == '/a.png'
+
+    def test_many_keeps_all_matches(self, soup):
+        result = ExtractionEngine([rule('language', 'select option', many=True)]).extract(soup)
+
+        assert [el.get_text() for el in result['language']] == ['Inglés', 'Español']
+
+    def test_comma_parts_keep_selector_order(self, soup):
+        result = ExtractionEngine([rule('mixed', 'select option, h1', many=True),
+                                   rule('single', 'select option, h1')]).extract(soup)
+
+        assert [el.get_text() for el in result['mixed']] == ['Inglés', 'Español', 'Booster Box']
+        assert result.first('single').get_text() == 'Inglés'
+
+    def test_unmatched_field(self, soup):
+        result = ExtractionEngine([rule('stock', 'p.stock')]).extract(soup)
+
+        assert result['stock'] == []
+        assert 'stock' not in result.provenance
+
+    def test_xpath_rules_fall_back_to_select(self, soup):
+        result = ExtractionEngine([rule('price', '//span[contains(., "Ahora")]'), rule('name', 'h1')]).extract(soup)
+
+        assert result.first('price').get_text() == 'Ahora $ 8'
+        assert result.first('name').get_text() == 'Booster Box'
+
+    def test_non_soup_documents(self):
+        document = parse_html(HTML, 'lxml.html')
+
+        result = ExtractionEngine([rule('name', 'h1'), rule('language', 'option', many=True)]).extract(document)
+
+        assert result.first('name').get_text() == 'Booster Box'
+        assert len(result['language']) == 2
+
+    def test_document_is_indexed_once(self, soup):
+        engine = ExtractionEngine([rule('name', 'h1'), rule('price', 'div.price span'),
+                                   rule('language', 'option', many=True)])
+
+        with patch('src.core.extraction_engine.DocumentIndex', wraps=DocumentIndex) as index:
+            result = engine.extract(soup)
+
+        assert index.call_count == 1
+        assert result.first('name').get_text() == 'Booster Box'
+
+    def test_index_narrows_candidates(self, soup):
+        index = DocumentIndex(soup)
+
+        assert index.candidates(compile_selector('.gallery img')._css_parts[0][0]) == soup.select('img')
+        assert index.candidates(compile_selector('div.price span')._css_parts[0][0]) == soup.select('span')
+        assert len(index.candidates(compile_selector('[src]')._css_parts[0][0])) == len(soup.find_all())
+
+    @pytest.mark.parametrize('selector, keys', [
+        ('div.price > span.amount', ('span', 'amount')),
+        ('UL li:first-of-type', ('li', None)),
+        ('a[href*="a.b c"]:not(.hidden)', ('a', None)),
+        ('.gallery  img', ('img', None)),
+        ('div :is(.a, .b)', (None, None)),
+        ('h1, h2', (None, None)),
+        ('svg|rect', (None, None)),
+    ])
+    def test_subject_keys_read_from_selector_text(self, selector, keys):
+        assert subject_keys(selector) == keys
+
+    @pytest.mark.skipif(not os.path.exists(FIXTURE), reason="saved page not available")
+    def test_matches_sequential_selects_on_saved_page(self):
+        soup = BeautifulSoup(open(FIXTURE, 'rb').read(), 'html.parser')
+        selectors = ['h1', 'p.price span', 'nav a, footer a', "a:contains('pokemon')",
+                     'ul li:first-child', 'meta[property="og:image"]', 'div.no-such-thing']
+        rules = [rule(f'field{i}', selector, many=True) for i, selector in enumerate(selectors)]
+        rules += [rule(f'first{i}', 'div.no-such-thing', selector) for i, selector in enumerate(selectors)]
+
+        result = ExtractionEngine(rules).extract(soup)
+
+        for i, selector in enumerate(selectors):
+            expected = compile_selector(selector).select(soup)
+            assert result[f'field{i}'] == expected
+            assert result[f'first{i}'] == expected[:1]
@@ -0,0 +1,123 @@
+import dataclasses
+import pytest
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+
+from src.core.category import Category
+from src.core.extraction_plan import ExtractionPlan
+from src.utils.compiled_selectors import CompiledSelector
+from src.scrapers.guild_dreams import GuildDreamsScraper
+
+PRODUCT_HTML = '''
+<html><body>
+  <h1 class="h2">Pikachu VMAX</h1>
+  <span class="h2">$ 12.990</span>
+  <p>Agotado</p>
+  <section class="desc">Carta. Idioma: Español. Nueva</section>
+  <picture><img data-src="/img/pikachu.png"></picture>
+</body></html>
+'''
+
+
+class TestExtractionPlan:
+
+    @pytest.fixture
+    def category(self):
+        return Category('pokemon', 'https://shop.test/pokemon', {
+            'urls_selector': 'a.product',
+            'title_selector': 'h1.h2',
+            'price_selector': "//span[@class='h2']",
+            'stock_selector': "p:contains('agotado')",
+            'image_selector': 'picture img',
+        })
+
+    def test_for_category_maps_fields(self, category):
+        plan = ExtractionPlan.for_category(category, r'\d+')
+
+        assert set(plan.fields) == {'name', 'price', 'stock', 'image'}
+        assert plan.fields['price'].selectors == (category.compiled_selectors['price_selector'],)
+        assert not plan.has('description')
+
+    def test_plan_is_immutable(self, category):
+        plan = ExtractionPlan.for_category(category)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            plan.price_pattern = None
+        with pytest.raises(TypeError):
+            plan.fields['name'] = None
+
+    def test_extract_runs_each_field_once(self, category):
+        plan = ExtractionPlan.for_category(category)
+        soup = BeautifulSoup(PRODUCT_HTML, 'html.parser')
+
+        matches = plan.extract(soup)
+
+        assert [el.get_text() for el in matches['name']] == ['Pikachu VMAX']
+        assert [el.get_text() for el in matches['price']] == ['$ 12.990']
+        assert [el.get_text() for el in matches['stock']] == ['Agotado']
+        assert plan.first(soup, 'image').get('data-src') == '/img/pikachu.png'
+        assert plan.first(soup, 'description') is None
+
+    def test_failing_selector_yields_empty(self, category):
+        plan = ExtractionPlan.for_category(category)
+
+        with patch.object(CompiledSelector, 'select', side_effect=RuntimeError('boom')):
+            matches = plan.extract(BeautifulSoup(PRODUCT_HTML, 'html.parser'))
+
+        assert matches['price'] == []
+        assert matches['name'][0].get_text() == 'Pikachu VMAX'
+
+    def test_match_price(self, category):
+        assert ExtractionPlan.for_category(category, r'\d+').match_price('$ 1990') == '1990'
+        assert ExtractionPlan.for_category(category, r'\d+').match_price('gratis') is None
+        assert ExtractionPlan.for_category(category).match_price('$ 1990') == '$ 1990'
+
+
+class TestScraperPlans:
+
+    @pytest.fixture
+    def scraper_config(self):
+        return {
+            'categories': {
+                'pokemon': {
+                    'url': 'https://www.guildreams.com/collection/pokemon',
+                    'selectors': {
+                        'urls_selector': 'a[href*="/product/"]',
+                        'title_selector': 'h1.h2',
+                        'price_selector': 'span.h2, div.h3',
+                        'description_selector': 'section.desc',
+                        'language_selector': 'select option',
+                        'image_selector': 'picture img',
+                    }
+                }
+            }
+        }
+
+    def test_plans_built_at_init(self, scraper_config):
+        scraper = GuildDreamsScraper('guild_dreams', scraper_config)
+        category = scraper.categories[0]
+
+        assert isinstance(category.plan, ExtractionPlan)
+        assert category.plan.price_pattern.pattern == GuildDreamsScraper.PRICE_PATTERN
+        assert scraper.extraction_plan(category) is category.plan
+
+    def test_plan_built_lazily_for_standalone_category(self, scraper_config):
+        scraper = GuildDreamsScraper('guild_dreams', scraper_config)
+        category = Category('pokemon', 'https://shop.test', {'title_selector': 'h1'})
+
+        plan = scraper.extraction_plan(category)
+
+        assert category.plan is plan
+        assert plan.has('name')
+
+    @patch('src.scrapers.guild_dreams.GuildDreamsScraper.get_page')
+    def test_process_product_reads_all_fields(self, mock_get_page, scraper_config):
+        scraper = GuildDreamsScraper('guild_dreams', scraper_config)
+        mock_get_page.return_value = BeautifulSoup(PRODUCT_HTML, 'html.parser')
+
+        data = scraper.process_product('https://www.guildreams.com/product/pikachu', scraper.categories[0])
+
+        assert data['name'] == 'Pikachu VMAX'
+        assert data['price'] == '12990'
+        assert data['language'] == 'Español'
+        assert data['img_url'] == 'https://www.guildreams.com/img/pikachu.png'
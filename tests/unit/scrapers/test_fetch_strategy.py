@@ -0,0 +1,80 @@
+import json
+import pytest
+
+from src.core.fetch_strategy import StaticFirstStrategy
+
+
+class TestStaticFirstStrategy:
+
+    @pytest.fixture
+    def strategy(self):
+        return StaticFirstStrategy('store', probe_limit=3, reprobe_every=5)
+
+    def test_tries_static_while_learning(self, strategy):
+        assert strategy.should_try_static('product') is True
+        assert strategy.decision('product') is None
+
+    def test_pins_static_after_consistent_hits(self, strategy):
+        for _ in range(3):
+            strategy.record('product', True)
+
+        assert strategy.decision('product') == StaticFirstStrategy.STATIC
+        assert strategy.should_try_static('product') is True
+
+    def test_pins_render_after_consistent_misses(self, strategy):
+        for _ in range(3):
+            strategy.record('product', False)
+
+        assert strategy.decision('product') == StaticFirstStrategy.RENDER
+        assert strategy.should_try_static('product') is False
+
+    def test_page_types_are_independent(self, strategy):
+        for _ in range(3):
+            strategy.record('category', False)
+
+        assert strategy.decision('category') == StaticFirstStrategy.RENDER
+        assert strategy.decision('product') is None
+
+    def test_mixed_results_stay_undecided(self, strategy):
+        for ok in [True, False, True, True]:
+            strategy.record('product', ok)
+
+        assert strategy.decision('product') is None
+
+    def test_render_pages_are_reprobed(self, strategy):
+        for _ in range(3):
+            strategy.record('product', False)
+
+        attempts = [strategy.should_try_static('product') for _ in range(5)]
+
+        assert attempts == [False, False, False, False, True]
+
+        strategy.record('product', True)
+        assert strategy.decision('product') is None
+
+    def test_static_miss_resets_decision(self, strategy):
+        for _ in range(3):
+            strategy.record('product', True)
+
+        strategy.record('product', False)
+
+        assert strategy.decision('product') is None
+
+    def test_profiles_persist(self, tmp_path):
+        path = str(tmp_path / 'profiles' / 'fetch.json')
+        strategy = StaticFirstStrategy('store', profile_path=path, probe_limit=1)
+        strategy.record('product', False)
+        strategy.save()
+
+        other = StaticFirstStrategy('other', profile_path=path, probe_limit=1)
+        other.record('product', True)
+        other.save()
+
+        with open(path) as f:
+            stored = json.load(f)
+        assert stored['store:product']['decision'] == 'render'
+        assert stored['other:product']['decision'] == 'static'
+
+        reloaded = StaticFirstStrategy('store', profile_path=path)
+        assert reloaded.decision('product') == StaticFirstStrategy.RENDER
+        assert 'other:product' not in reloaded.profiles
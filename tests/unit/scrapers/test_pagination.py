@@ -0,0 +1,75 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from src.core.pagination import PaginationRule
+
+PAGER = '''
+<html><body>
+  <p class="count">Mostrando 1.234 productos</p>
+  <ul class="pager">
+    <li><a href="?page=1">1</a></li>
+    <li><a href="?page=2">2</a></li>
+    <li><a class="last" href="/collection/magic?page=12">Última</a></li>
+  </ul>
+  <a rel="next" href="/collection/magic?page=2">Siguiente</a>
+</body></html>
+'''
+
+
+@pytest.fixture
+def soup():
+    return BeautifulSoup(PAGER, 'html.parser')
+
+
+class TestPaginationRule:
+
+    def test_from_config(self):
+        rule = PaginationRule.from_config({'page_param': 'page', 'max_pages': 5, 'unknown': 1})
+
+        assert rule.page_param == 'page'
+        assert rule.max_pages == 5
+        assert PaginationRule.from_config(None) is None
+
+    def test_from_config_needs_a_way_to_the_next_page(self):
+        with pytest.raises(ValueError):
+            PaginationRule.from_config({'max_pages': 5})
+
+    def test_page_url_replaces_query_parameter(self):
+        rule = PaginationRule(page_param='page')
+
+        url = rule.page_url('https://shop.test/collection/magic?order=id&limit=106&page=1', 3)
+
+        assert url == 'https://shop.test/collection/magic?order=id&limit=106&page=3'
+        assert rule.page_url('https://shop.test/c', 2) == 'https://shop.test/c?page=2'
+
+    def test_page_url_template(self):
+        rule = PaginationRule(url_template='https://shop.test/c/page/{page}/')
+
+        assert rule.page_url('https://shop.test/c/', 4) == 'https://shop.test/c/page/4/'
+
+    def test_total_pages_from_page_links(self, soup):
+        rule = PaginationRule(page_param='page', last_page_selector='ul.pager a')
+
+        assert rule.total_pages(soup) == 12
+
+    def test_total_pages_not_capped(self, soup):
+        rule = PaginationRule(page_param='page', last_page_selector='ul.pager a', max_pages=5)
+
+        assert rule.total_pages(soup) == 12
+        assert rule.last_allowed_page == 5
+        assert PaginationRule(page_param='page', start=0, max_pages=5).last_allowed_page == 4
+
+    def test_total_pages_from_product_count(self, soup):
+        rule = PaginationRule(page_param='page', total_selector='p.count', per_page=48, max_pages=100)
+
+        assert rule.total_pages(soup) == 26
+
+    def test_total_pages_unknown(self, soup):
+        assert PaginationRule(page_param='page').total_pages(soup) is None
+        assert PaginationRule(page_param='page', last_page_selector='nav.none a').total_pages(soup) is None
+
+    def test_next_url(self, soup):
+        rule = PaginationRule(next_selector='a[rel="next"]')
+
+        assert rule.next_url(soup, 'https://shop.test/collection/magic') == 'https://shop.test/collection/magic?page=2'
+        assert rule.next_url(BeautifulSoup('<p></p>', 'html.parser'), 'https://shop.test/') is None
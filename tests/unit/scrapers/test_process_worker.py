@@ -0,0 +1,131 @@
+import queue
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core import process_worker
+from src.core.process_worker import ForwardingCheckpoint, scrape_store
+
+
+class FakeScraper:
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.browser_pool = None
+        self.sink = None
+        self.retain_results = True
+        self.checkpoint = None
+
+    def run(self):
+        results = {}
+        for category, urls in self.config['categories'].items():
+            results[category] = []
+            if self.checkpoint is None:
+                for url in urls:
+                    self.sink(self.name, category, {'url': url})
+                continue
+            if self.checkpoint.is_complete(self.name, category):
+                for product in self.checkpoint.products(self.name, category).values():
+                    self.sink(self.name, category, product)
+                continue
+            for url in urls:
+                product = {'url': url}
+                self.checkpoint.record(self.name, category, url, product)
+                self.sink(self.name, category, product)
+            self.checkpoint.complete(self.name, category)
+        return results
+
+    def get_report(self):
+        return {category: {'total_products': len(urls)} for category, urls in self.config['categories'].items()}
+
+
+@pytest.fixture
+def channel():
+    channel = queue.Queue()
+    process_worker.init_worker(channel)
+    yield channel
+    process_worker.init_worker(None)
+
+
+def drain(channel):
+    messages = []
+    while not channel.empty():
+        messages.append(channel.get_nowait())
+    return messages
+
+
+class TestScrapeStore:
+
+    def test_products_are_batched(self, channel):
+        config = {'categories': {'magic': ['u1', 'u2', 'u3'], 'pokemon': []}}
+        with patch('src.core.process_worker.ScraperFactory.create_scraper', FakeScraper):
+            scrape_store('store_a', config, batch_size=2)
+
+        messages = drain(channel)
+        assert [message[2] for message in messages[:-1]] == [
+            [('product', 'magic', {'url': 'u1'}), ('product', 'magic', {'url': 'u2'})],
+            [('product', 'magic', {'url': 'u3'})],
+        ]
+        assert messages[-1] == ('done', 'store_a', {'magic': {'total_products': 3}, 'pokemon': {'total_products': 0}},
+                                ['magic', 'pokemon'], None)
+
+    def test_each_product_is_sent_once_and_complete_flushes(self, channel):
+        config = {'categories': {'magic': ['u1', 'u2'], 'pokemon': []}}
+        with patch('src.core.process_worker.ScraperFactory.create_scraper', FakeScraper):
+            scrape_store('store_a', config, {'complete': [], 'products': {}}, batch_size=100)
+
+        batches = [message[2] for message in drain(channel)[:-1]]
+        assert batches == [
+            [('product', 'magic', {'url': 'u1'}), ('product', 'magic', {'url': 'u2'}), ('complete', 'magic')],
+            [('complete', 'pokemon')],
+        ]
+
+    def test_completed_categories_come_from_the_snapshot(self, channel):
+        config = {'categories': {'magic': ['u1']}}
+        snapshot = {'complete': ['magic'], 'products': {'magic': {'u9': {'url': 'u9'}}}}
+        with patch('src.core.process_worker.ScraperFactory.create_scraper', FakeScraper):
+            scrape_store('store_a', config, snapshot)
+
+        [batch, done] = drain(channel)
+        assert batch == ('batch', 'store_a', [('product', 'magic', {'url': 'u9'})])
+        assert done[1] == 'store_a'
+
+    def test_failure_still_reports_done(self, channel):
+        with patch('src.core.process_worker.ScraperFactory.create_scraper', side_effect=ValueError("Unknown site type")):
+            scrape_store('store_a', {})
+
+        assert drain(channel) == [('done', 'store_a', {}, [], 'Unknown site type')]
+
+    def test_browser_pool_is_closed_after_each_store(self, channel):
+        pool = Mock()
+        with patch.object(process_worker, '_browser_pool', pool), \
+                patch('src.core.process_worker.ScraperFactory.create_scraper', FakeScraper):
+            scrape_store('store_a', {'categories': {}}, {})
+
+        pool.close.assert_called_once()
+
+    def test_browser_pool_error_still_reports_done(self, channel):
+        pool = Mock()
+        pool.close.side_effect = RuntimeError("browser gone")
+        with patch.object(process_worker, '_browser_pool', pool), \
+                patch('src.core.process_worker.ScraperFactory.create_scraper', FakeScraper):
+            scrape_store('store_a', {'categories': {'magic': ['u1']}})
+
+        messages = drain(channel)
+        assert messages[0] == ('batch', 'store_a', [('product', 'magic', {'url': 'u1'})])
+        assert messages[-1] == ('done', 'store_a', {'magic': {'total_products': 1}}, ['magic'], None)
+
+
+class TestForwardingCheckpoint:
+
+    def test_reads_snapshot_and_forwards_only_completion(self):
+        batcher = Mock()
+        checkpoint = ForwardingCheckpoint({'products': {'magic': {'u1': {'price': 1}}}}, batcher)
+
+        checkpoint.record('store_a', 'magic', 'u2', {'price': 2})
+        checkpoint.complete('store_a', 'magic')
+
+        assert checkpoint.get('store_a', 'magic', 'u1') == {'price': 1}
+        assert list(checkpoint.products('store_a', 'magic')) == ['u1']
+        assert checkpoint.is_complete('store_a', 'magic') is True
+        batcher.send.assert_called_once_with(('complete', 'magic'), urgent=True)
@@ -0,0 +1,65 @@
+import os
+import pytest
+
+from src.core.product_index import ProductIndex
+
+
+class TestProductIndex:
+
+    @pytest.fixture
+    def index_path(self, tmp_path):
+        return str(tmp_path / 'index' / 'store.json')
+
+    def test_fingerprint_changes_with_listing_fields(self):
+        base = ProductIndex.fingerprint('Pikachu', '1000', 'img.png')
+
+        assert base == ProductIndex.fingerprint('Pikachu', '1000', 'img.png')
+        assert base != ProductIndex.fingerprint('Pikachu', '1200', 'img.png')
+        assert base != ProductIndex.fingerprint('Pikachu', '1000', 'other.png')
+        assert base != ProductIndex.fingerprint('Raichu', '1000', 'img.png')
+
+    def test_unchanged_returns_copy(self, index_path):
+        index = ProductIndex(index_path)
+        fingerprint = ProductIndex.fingerprint('Pikachu')
+        index.update('https://shop.test/p', fingerprint, {'name': 'Pikachu', 'price': 1000})
+
+        record = index.unchanged('https://shop.test/p', fingerprint)
+        record['price'] = 0
+
+        assert index.unchanged('https://shop.test/p', fingerprint)['price'] == 1000
+
+    def test_changed_or_unknown_products(self, index_path):
+        index = ProductIndex(index_path)
+        index.update('https://shop.test/p', ProductIndex.fingerprint('Pikachu'), {'name': 'Pikachu'})
+
+        assert index.unchanged('https://shop.test/p', ProductIndex.fingerprint('Pikachu', '5')) is None
+        assert index.unchanged('https://shop.test/other', ProductIndex.fingerprint('Pikachu')) is None
+
+    def test_save_and_reload(self, index_path):
+        index = ProductIndex(index_path)
+        index.update('https://shop.test/p', 'abc', {'name': 'Pikachu'})
+        index.save()
+
+        reloaded = ProductIndex(index_path)
+
+        assert len(reloaded) == 1
+        assert reloaded.unchanged('https://shop.test/p', 'abc') == {'name': 'Pikachu'}
+        assert not os.path.exists(index_path + '.tmp')
+
+    def test_corrupt_file_starts_empty(self, index_path):
+        os.makedirs(os.path.dirname(index_path))
+        with open(index_path, 'w') as f:
+            f.write('{not json')
+
+        assert len(ProductIndex(index_path)) == 0
+
+    def test_old_records_expire(self, index_path):
+        index = ProductIndex(index_path, max_age=3600)
+        index.update('https://shop.test/p', 'abc', {'name': 'Pikachu'})
+        assert index.unchanged('https://shop.test/p', 'abc') == {'name': 'Pikachu'}
+
+        index.entries['https://shop.test/p']['fetched_at'] = '2000-01-01T00:00:00'
+        assert index.unchanged('https://shop.test/p', 'abc') is None
+
+        del index.entries['https://shop.test/p']['fetched_at']
+        assert index.unchanged('https://shop.test/p', 'abc') is None
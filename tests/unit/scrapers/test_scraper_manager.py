@@ -397,3 +397,138 @@ class TestScraperManager:
             assert "test_scraper_2" in results
             assert "test_scraper_1" in report
             assert "test_scraper_2" in report
+
+    def test_max_workers_defaults_to_sequential(self, temp_json_config_file):
+        with patch('src.core.scraper_manager.ScraperFactory.create_scraper') as mock_factory:
+            mock_factory.return_value = MockScraper("test", {})
+
+            manager = ScraperManager(temp_json_config_file)
+
+            assert manager.max_workers == 1
+
+    def test_max_workers_from_config_file(self, sample_json_config):
+        sample_json_config["max_workers"] = 3
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(sample_json_config, f)
+            temp_file = f.name
+
+        try:
+            with patch('src.core.scraper_manager.ScraperFactory.create_scraper') as mock_factory:
+                mock_factory.return_value = MockScraper("test", {})
+
+                manager = ScraperManager(temp_file)
+
+                assert manager.max_workers == 3
+
+                manager = ScraperManager(temp_file, max_workers=2)
+
+                assert manager.max_workers == 2
+        finally:
+            os.unlink(temp_file)
+
+    def test_run_all_concurrently(self, temp_json_config_file):
+        with patch('src.core.scraper_manager.ScraperFactory.create_scraper') as mock_factory:
+            mock_scraper1 = MockScraper("scraper1", {})
+            mock_scraper1.set_mock_results({"magic": [{"name": "Card1", "price": 100}]})
+            mock_scraper1.set_mock_report({"magic": {"total_products": 1, "processed_products": 1}})
+            mock_scraper2 = MockScraper("scraper2", {})
+            mock_scraper2.set_mock_results({"pokemon": [{"name": "Card2", "price": 200}]})
+            mock_scraper2.set_mock_report({"pokemon": {"total_products": 1, "processed_products": 1}})
+            mock_factory.side_effect = [mock_scraper1, mock_scraper2]
+
+            manager = ScraperManager(temp_json_config_file, max_workers=2)
+
+            results = manager.run_all()
+
+            assert list(results.keys()) == ["test_scraper_1", "test_scraper_2"]
+            assert results["test_scraper_1"] == {"magic": [{"name": "Card1", "price": 100}]}
+            assert results["test_scraper_2"] == {"pokemon": [{"name": "Card2", "price": 200}]}
+            assert manager.report["test_scraper_1"] == {"magic": {"total_products": 1, "processed_products": 1}}
+            assert manager.report["test_scraper_2"] == {"pokemon": {"total_products": 1, "processed_products": 1}}
+            assert mock_scraper1.run_called and mock_scraper2.run_called
+
+    def test_browser_pool_is_shared_and_closed(self, sample_json_config):
+        sample_json_config["browser_pool"] = {"browsers": 1, "max_rss_mb": 512}
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(sample_json_config, f)
+            temp_file = f.name
+
+        try:
+            with patch('src.core.scraper_manager.ScraperFactory.create_scraper') as mock_factory:
+                mock_factory.side_effect = [MockScraper("scraper1", {}), MockScraper("scraper2", {})]
+
+                manager = ScraperManager(temp_file)
+                pool = manager.browser_pool
+                with patch.object(pool, 'shutdown') as shutdown:
+                    manager.run_all()
+
+                assert pool.max_rss_bytes == 512 * 1024 * 1024
+                assert [scraper.browser_pool for scraper in manager.scrapers.values()] == [pool, pool]
+                shutdown.assert_called_once()
+                pool.shutdown()
+        finally:
+            os.unlink(temp_file)
+
+    def test_process_executor_builds_no_browser_pool(self, sample_json_config):
+        sample_json_config["browser_pool"] = {"browsers": 1}
+        sample_json_config["executor"] = "process"
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(sample_json_config, f)
+            temp_file = f.name
+
+        try:
+            with patch('src.core.scraper_manager.ScraperFactory.create_scraper') as mock_factory, \
+                    patch('src.core.scraper_manager.BrowserPool') as pool_class:
+                mock_factory.side_effect = [MockScraper("scraper1", {}), MockScraper("scraper2", {})]
+
+                manager = ScraperManager(temp_file, max_workers=2)
+
+            assert manager.browser_pool is None
+            pool_class.from_config.assert_not_called()
+        finally:
+            os.unlink(temp_file)
+
+    def test_worker_messages_feed_sink_results_and_checkpoint(self, temp_json_config_file):
+        with patch('src.core.scraper_manager.ScraperFactory.create_scraper') as mock_factory:
+            mock_factory.side_effect = [MockScraper("scraper1", {}), MockScraper("scraper2", {})]
+            sink, checkpoint = Mock(), MagicMock()
+            checkpoint.__contains__.side_effect = lambda key: key[2] == "resumed"
+            manager = ScraperManager(temp_json_config_file, sink=sink, checkpoint=checkpoint)
+
+        collected, done = {"test_scraper_1": {}}, {}
+        manager._apply_worker_message(("batch", "test_scraper_1", [
+            ("product", "magic", {"url": "u1"}),
+            ("product", "magic", {"url": "resumed"}),
+            ("complete", "magic"),
+        ]), collected, done)
+        manager._apply_worker_message(("done", "test_scraper_1", {"magic": {"total_products": 1}}, ["magic"], None),
+                                      collected, done)
+
+        assert collected == {"test_scraper_1": {"magic": [{"url": "u1"}, {"url": "resumed"}]}}
+        assert done == {"test_scraper_1": ["magic"]}
+        assert manager.report["test_scraper_1"] == {"magic": {"total_products": 1}}
+        assert sink.call_count == 2
+        checkpoint.record.assert_called_once_with("test_scraper_1", "magic", "u1", {"url": "u1"})
+        checkpoint.complete.assert_called_once_with("test_scraper_1", "magic")
+
+    def test_run_all_in_processes(self, sample_json_config):
+        for scraper_config in sample_json_config["scrapers"].values():
+            scraper_config["categories"] = {}
+        sample_json_config["executor"] = "process"
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(sample_json_config, f)
+            temp_file = f.name
+
+        try:
+            manager = ScraperManager(temp_file, max_workers=2)
+            results = manager.run_all()
+
+            assert manager.executor == "process"
+            assert results == {"test_scraper_1": {}, "test_scraper_2": {}}
+            assert manager.report == {"test_scraper_1": {}, "test_scraper_2": {}}
+        finally:
+            os.unlink(temp_file)
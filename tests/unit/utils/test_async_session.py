@@ -0,0 +1,212 @@
+import pytest
+from unittest.mock import patch
+
+from src.utils.async_session import AsyncPlaywrightSession
+from src.utils.rate_limiter import HostRateLimiter
+
+PAGE_HTML = '<html><head><title>t</title></head><body><p>' + 'x' * 600 + '</p></body></html>'
+
+
+class FakeResponse:
+    def __init__(self, status=200):
+        self.status = status
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+        self.visited = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def on(self, event, handler):
+        self.context.listeners.append((event, handler))
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.visited.append(url)
+        if 'fail' in url:
+            raise Exception("net::ERR_FAILED")
+        return FakeResponse(404 if 'missing' in url else 200)
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        return None
+
+    async def wait_for_function(self, script, arg=None, polling=None, timeout=None):
+        return True
+
+    async def wait_for_load_state(self, state, timeout=None):
+        return None
+
+    async def content(self):
+        return PAGE_HTML
+
+    async def evaluate(self, script):
+        return self.context.heap
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, heap=0):
+        self.heap = heap
+        self.pages = []
+        self.listeners = []
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def add_init_script(self, script):
+        pass
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, launcher):
+        self.launcher = launcher
+
+    async def new_context(self, **options):
+        context = FakeContext(self.launcher.heap)
+        self.launcher.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class FakeChromium:
+    def __init__(self, heap=0):
+        self.heap = heap
+        self.launches = 0
+        self.contexts = []
+
+    async def launch(self, headless=True, args=None):
+        self.launches += 1
+        return FakeBrowser(self)
+
+
+class FakePlaywright:
+    def __init__(self, chromium):
+        self.chromium = chromium
+
+    async def stop(self):
+        pass
+
+
+class FakeAsyncPlaywright:
+    def __init__(self, chromium):
+        self.chromium = chromium
+
+    async def start(self):
+        return FakePlaywright(self.chromium)
+
+
+class TestAsyncPlaywrightSession:
+
+    @pytest.fixture
+    def chromium(self):
+        return FakeChromium()
+
+    @pytest.fixture
+    def session(self, chromium):
+        with patch('src.utils.async_session.async_playwright', lambda: FakeAsyncPlaywright(chromium)):
+            session = AsyncPlaywrightSession(rate_limiter=HostRateLimiter(rate=1000, burst=1000),
+                                             pool_size=2, max_consecutive_errors=2)
+            yield session
+            session.close()
+
+    def test_is_thread_safe(self):
+        assert AsyncPlaywrightSession.thread_safe is True
+
+    def test_pages_are_reused(self, session, chromium):
+        for i in range(5):
+            soup = session.get(f'https://shop.test/products/{i}')
+            assert soup.find('p') is not None
+
+        assert chromium.launches == 1
+        assert len(chromium.contexts[0].pages) == 2
+        assert session.stats['fetches'] == 5
+
+    def test_http_error_replaces_page(self, session, chromium):
+        session.get('https://shop.test/products/1')
+        with patch('src.utils.session_html.time.sleep'):
+            with pytest.raises(Exception, match="HTTP 404"):
+                session.get('https://shop.test/missing')
+
+        assert session.stats['page_recycles'] >= 1
+        assert chromium.launches >= 1
+
+    def test_consecutive_errors_recycle_browser(self, session, chromium):
+        with patch('src.utils.session_html.time.sleep'):
+            with pytest.raises(Exception):
+                session.get('https://shop.test/fail')
+
+        assert session.stats['browser_recycles'] >= 1
+
+        session.get('https://shop.test/products/1')
+        assert chromium.launches >= 2
+
+    def test_heavy_pages_are_replaced(self):
+        chromium = FakeChromium(heap=10 * 1024 * 1024 * 1024)
+        with patch('src.utils.async_session.async_playwright', lambda: FakeAsyncPlaywright(chromium)):
+            session = AsyncPlaywrightSession(rate_limiter=HostRateLimiter(rate=1000, burst=1000), pool_size=1)
+            try:
+                session.get('https://shop.test/products/1')
+                session.get('https://shop.test/products/2')
+            finally:
+                session.close()
+
+        assert session.stats['page_recycles'] == 2
+        assert chromium.contexts[0].pages[0].closed is True
+
+    def test_waits_are_measured(self, session):
+        session.get('https://shop.test/products/1')
+        session.get('https://shop.test/products/2', wait_for='p.price')
+
+        metrics = session.metrics()['readiness']
+        assert metrics['pages'] == 2
+        assert metrics['timeouts'] == 0
+        assert set(metrics['learned_budgets']) == {'shop.test quiet', 'shop.test selector'}
+
+    def test_resource_policy_routes_and_counts_pages(self, session, chromium):
+        session.get('https://shop.test/products/1')
+        context = chromium.contexts[0]
+        [(pattern, handler)] = context.routes
+        page = context.pages[0]
+
+        class Route:
+            def __init__(self, url, resource_type):
+                self.request = type('Request', (), {'url': url, 'resource_type': resource_type,
+                                                    'frame': type('Frame', (), {'page': page})})
+                self.outcome = None
+
+            async def continue_(self):
+                self.outcome = 'continue'
+
+            async def abort(self):
+                self.outcome = 'abort'
+
+        session._begin_page(page)
+        routes = [Route('https://shop.test/app.js', 'script'), Route('https://shop.test/a.png', 'image')]
+        for route in routes:
+            session._run(handler(route))
+        session._end_page(page)
+
+        assert pattern == '**/*'
+        assert [route.outcome for route in routes] == ['continue', 'abort']
+        assert session.metrics()['resources'] == {'allowed': 1, 'blocked': 1, 'allowed_bytes': 0,
+                                                  'blocked_by_type': {'image': 1}, 'pages': 2}
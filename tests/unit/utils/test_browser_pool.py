@@ -0,0 +1,154 @@
+from unittest.mock import patch
+
+import asyncio
+
+import pytest
+
+from src.utils.async_session import AsyncPlaywrightSession
+from src.utils.browser_pool import BrowserPool, process_tree_rss
+from src.utils.rate_limiter import HostRateLimiter
+from tests.unit.utils.test_async_session import FakeAsyncPlaywright, FakeBrowser, FakeChromium, FakePage
+
+
+class RecordingChromium(FakeChromium):
+    def __init__(self):
+        super().__init__()
+        self.browsers = []
+
+    async def launch(self, headless=True, args=None):
+        self.launches += 1
+        browser = FakeBrowser(self)
+        browser.args = args
+        browser.closed = False
+
+        async def close():
+            browser.closed = True
+        browser.close = close
+        self.browsers.append(browser)
+        return browser
+
+
+def write_process(proc, pid, ppid, cmdline, rss_kb):
+    directory = proc / str(pid)
+    directory.mkdir()
+    (directory / 'stat').write_bytes(f'{pid} (chrome (x)) S {ppid} 1 1'.encode())
+    (directory / 'cmdline').write_bytes('\0'.join(cmdline).encode() + b'\0')
+    (directory / 'status').write_text(f'Name:\tchrome\nVmRSS:\t  {rss_kb} kB\n')
+
+
+class TestProcessTreeRss:
+
+    def test_sums_marked_process_and_descendants(self, tmp_path):
+        write_process(tmp_path, 10, 1, ['chrome', '--browser-pool=1-0-1'], 1000)
+        write_process(tmp_path, 11, 10, ['chrome', '--type=zygote'], 200)
+        write_process(tmp_path, 12, 11, ['chrome', '--type=renderer'], 300)
+        write_process(tmp_path, 20, 1, ['chrome', '--browser-pool=1-0-10'], 5000)
+        write_process(tmp_path, 21, 20, ['chrome', '--type=renderer'], 5000)
+
+        assert process_tree_rss('--browser-pool=1-0-1', str(tmp_path)) == 1500 * 1024
+        assert process_tree_rss('--browser-pool=9-9-9', str(tmp_path)) == 0
+        assert process_tree_rss('--browser-pool=1-0-1', str(tmp_path / 'missing')) == 0
+
+
+class TestBrowserPool:
+
+    @pytest.fixture
+    def chromium(self):
+        return RecordingChromium()
+
+    @pytest.fixture
+    def rss(self):
+        return {}
+
+    @pytest.fixture
+    def pool(self, chromium, rss):
+        with patch('src.utils.browser_pool.async_playwright', lambda: FakeAsyncPlaywright(chromium)):
+            pool = BrowserPool(browsers=2, context_max_pages=3, max_rss_mb=100, rss_check_interval=0,
+                               rss_reader=lambda marker: rss.get(marker, 0))
+            yield pool
+            pool.shutdown()
+
+    def test_contexts_spread_over_browsers_launched_once(self, pool, chromium):
+        contexts = [pool.run(pool.new_context()) for _ in range(3)]
+        pool.run(pool.release(contexts[0]))
+        pool.run(pool.new_context())
+
+        assert chromium.launches == 2
+        assert chromium.browsers[0].args[-1] != chromium.browsers[1].args[-1]
+        assert contexts[0].closed is True
+        assert pool.metrics()['open_contexts'] == 3
+        assert pool.metrics()['browsers'] == 2
+
+    def test_browser_over_rss_limit_drains_then_restarts(self, pool, chromium, rss):
+        first = pool.run(pool.new_context())
+        second = pool.run(pool.new_context())
+        heavy = chromium.browsers[0]
+        rss[heavy.args[-1]] = 200 * 1024 * 1024
+
+        third = pool.run(pool.new_context())
+        assert chromium.contexts.index(third) == 2
+        assert heavy.closed is False
+
+        pool.run(pool.release(first))
+
+        assert heavy.closed is True
+        assert pool.stats['restarts'] == 1
+        assert pool.metrics()['browsers'] == 1
+
+        pool.run(pool.release(second))
+        pool.run(pool.new_context())
+        assert chromium.launches == 3
+        assert chromium.browsers[2].args[-1] != heavy.args[-1]
+
+    def test_sessions_recycle_contexts_not_browsers(self, pool, chromium):
+        sessions = [AsyncPlaywrightSession(rate_limiter=HostRateLimiter(rate=1000, burst=1000),
+                                           pool_size=1, browser_pool=pool) for _ in range(2)]
+        try:
+            for i in range(4):
+                for session in sessions:
+                    session.get(f'https://shop.test/products/{i}')
+        finally:
+            for session in sessions:
+                session.close()
+
+        assert chromium.launches == 2
+        assert sessions[0].stats['context_recycles'] == 1
+        assert len(chromium.contexts) == 4
+        assert all(context.closed for context in chromium.contexts)
+        assert pool.metrics()['open_contexts'] == 0
+        assert pool.loop.is_running()
+
+    def test_expired_context_hands_out_no_more_pages(self, pool, chromium):
+        session = AsyncPlaywrightSession(rate_limiter=HostRateLimiter(rate=1000, burst=1000),
+                                         pool_size=2, browser_pool=pool)
+
+        async def crawl():
+            return await asyncio.gather(*(session.fetch(f'https://shop.test/products/{i}') for i in range(9)))
+
+        async def goto(page, url, **kwargs):
+            # Staggered so the two pages are never idle at the same time.
+            await asyncio.sleep(0.001 * (1 + int(url[-1]) % 2 * 2))
+            page.visited.append(url)
+
+        try:
+            with patch.object(FakePage, 'goto', goto):
+                assert len(pool.run(crawl())) == 9
+        finally:
+            session.close()
+
+        served = [sum(len(page.visited) for page in context.pages) for context in chromium.contexts]
+        assert sum(served) == 9
+        # context_max_pages is 3; a page already in flight may still finish.
+        assert max(served) <= 3 + 1
+        assert len(served) >= 3
+
+    def test_shutdown_stops_the_loop_thread(self, chromium):
+        with patch('src.utils.browser_pool.async_playwright', lambda: FakeAsyncPlaywright(chromium)):
+            pool = BrowserPool(browsers=1)
+            pool.run(pool.new_context())
+            pool.shutdown()
+
+        assert chromium.browsers[0].closed is True
+        assert not pool._thread.is_alive()
+        assert pool.loop.is_closed()
+        pool.shutdown()
@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+
+from src.utils.compiled_selectors import CompiledSelector, compile_selector, is_xpath
+from src.utils.html_parser import LxmlNode, parse_html
+
+HTML = '''
+<div class="bs-product">
+  <span class="price">$ 10.000</span>
+  <span class="sale">$ 8.000</span>
+  <p>Stock: Ahora disponible</p>
+  <ul><li data-bs="variant-1">A</li><li data-bs="variant-2">B</li></ul>
+  <blockquote><ul><li>Inglés</li></ul><ul><li>Español</li></ul></blockquote>
+  <p>Agotado</p>
+</div>
+'''
+
+
+class TestCompiledSelector:
+
+    @pytest.fixture
+    def soup(self):
+        return BeautifulSoup(HTML, 'html.parser')
+
+    def test_is_xpath(self):
+        assert is_xpath('//div')
+        assert is_xpath('(//a)[1]')
+        assert not is_xpath('div.price')
+
+    def test_xpath_union(self, soup):
+        elements = CompiledSelector("//span[@class='price'] | //span[@class='sale']").select(soup)
+
+        assert [element.get_text() for element in elements] == ['$ 10.000', '$ 8.000']
+
+    def test_xpath_contains_text(self, soup):
+        element = CompiledSelector('//p[contains(., "Ahora")]').select_one(soup)
+
+        assert element.get_text() == 'Stock: Ahora disponible'
+
+    def test_xpath_data_attributes(self, soup):
+        elements = CompiledSelector("//li[starts-with(@data-bs, 'variant')]").select(soup)
+
+        assert [element.get('data-bs') for element in elements] == ['variant-1', 'variant-2']
+
+    def test_xpath_non_element_results_are_dropped(self, soup):
+        assert CompiledSelector('count(//li)').select(soup) == []
+        assert CompiledSelector('//li/@data-bs').select(soup) == []
+
+    def test_xpath_on_lxml_document(self):
+        document = parse_html(HTML, 'lxml.html')
+
+        with patch.object(LxmlNode, 'from_html') as mock_from_html:
+            element = CompiledSelector("//span[@class='sale']").select_one(document)
+
+        mock_from_html.assert_not_called()
+        assert element.get_text() == '$ 8.000'
+
+    def test_soup_is_converted_once(self, soup):
+        with patch.object(LxmlNode, 'from_html', wraps=LxmlNode.from_html) as mock_from_html:
+            CompiledSelector('//span').select(soup)
+            CompiledSelector('//li').select(soup)
+
+        assert mock_from_html.call_count == 1
+
+    def test_css_keeps_enhanced_semantics(self, soup):
+        first = CompiledSelector('blockquote ul:first-child').select(soup)
+        agotado = CompiledSelector("p:contains('agotado')").select(soup)
+
+        assert [element.get_text(strip=True) for element in first] == ['Inglés']
+        assert [element.get_text() for element in agotado] == ['Agotado']
+
+    def test_css_union(self, soup):
+        assert len(CompiledSelector('span.price, span.sale').select(soup)) == 2
+
+    def test_invalid_selectors_never_match(self, soup):
+        for selector, kind in [('//div[', 'xpath'), ('div[', 'css')]:
+            compiled = CompiledSelector(selector, kind)
+
+            assert not compiled.valid
+            assert compiled.select(soup) == []
+
+    def test_compile_selector_is_cached(self):
+        assert compile_selector('span.price') is compile_selector('span.price')
+        assert compile_selector('//span') is compile_selector('//span', 'xpath')
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.utils.debug_capture import DebugCapture
+from src.utils.session_html import RequestsHTMLSession
+
+PAGE_HTML = '<html><head><title>t</title></head><body><p>' + 'x' * 600 + '</p></body></html>'
+
+
+@pytest.fixture
+def capture(tmp_path):
+    capture = DebugCapture(str(tmp_path / 'store_a'), keep=3)
+    yield capture
+    capture.close()
+
+
+class TestDebugCapture:
+
+    def test_failures_are_written_raw(self, capture, tmp_path):
+        assert capture.capture('https://a.test/1', '<html>ñ</html>', 'incomplete') is True
+
+        [path] = capture.files()
+        assert os.path.basename(path) == '000001-incomplete.html'
+        with open(path, 'rb') as f:
+            assert f.read() == '<html>ñ</html>'.encode('utf-8')
+        with open(path[:-5] + '.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        assert (meta['url'], meta['reason'], meta['size']) == ('https://a.test/1', 'incomplete', 15)
+
+    def test_successful_pages_are_sampled(self, capture):
+        assert capture.capture('https://a.test/1', PAGE_HTML) is False
+
+        capture.sample_rate = 1.0
+        assert capture.capture('https://a.test/1', PAGE_HTML) is True
+
+    def test_ring_buffer_keeps_last_pages(self, capture, tmp_path):
+        for i in range(5):
+            capture.capture(f'https://a.test/{i}', f'<p>{i}</p>', 'error')
+
+        assert [os.path.basename(path) for path in capture.files()] == [
+            '000003-error.html', '000004-error.html', '000005-error.html']
+        assert len(os.listdir(tmp_path / 'store_a')) == 6
+        assert capture.stats['evicted'] == 2
+
+    def test_ring_buffer_spans_runs(self, capture, tmp_path):
+        for i in range(3):
+            capture.capture(f'https://a.test/{i}', '<p></p>', 'error')
+        capture.close()
+
+        later = DebugCapture(str(tmp_path / 'store_a'), keep=3)
+        later.capture('https://a.test/9', '<p></p>', 'error')
+
+        assert [os.path.basename(path) for path in later.files()] == [
+            '000002-error.html', '000003-error.html', '000004-error.html']
+        later.close()
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        capture = DebugCapture(str(tmp_path), queue_size=1)
+        release = threading.Event()
+        with patch.object(capture, '_write', side_effect=lambda *args: release.wait()):
+            capture.capture('https://a.test/1', 'a', 'error')
+            results = [capture.capture('https://a.test/2', 'b', 'error') for _ in range(3)]
+            release.set()
+            capture.close()
+
+        assert results.count(False) >= 2
+        assert capture.stats['dropped'] >= 2
+
+
+class TestRenderedPageCheck:
+
+    @pytest.fixture
+    def session(self, capture):
+        session = RequestsHTMLSession(debug_capture=capture)
+        yield session
+        session.close()
+
+    def test_complete_page_is_parsed(self, session, capture):
+        soup = session._accept_rendered('https://a.test/1', PAGE_HTML)
+
+        assert soup.find('p') is not None
+        assert capture.files() == []
+
+    @pytest.mark.parametrize('content', [
+        '<html><head></head><body></body></html>',
+        '<html><body>' + 'x' * 600 + '</body></html>',
+    ])
+    def test_incomplete_page_is_captured_not_parsed(self, session, capture, content):
+        with patch.object(session, '_parse', Mock()) as parse:
+            with pytest.raises(Exception, match='incompleta'):
+                session._accept_rendered('https://a.test/1', content)
+
+        parse.assert_not_called()
+        [path] = capture.files()
+        assert path.endswith('-incomplete.html')
@@ -0,0 +1,159 @@
+import re
+import pytest
+from unittest.mock import Mock
+from bs4 import BeautifulSoup
+
+from src.utils.css_contain_adapter import EnhancedSelector, StockChecker
+from src.utils.html_parser import (
+    parse_html,
+    HTMLNode,
+    LxmlNode,
+    LexborHTMLParser,
+)
+from src.utils.session_html import RequestsHTMLSession
+
+HTML = '''
+<html>
+<head><title>Booster Box</title><link rel="stylesheet" href="a.css"></head>
+<body>
+  <div class="bs-product featured">
+    <ul>
+      <li><a class="product-link" href="/p/1" title="First">First <b>card</b></a></li>
+      <li><a class="product-link" href="/p/2">Second card</a></li>
+    </ul>
+    <p class="price"><span>$ 12.990</span></p>
+    <p class="stock">Agotado</p>
+    <script>var x = "hidden";</script>
+  </div>
+</body>
+</html>
+'''
+
+BACKENDS = [
+    'html.parser',
+    'lxml',
+    'lxml.html',
+    pytest.param('selectolax', marks=pytest.mark.skipif(LexborHTMLParser is None,
+                                                        reason="selectolax not installed")),
+]
+
+
+class TestParseHtml:
+
+    def test_bs4_backends_return_soup(self):
+        assert isinstance(parse_html(HTML, 'html.parser'), BeautifulSoup)
+        assert isinstance(parse_html(HTML, 'lxml'), BeautifulSoup)
+
+    def test_lxml_html_backend_returns_node(self):
+        assert isinstance(parse_html(HTML, 'lxml.html'), LxmlNode)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            parse_html(HTML, 'html5lib-fast')
+
+    def test_lxml_html_decodes_utf8_bytes(self):
+        document = parse_html('<p>Artículo</p>'.encode('utf-8'), 'lxml.html')
+
+        assert document.select_one('p').get_text() == 'Artículo'
+
+    def test_lxml_html_empty_document(self):
+        document = parse_html(b'', 'lxml.html')
+
+        assert document.find('body') is None
+        assert document.select('a') == []
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+class TestBackendCompatibility:
+
+    def test_select_and_attributes(self, backend):
+        document = parse_html(HTML, backend)
+
+        links = document.select('a.product-link')
+
+        assert [link.get('href') for link in links] == ['/p/1', '/p/2']
+        assert links[0]['title'] == 'First'
+        assert links[1].get('title', '') == ''
+        assert links[0].name == 'a'
+
+    def test_get_text(self, backend):
+        document = parse_html(HTML, backend)
+
+        assert document.select_one('a').get_text(strip=True) == 'Firstcard'
+        assert document.select_one('a').get_text(' ', strip=True) == 'First card'
+        assert document.title.string == 'Booster Box'
+
+    def test_find_helpers(self, backend):
+        document = parse_html(HTML, backend)
+        link = document.select_one('a')
+
+        assert document.find('p', class_='price').get_text(strip=True) == '$ 12.990'
+        assert len(document.find_all('link', rel='stylesheet')) == 1
+        assert len(document.find_all(['ul', 'p'])) == 3
+        assert link.find_parent(class_='bs-product').name == 'div'
+        assert link.find_parent('li').name == 'li'
+        assert document.find('meta') is None
+
+    def test_enhanced_selector(self, backend):
+        document = parse_html(HTML, backend)
+
+        assert len(EnhancedSelector.select(document, 'a.product-link, p.price')) == 3
+        assert EnhancedSelector.select_one(document, 'a:contains("second")').get('href') == '/p/2'
+        assert [el.get('href') for el in EnhancedSelector.select(document, 'li a:first-child')] == ['/p/1', '/p/2']
+
+    def test_stock_checker(self, backend):
+        document = parse_html(HTML, backend)
+
+        assert StockChecker.is_out_of_stock(document, 'p.stock')
+        assert StockChecker.is_out_of_stock(document)
+
+
+class TestHTMLNode:
+
+    def test_find_all_string_filter(self):
+        document = parse_html(HTML, 'lxml.html')
+
+        assert len(document.find_all('a', string=re.compile('second', re.IGNORECASE))) == 1
+
+    def test_get_text_skips_scripts(self):
+        document = parse_html(HTML, 'lxml.html')
+
+        assert 'hidden' not in document.select_one('div').get_text()
+
+    def test_nodes_compare_by_element(self):
+        document = parse_html(HTML, 'lxml.html')
+
+        assert document.select_one('a') == document.find('a')
+        assert isinstance(document.select_one('a'), HTMLNode)
+
+    def test_backends_must_provide_the_primitives(self):
+        class Partial(HTMLNode):
+            def select(self, selector):
+                return []
+
+        with pytest.raises(TypeError):
+            Partial()
+
+
+class TestSessionParser:
+
+    def test_session_uses_configured_backend(self):
+        http_client = Mock()
+        http_client.get.return_value = Mock(status_code=200, content=HTML.encode('utf-8'))
+        session = RequestsHTMLSession(http_client=http_client, parser='lxml.html')
+
+        document = session.get('https://shop.test/p', render_js=False)
+
+        assert isinstance(document, LxmlNode)
+        assert document.select_one('h1') is None
+        assert document.select_one('p.price span').get_text() == '$ 12.990'
+
+    def test_session_defaults_to_lxml_soup(self):
+        http_client = Mock()
+        http_client.get.return_value = Mock(status_code=200, content=HTML.encode('utf-8'))
+        session = RequestsHTMLSession(http_client=http_client)
+
+        document = session.get('https://shop.test/p', render_js=False)
+
+        assert isinstance(document, BeautifulSoup)
+        assert document.select_one('a').get('href') == '/p/1'
@@ -0,0 +1,129 @@
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from src.utils.http_cache import HTTPCache
+from src.utils.session_html import RequestsHTMLSession
+from src.utils.rate_limiter import HostRateLimiter
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    hits = []
+
+    def do_GET(self):
+        ETagHandler.hits.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = b'<html><head></head><body><span class="price">$1.000</span></body></html>'
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = HTTPCache(str(tmp_path / 'cache.sqlite'))
+        yield cache
+        cache.close()
+
+    def test_lookup_miss(self, cache):
+        assert cache.lookup('https://shop.test/a', 'static') is None
+        assert cache.stats['misses'] == 1
+
+    def test_store_and_lookup(self, cache):
+        cache.store('https://shop.test/a', 'static', b'<html>a</html>', etag='"abc"', last_modified='Mon')
+
+        entry = cache.lookup('https://shop.test/a', 'static')
+
+        assert entry.body == b'<html>a</html>'
+        assert cache.conditional_headers(entry) == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon'}
+
+    def test_keys_include_render_mode(self, cache):
+        cache.store('https://shop.test/a', 'render', b'rendered')
+
+        assert cache.lookup('https://shop.test/a', 'static') is None
+        assert cache.lookup('https://shop.test/a', 'render').body == b'rendered'
+
+    def test_freshness_per_mode(self, cache):
+        cache.store('https://shop.test/a', 'static', b'static')
+        cache.store('https://shop.test/a', 'render', b'render')
+
+        with patch('src.utils.http_cache.time.time', return_value=cache.lookup('https://shop.test/a', 'render').stored_at + 60):
+            assert cache.is_fresh(cache.lookup('https://shop.test/a', 'render')) is True
+            assert cache.is_fresh(cache.lookup('https://shop.test/a', 'static')) is False
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        cache = HTTPCache(str(tmp_path / 'cache.sqlite'), max_age=10)
+        cache.store('https://shop.test/a', 'static', b'old')
+        stored_at = cache.lookup('https://shop.test/a', 'static').stored_at
+
+        with patch('src.utils.http_cache.time.time', return_value=stored_at + 11):
+            assert cache.lookup('https://shop.test/a', 'static') is None
+        cache.close()
+
+    def test_size_bounded_eviction(self, tmp_path):
+        import os
+        cache = HTTPCache(str(tmp_path / 'cache.sqlite'), max_bytes=3000)
+        for i in range(5):
+            cache.store(f'https://shop.test/{i}', 'static', os.urandom(1000))
+
+        assert cache.size() <= 3000
+        assert cache.stats['evicted'] >= 2
+        assert cache.lookup('https://shop.test/0', 'static') is None
+        assert cache.lookup('https://shop.test/4', 'static') is not None
+        cache.close()
+
+
+class TestSessionConditionalGet:
+
+    @pytest.fixture
+    def server_url(self):
+        ETagHandler.hits = []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    def test_revalidates_with_etag(self, tmp_path, server_url):
+        cache = HTTPCache(str(tmp_path / 'cache.sqlite'))
+        session = RequestsHTMLSession(rate_limiter=HostRateLimiter(rate=1000, burst=1000), cache=cache)
+        try:
+            first = session.get(f'{server_url}/product', render_js=False)
+            second = session.get(f'{server_url}/product', render_js=False)
+        finally:
+            session.close()
+            cache.close()
+
+        assert ETagHandler.hits == [None, '"v1"']
+        assert first.select_one('span.price').get_text() == '$1.000'
+        assert second.select_one('span.price').get_text() == '$1.000'
+        assert cache.stats['revalidated'] == 1
+
+    def test_fresh_render_is_served_from_cache(self, tmp_path):
+        cache = HTTPCache(str(tmp_path / 'cache.sqlite'))
+        cache.store('https://shop.test/p', 'render', b'<html><body><h1>cached</h1></body></html>')
+        session = RequestsHTMLSession(cache=cache)
+        try:
+            with patch.object(RequestsHTMLSession, '_get_with_playwright') as mock_render:
+                soup = session.get('https://shop.test/p')
+        finally:
+            session.close()
+            cache.close()
+
+        mock_render.assert_not_called()
+        assert soup.find('h1').get_text() == 'cached'
@@ -0,0 +1,64 @@
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.http_client import PooledHTTPClient, DEFAULT_HEADERS
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = f'<html><body>{self.path}</body></html>'.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledHTTPClient:
+
+    def test_default_headers(self):
+        client = PooledHTTPClient()
+
+        assert client.session.headers['Connection'] == 'keep-alive'
+        assert 'gzip' in client.session.headers['Accept-Encoding']
+        assert client.session.headers['User-Agent'] == DEFAULT_HEADERS['User-Agent']
+        client.close()
+
+    def test_connections_are_reused(self, server_url):
+        client = PooledHTTPClient()
+        try:
+            for i in range(5):
+                response = client.get(f'{server_url}/page/{i}')
+                assert f'/page/{i}' in response.text
+
+            metrics = client.metrics()
+        finally:
+            client.close()
+
+        assert metrics['requests'] == 5
+        assert metrics['connections_opened'] == 1
+        assert metrics['connections_reused'] == 4
+        assert metrics['reuse_ratio'] == pytest.approx(0.8)
+        assert metrics['hosts']['127.0.0.1']['requests'] == 5
+
+    def test_metrics_empty(self):
+        client = PooledHTTPClient()
+
+        assert client.metrics()['reuse_ratio'] == 0.0
+        client.close()
@@ -0,0 +1,84 @@
+import pytest
+
+from src.utils.listing_stream import ListingItem, StreamingListingExtractor, supports_streaming
+
+LISTING = b'''
+<html><body>
+  <nav><a href="/product/menu">Menu</a></nav>
+  <div class="grid">
+    <div class="bs-product">
+      <a href="/product/1"><img data-src="/img/1.png"></a>
+      <a href="/product/1">Booster 1</a>
+      <span class="price">$ 1.990</span>
+    </div>
+    <div class="bs-product">
+      <a href="/product/2"><img src="data:image/gif;base64,R0"><img src="https://cdn.test/2.png"></a>
+      <h3><a href="/product/2"> Box
+        2 </a></h3>
+    </div>
+  </div>
+</body></html>
+'''
+
+
+def chunked(data, size=23):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestSupportsStreaming:
+
+    @pytest.mark.parametrize('selector', ['a.prod-th', "a[href*='/product/']", 'section.grid__item'])
+    def test_compound_selectors(self, selector):
+        assert supports_streaming(selector)
+
+    @pytest.mark.parametrize('selector', ['div a', 'ul > li', "p:contains('Agotado')", '//a', '', None, 'a[', 'a, b'])
+    def test_unsupported_selectors(self, selector):
+        assert not supports_streaming(selector)
+
+
+class TestStreamingListingExtractor:
+
+    def test_container_items(self):
+        extractor = StreamingListingExtractor("a[href*='/product/']", 'div.bs-product', 'span.price',
+                                              base_url='https://shop.test/collection/pokemon')
+
+        items = list(extractor.iter_listings(chunked(LISTING)))
+
+        assert items == [
+            ListingItem('Booster 1', 'https://shop.test/product/1', 'https://shop.test/img/1.png', '$ 1.990'),
+            ListingItem('Box 2', 'https://shop.test/product/2', 'https://cdn.test/2.png', ''),
+        ]
+        assert extractor.emitted == 2
+
+    def test_items_arrive_before_the_page_ends(self):
+        extractor = StreamingListingExtractor("a[href*='/product/']", 'div.bs-product')
+        cut = LISTING.index(b'<div class="bs-product">', LISTING.index(b'Booster 1'))
+
+        first = extractor.feed(LISTING[:cut])
+
+        assert [item.title for item in first] == ['Booster 1']
+        assert [item.title for item in extractor.feed(LISTING[cut:]) + extractor.close()] == ['Box 2']
+
+    def test_links_without_container(self):
+        extractor = StreamingListingExtractor("a[href*='/product/']")
+
+        items = list(extractor.iter_listings([LISTING]))
+
+        assert [item.url for item in items] == ['/product/menu', '/product/1', '/product/2']
+
+    def test_emitted_cards_are_released(self):
+        extractor = StreamingListingExtractor("a[href*='/product/']", 'div.bs-product')
+        cards = b''.join(b'<div class="bs-product"><a href="/product/%d">P%d</a></div>' % (i, i) for i in range(50))
+
+        items = extractor.feed(b'<html><body><div class="grid">' + cards + b'</div></body></html>')
+        grid = extractor._parser.close().find('.//div')
+
+        assert len(items) == 50
+        assert len(grid) == 1 and len(grid[0]) == 0
+
+    def test_rejects_selectors_needing_the_tree(self):
+        with pytest.raises(ValueError):
+            StreamingListingExtractor('div.card a')
+
+    def test_empty_page(self):
+        assert list(StreamingListingExtractor('a.prod-th').iter_listings([b''])) == []
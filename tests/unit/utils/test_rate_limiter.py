@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch
+
+from src.utils.rate_limiter import TokenBucket, HostRateLimiter
+
+
+class TestTokenBucket:
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    def test_first_request_is_free(self):
+        bucket = TokenBucket(rate=0.5)
+
+        assert bucket.reserve() == 0.0
+
+    def test_second_request_waits_for_refill(self):
+        with patch('src.utils.rate_limiter.time.monotonic', return_value=100.0):
+            bucket = TokenBucket(rate=0.5)
+            bucket.reserve()
+            wait = bucket.reserve()
+
+        assert wait == pytest.approx(2.0)
+
+    def test_burst_capacity(self):
+        with patch('src.utils.rate_limiter.time.monotonic', return_value=100.0):
+            bucket = TokenBucket(rate=1.0, capacity=3)
+            waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(1.0)
+
+    @patch('src.utils.rate_limiter.time.sleep')
+    def test_acquire_sleeps_for_reserved_time(self, mock_sleep):
+        with patch('src.utils.rate_limiter.time.monotonic', return_value=100.0):
+            bucket = TokenBucket(rate=0.5)
+            bucket.acquire()
+            bucket.acquire()
+
+        mock_sleep.assert_called_once_with(pytest.approx(2.0))
+
+
+class TestHostRateLimiter:
+
+    def test_host_of(self):
+        assert HostRateLimiter.host_of('https://WWW.Example.com/a?b=1') == 'www.example.com'
+        assert HostRateLimiter.host_of(None) == ''
+
+    def test_buckets_are_per_host(self):
+        limiter = HostRateLimiter(rate=0.5)
+
+        assert limiter.bucket_for('a.com') is limiter.bucket_for('a.com')
+        assert limiter.bucket_for('a.com') is not limiter.bucket_for('b.com')
+
+    def test_host_overrides(self):
+        limiter = HostRateLimiter(rate=0.5, host_rates={'fast.com': 10})
+
+        assert limiter.bucket_for('fast.com').rate == 10
+        assert limiter.bucket_for('slow.com').rate == 0.5
+
+    @patch('src.utils.rate_limiter.time.sleep')
+    def test_different_hosts_do_not_wait(self, mock_sleep):
+        limiter = HostRateLimiter(rate=0.5)
+
+        assert limiter.acquire('https://a.com/1') == 0.0
+        assert limiter.acquire('https://b.com/1') == 0.0
+        mock_sleep.assert_not_called()
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+
+from src.utils.readiness import QUIET_SCRIPT, ReadinessWaiter
+
+
+class FakePage:
+    """Sync page whose content becomes ready ``ready_after`` seconds after the wait starts."""
+
+    def __init__(self, ready_after=0.0):
+        self.ready_after = ready_after
+        self.calls = []
+
+    def evaluate(self, script):
+        self.calls.append(('evaluate', script))
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        self.calls.append(('selector', selector, state, timeout))
+        self._wait(timeout)
+
+    def wait_for_function(self, script, arg=None, polling=None, timeout=None):
+        self.calls.append(('function', script, arg, timeout))
+        self._wait(timeout)
+
+    def _wait(self, timeout):
+        if self.ready_after * 1000 > timeout:
+            time.sleep(timeout / 1000)
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+        time.sleep(self.ready_after)
+
+
+class TestReadinessWaiter:
+
+    @pytest.fixture
+    def waiter(self):
+        return ReadinessWaiter(quiet_ms=200, min_timeout=0.05, selector_timeout=1.0, headroom=2.0)
+
+    def test_selector_wait_exits_early(self, waiter):
+        page = FakePage(ready_after=0.01)
+
+        waited = waiter.wait(page, 'https://shop.test/p/1', 'div.price')
+
+        assert waited < 0.5
+        assert page.calls[-1] == ('selector', 'div.price', 'attached', 1000.0)
+
+    def test_quiet_wait_uses_mutation_observer(self, waiter):
+        page = FakePage()
+
+        waiter.wait(page, 'https://shop.test/p/1', max_wait=2)
+
+        assert page.calls[-1] == ('function', QUIET_SCRIPT, 200, 2000.0)
+
+    def test_budget_learns_per_host(self, waiter):
+        assert waiter.budget('https://shop.test/p/1', 'selector', 1.0) == 1.0
+
+        waiter.record('https://shop.test/p/1', 'selector', 0.1)
+        waiter.record('https://shop.test/p/2', 'selector', 0.2)
+
+        assert waiter.budget('https://shop.test/p/3', 'selector', 1.0) == pytest.approx(0.4)
+        assert waiter.budget('https://other.test/', 'selector', 1.0) == 1.0
+        assert waiter.budget('https://shop.test/p/3', 'quiet', 2.0) == 2.0
+
+    def test_budget_is_bounded(self, waiter):
+        waiter.record('https://shop.test/', 'selector', 0.001)
+        assert waiter.budget('https://shop.test/', 'selector', 1.0) == 0.05
+
+        waiter.record('https://shop.test/', 'selector', 5.0)
+        assert waiter.budget('https://shop.test/', 'selector', 1.0) == 1.0
+
+    def test_timeout_is_not_an_error(self, waiter):
+        waiter.record('https://shop.test/', 'selector', 0.05)
+        page = FakePage(ready_after=5)
+
+        waited = waiter.wait(page, 'https://shop.test/p/1', 'div.price')
+
+        assert waited < 0.5
+        assert waiter.stats['timeouts'] == 1
+
+    def test_metrics(self, waiter):
+        waiter.record('https://shop.test/', 'quiet', 0.3)
+        waiter.record('https://shop.test/', 'quiet', 0.1, timed_out=True)
+
+        metrics = waiter.metrics()
+
+        assert metrics['pages'] == 2
+        assert metrics['waited_seconds'] == pytest.approx(0.4)
+        assert metrics['avg_wait'] == pytest.approx(0.2)
+        assert metrics['timeouts'] == 1
+        assert metrics['learned_budgets'] == {'shop.test quiet': pytest.approx(0.6)}
+
+    def test_async_wait(self, waiter):
+        class AsyncPage:
+            def __init__(self):
+                self.selectors = []
+
+            async def evaluate(self, script):
+                return None
+
+            async def wait_for_selector(self, selector, state=None, timeout=None):
+                self.selectors.append(selector)
+
+        page = AsyncPage()
+        asyncio.run(waiter.wait_async(page, 'https://shop.test/p/1', 'h1'))
+
+        assert page.selectors == ['h1']
+        assert waiter.stats['pages'] == 1
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.resource_policy import TRACKER_HOSTS, ResourcePolicy, ResourceStats, site_of
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type, page=None):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type, frame=SimpleNamespace(page=page))
+        self.outcome = None
+
+    def continue_(self):
+        self.outcome = 'continue'
+
+    def abort(self):
+        self.outcome = 'abort'
+
+
+class AsyncFakeRoute(FakeRoute):
+    async def continue_(self):
+        self.outcome = 'continue'
+
+    async def abort(self):
+        self.outcome = 'abort'
+
+
+class TestResourcePolicy:
+
+    @pytest.fixture
+    def strict(self):
+        return ResourcePolicy.from_config({'third_party_scripts': False, 'allow_hosts': ['cdn.shopify.com'],
+                                           'script_paths': ['/assets/*'], 'block_hosts': ['ads.example']},
+                                          first_party={'store.cl'})
+
+    def test_default_blocks_heavy_types_and_trackers(self):
+        policy = ResourcePolicy()
+
+        assert policy.allows('https://www.store.cl/products/1', 'document') is True
+        assert policy.allows('https://cdn.other.net/app.js', 'script') is True
+        for resource_type in ('image', 'media', 'font', 'stylesheet'):
+            assert policy.allows(f'https://www.store.cl/file.{resource_type}', resource_type) is False
+        assert policy.allows('https://www.googletagmanager.com/gtm.js', 'script') is False
+        assert policy.allows('https://embed.tawk.to/widget', 'document') is False
+
+    def test_third_party_scripts_allow_list(self, strict):
+        assert strict.allows('https://www.store.cl/assets/theme.js', 'script') is True
+        assert strict.allows('https://www.store.cl/apps/reviews.js', 'script') is False
+        assert strict.allows('https://www.store.cl/api/cart', 'fetch') is True
+        assert strict.allows('https://cdn.shopify.com/s/files/app.js', 'script') is True
+        assert strict.allows('https://widgets.other.net/chat.js', 'script') is False
+        assert strict.allows('https://ads.example/pixel', 'xhr') is False
+
+    def test_from_config(self, strict):
+        assert strict.first_party == ('store.cl',)
+        assert strict.block_hosts == TRACKER_HOSTS + ('ads.example',)
+        assert ResourcePolicy.from_config(None) == ResourcePolicy()
+        assert site_of('https://www.store.cl/collections/all') == 'store.cl'
+
+    def test_route_handler_counts_per_page(self, strict):
+        stats = ResourceStats()
+        handler = strict.route_handler(lambda request: stats if request.frame.page == 'page-1' else None)
+        routes = [FakeRoute('https://www.store.cl/', 'document', 'page-1'),
+                  FakeRoute('https://www.store.cl/logo.png', 'image', 'page-1'),
+                  FakeRoute('https://www.store.cl/font.woff2', 'font', 'page-2')]
+
+        for route in routes:
+            handler(route)
+
+        assert [route.outcome for route in routes] == ['continue', 'abort', 'abort']
+        assert stats.to_dict() == {'allowed': 1, 'blocked': 1, 'allowed_bytes': 0, 'blocked_by_type': {'image': 1}}
+
+    def test_async_route_handler(self, strict):
+        stats = ResourceStats()
+        route = AsyncFakeRoute('https://www.store.cl/app.css', 'stylesheet')
+
+        asyncio.run(strict.async_route_handler(lambda request: stats)(route))
+
+        assert route.outcome == 'abort'
+        assert stats.blocked_by_type == {'stylesheet': 1}
+
+
+class TestResourceStats:
+
+    def test_response_bytes_and_merge(self):
+        page, total = ResourceStats(), ResourceStats()
+        page.record('script', True)
+        page.record('font', False)
+        page.record_response(SimpleNamespace(headers={'content-length': '2048'}))
+        page.record_response(SimpleNamespace(headers={}))
+        page.record_response(SimpleNamespace(headers={'content-length': 'chunked'}))
+
+        total.merge(page)
+        total.merge(page)
+
+        assert total.to_dict() == {'allowed': 2, 'blocked': 2, 'allowed_bytes': 4096, 'blocked_by_type': {'font': 2}}